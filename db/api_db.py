@@ -1,4 +1,8 @@
 from utils.db_config import get_conn, DatabaseError
+from utils.cache import bump_cache_epoch
+from utils.pagination import fetch_page_with_total
+from utils.sql_registry import named_sql
+from utils.fts import text_search
 import math
 
 # ✅ API 존재 여부 확인
@@ -20,6 +24,7 @@ def insert_api_list(data: dict, login_id: str):
                 INSERT INTO api_list (api_id, api_name, path, method, use_yn, description, flow_data, write_id, update_id)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (data["api_id"], data["api_name"], data["path"], data["method"], data["use_yn"], data["description"], data["flow_data"], login_id, login_id))
+            bump_cache_epoch(conn, "api_list")
     except Exception as e:
         raise DatabaseError(f"[API 등록 실패] {e}")
 
@@ -33,6 +38,7 @@ def update_api_info(api_id: str, method: str, data: dict, login_id: str) -> bool
                 WHERE api_id = ?
                   and method = ?
             """, (data["api_name"], data["path"], data["use_yn"], data["description"], data["flow_data"], login_id, api_id, method))
+            bump_cache_epoch(conn, "api_list")
             return cur.rowcount > 0
     except Exception as e:
         raise DatabaseError(f"[API 수정 실패] {e}")
@@ -47,6 +53,7 @@ def delete_api_info(api_id, method) -> bool:
                 raise ValueError(f"삭제하신 API({api_id + '-' + method})는 존재하지 않습니다.")
             # 권한 삭제
             conn.execute("DELETE FROM api_permissions WHERE api_id = ? and method = ?", (api_id, method))
+            bump_cache_epoch(conn, "api_list", "api_permissions")
 
             return cur.rowcount > 0
     except Exception as e:
@@ -58,11 +65,13 @@ def get_api_list_info(page: int = 1, per_page: int = 10, api_name: str = None, p
         filters = []
         params = []
         if api_name:
-            filters.append("api_name LIKE ?")
-            params.append(f"%{api_name}%")
+            clause, clause_params = text_search("api_list", "api_name", api_name)
+            filters.append(clause)
+            params.extend(clause_params)
         if path:
-            filters.append("path LIKE ?")
-            params.append(f"%{path}%")
+            clause, clause_params = text_search("api_list", "path", path)
+            filters.append(clause)
+            params.extend(clause_params)
         if use_yn:
             filters.append("use_yn = ?")
             params.append(use_yn)
@@ -72,42 +81,27 @@ def get_api_list_info(page: int = 1, per_page: int = 10, api_name: str = None, p
         with get_conn() as conn:
             cursor = conn.cursor()
 
-            # 총 개수 조회
-            count_query = f"SELECT COUNT(*) FROM api_list {where_clause}"
-            cursor.execute(count_query, params)
-            total_count = cursor.fetchone()[0]
+            columns = """
+                api_id, api_name, path, method, use_yn, description, flow_data,
+                write_id, write_date, update_id, update_date
+            """
 
             # 전체 조회 여부 판단
             if per_page == -1:
-                query = f"""
-                    SELECT api_id, api_name, path, method, use_yn, description, flow_data,
-                           write_id, write_date, update_id, update_date
-                    FROM api_list
-                    {where_clause}
-                    ORDER BY write_date DESC
-                """
-                cursor.execute(query, params)
+                cursor.execute(named_sql("api_list.all", f"SELECT {columns} FROM api_list {where_clause} ORDER BY write_date DESC"), params)
                 items = [dict(row) for row in cursor.fetchall()]
                 return {
                     "items": items,
-                    "total_count": total_count,
+                    "total_count": len(items),
                     "total_pages": 1,
                     "page": 1,
                     "per_page": -1
                 }
 
-            # 페이징 처리
-            offset = (page - 1) * per_page
-            query = f"""
-                SELECT api_id, api_name, path, method, use_yn, description, flow_data,
-                       write_id, write_date, update_id, update_date
-                FROM api_list
-                {where_clause}
-                ORDER BY write_date DESC
-                LIMIT ? OFFSET ?
-            """
-            cursor.execute(query, params + [per_page, offset])
-            items = [dict(row) for row in cursor.fetchall()]
+            # 페이징 처리 (목록 + 전체 건수 한 번에 조회)
+            items, total_count = fetch_page_with_total(
+                conn, columns, f"FROM api_list {where_clause}", params, "write_date DESC", page, per_page, name="api_list.list"
+            )
 
             total_pages = math.ceil(total_count / per_page)
             return {
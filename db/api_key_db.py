@@ -1,5 +1,9 @@
 from utils.db_config import get_conn, DatabaseError
+from utils.cache import bump_cache_epoch
+from utils.pagination import fetch_page_with_total
+from utils.fts import text_search
 from utils.common import api_hash_key
+from db.auth_db import invalidate_principal
 import math
 import secrets
 from typing import Optional
@@ -48,8 +52,11 @@ def insert_api_key(user_id, key, comment, login_id):
                 INSERT INTO api_keys (user_id, api_key, comment, generate_date, generate_id, regenerate_date, regenerate_id)
                 VALUES (?, ?, ?, datetime('now', 'localtime'), ?, datetime('now', 'localtime'), ? )
             """, (user_id, hashed_key, comment, login_id, login_id))
+            bump_cache_epoch(conn, "users")
     except Exception as e:
         raise DatabaseError(f"[API Key 생성 실패] {e}")
+    finally:
+        invalidate_principal(user_id)  # has_api_key 변경
 
 # ✅ API 키 코멘트 수정
 def update_api_key_comment(user_id, comment, login_id):
@@ -90,17 +97,32 @@ def delete_api_key(user_id) -> bool:
     try:
         with get_conn() as conn:
             cur = conn.execute("DELETE FROM api_keys WHERE user_id = ?", (user_id,))
+            bump_cache_epoch(conn, "users")
             return cur.rowcount > 0
     except Exception as e:
         raise DatabaseError(f"[API Key 삭제 실패] {e}")
+    finally:
+        invalidate_principal(user_id)  # has_api_key 변경
 
 # ✅ API 키 목록 조회
 def get_api_key_list(page, per_page, user_id=None, comment=None):
     try:
         with get_conn() as conn:
-            cur = conn.cursor()
-            query = """
-                SELECT 
+            where_sql = "WHERE u.use_yn = 'Y'"
+            params = []
+            if user_id:
+                clause, clause_params = text_search("users", "user_id", user_id, alias="u")
+                where_sql += f" AND {clause}"
+                params.extend(clause_params)
+            if comment:
+                clause, clause_params = text_search("api_keys", "comment", comment, alias="ak")
+                where_sql += f" AND {clause}"
+                params.extend(clause_params)
+
+            # 목록 + 전체 건수 한 번에 조회
+            items, total_count = fetch_page_with_total(
+                conn,
+                """
                     ak.user_id,
                     u.user_name,
                     ak.api_key,
@@ -109,41 +131,18 @@ def get_api_key_list(page, per_page, user_id=None, comment=None):
                     ak.generate_id,
                     ak.regenerate_date,
                     ak.regenerate_id
-                FROM api_keys ak
-                INNER JOIN users u ON ak.user_id = u.user_id
-                WHERE 1=1
-                  AND u.use_yn = 'Y'
-            """
-            params = []
-            if user_id:
-                query += " AND ak.user_id LIKE ?"
-                params.append(f"%{user_id}%")
-            if comment:
-                query += " AND ak.comment LIKE ?"
-                params.append(f"%{comment}%")
-            query += " ORDER BY ak.generate_date DESC LIMIT ? OFFSET ?"
-            params.extend([per_page, (page - 1) * per_page])
-            cur.execute(query, params)
-            rows = cur.fetchall()
-
-            count_query = """
-                SELECT COUNT(*) FROM api_keys ak
-                INNER JOIN users u ON ak.user_id = u.user_id
-                WHERE 1=1
-            """
-            count_params = []
-            if user_id:
-                count_query += " AND ak.user_id LIKE ?"
-                count_params.append(f"%{user_id}%")
-            if comment:
-                count_query += " AND ak.comment LIKE ?"
-                count_params.append(f"%{comment}%")
-            cur.execute(count_query, count_params)
-            total_count = cur.fetchone()[0]
+                """,
+                f"FROM api_keys ak INNER JOIN users u ON ak.user_id = u.user_id {where_sql}",
+                params,
+                "ak.generate_date DESC",
+                page,
+                per_page,
+                name="api_keys.list",
+            )
             total_pages = math.ceil(total_count / per_page)
 
             return {
-                "items": [dict(row) for row in rows],
+                "items": items,
                 "total_pages": total_pages,
                 "total_count": total_count
             }
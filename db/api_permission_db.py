@@ -1,4 +1,13 @@
 from utils.db_config import get_conn, DatabaseError
+from utils.cache import TTLCache, bump_cache_epoch
+from utils.config import Config
+from utils.time_range import build_time_range
+from utils.fts import text_search
+from utils.set_diff import replace_row_set
+from utils.sql_registry import register_sql
+from typing import Optional
+import json
+import threading
 
 def get_user_api_permissions(user_id: str):
     try:
@@ -20,64 +29,92 @@ def get_user_api_permissions(user_id: str):
     except Exception as e:
         raise DatabaseError(f"[유저 API 권한 조회 실패] {e}")
 
-def save_update_user_api_permissions(user_id: str, api_ids: list, login_id: str) -> bool:
+def save_update_user_api_permissions(user_id: str, api_ids: list, login_id: str) -> dict:
+    """유저 API 권한을 api_ids 로 교체 (바뀐 행만 반영) → {"added": [[api_id, method], ...], "removed": [...]}"""
     try:
         with get_conn() as conn:
-            cursor = conn.cursor()
+            keys = list(dict.fromkeys((str(api_info["api_id"]), api_info["method"]) for api_info in api_ids))
 
-            # 기존 권한 삭제
-            cursor.execute("DELETE FROM api_permissions WHERE user_id = ?", (user_id,))
+            # 현재 권한과 비교해 추가/삭제된 권한만 반영 (그대로인 권한은 create_date 등 유지)
+            diff = replace_row_set(
+                conn, "api_permissions", {"user_id": user_id}, ("api_id", "method"), keys,
+                insert_values={"create_id": login_id, "update_id": login_id},
+            )
 
-            for api_info in api_ids:
-                api_id = api_info["api_id"]
-                method = api_info["method"]
-                # 권한 부여
-                cursor.execute("""
-                    INSERT INTO api_permissions (api_id, method, user_id, create_id, update_id)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (api_id, method, user_id, login_id, login_id))
-
-                # PENDING 신청이 존재하는 경우만 APPROVED 처리
-                cursor.execute("""
-                    SELECT request_id FROM api_permission_requests
-                    WHERE user_id = ? AND api_id = ? AND method = ? AND status = 'PENDING'
-                    ORDER BY request_date DESC
-                    LIMIT 1
-                """, (user_id, api_id, method))
-                row = cursor.fetchone()
-                if row:
-                    request_id = row["request_id"] if isinstance(row, dict) else row[0]
-                    cursor.execute("""
-                        UPDATE api_permission_requests
-                        SET status = 'APPROVED',
-                            response_date = CURRENT_TIMESTAMP,
-                            response_id = ?
-                        WHERE request_id = ?
-                    """, (login_id, request_id))
-
-            return True
+            # PENDING 신청이 존재하는 API 만 APPROVED 처리 (대상 목록은 JSON 배열 하나로 전달 → 건수와 관계없이 한 문장)
+            if keys:
+                conn.execute("""
+                    UPDATE api_permission_requests
+                    SET status = 'APPROVED',
+                        response_date = CURRENT_TIMESTAMP,
+                        response_id = ?
+                    WHERE user_id = ?
+                    AND status = 'PENDING'
+                    AND (api_id, method) IN (
+                        SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(?)
+                    )
+                """, (login_id, user_id, json.dumps(keys)))
+
+            if diff["added"] or diff["removed"]:
+                bump_cache_epoch(conn, "api_permissions")
+            return diff
     except Exception as e:
         raise DatabaseError(f"[유저 API 권한 저장 실패] {e}")
-    
-def has_user_api_permission(user_id: str, method: str, path: str) -> bool:
+
+
+# ✅ API 권한 인덱스: (METHOD, path) → 권한 보유 user_id 집합
+# - api_list(use_yn = 'Y') ⋈ api_permissions 한 번 조회로 구성, 이후 권한 검사는 SQLite 조회 없이 dict/set 조회
+# - 권한 저장/승인, API 수정/삭제, 사용자 삭제 시 cache_epoch(api_list, api_permissions)로 모든 워커에서 무효화 → 다음 검사 때 재구성
+# - 사용자 활성 여부(users.use_yn)는 세션 검증(load_session_principal)에서 이미 확인하므로 인덱스에 포함하지 않음
+_permission_index = TTLCache(
+    "api_permission_index", 1, Config.API_PERMISSION_INDEX_TTL_SECONDS, namespaces=("api_list", "api_permissions")
+)
+_permission_index_lock = threading.Lock()
+
+
+_PERMISSION_INDEX_SQL = register_sql("api_permissions.index", """
+    SELECT l.method, l.path, p.user_id
+    FROM api_list l
+    JOIN api_permissions p ON p.api_id = l.api_id AND p.method = l.method
+    WHERE l.use_yn = 'Y'
+""")
+
+def _build_api_permission_index() -> dict[tuple[str, str], frozenset]:
     try:
         with get_conn() as conn:
-            cur = conn.execute("""
-                SELECT 1
-                FROM api_permissions p
-                JOIN api_list l ON p.api_id = l.api_id AND p.method = l.method
-                JOIN users u ON p.user_id = u.user_id
-                WHERE p.user_id = ?
-                AND l.method = ?
-                AND l.path = ?
-                AND l.use_yn = 'Y'
-                AND u.use_yn = 'Y'
-                LIMIT 1
-            """, (user_id, method.upper(), path))
-            return cur.fetchone() is not None
+            rows = conn.execute(_PERMISSION_INDEX_SQL).fetchall()
     except Exception as e:
-        raise DatabaseError(f"[유저 API 권한 체크 실패] {e}")
-    
+        raise DatabaseError(f"[API 권한 인덱스 구성 실패] {e}")
+    index: dict[tuple[str, str], set] = {}
+    for method, path, user_id in rows:
+        index.setdefault((method.upper(), path), set()).add(user_id)
+    return {route: frozenset(users) for route, users in index.items()}
+
+
+def get_api_permission_index() -> dict[tuple[str, str], frozenset]:
+    index = _permission_index.get("index")
+    if index is None:
+        # 동시에 여러 요청이 비어 있는 인덱스를 만나도 한 번만 재구성
+        with _permission_index_lock:
+            index = _permission_index.get("index")
+            if index is None:
+                index = _build_api_permission_index()
+                _permission_index.set("index", index)
+    return index
+
+
+def peek_user_api_permission(user_id: str, method: str, path: str) -> Optional[bool]:
+    """인덱스가 메모리에 있으면 권한 여부, 없으면(재구성 필요) None → 이벤트 루프에서 DB 없이 확인할 때 사용"""
+    index = _permission_index.get("index")
+    if index is None:
+        return None
+    return user_id in index.get((method.upper(), path), ())
+
+
+def has_user_api_permission(user_id: str, method: str, path: str) -> bool:
+    return user_id in get_api_permission_index().get((method.upper(), path), ())
+
+
 def get_pending_permission_count() -> int:
     try:
         with get_conn() as conn:
@@ -111,20 +148,20 @@ def get_permission_request_list(user_id=None, method=None, path=None, start_date
             params = []
 
             if user_id:
-                query += " AND pr.user_id LIKE ?"
-                params.append(f"%{user_id}%")
+                clause, clause_params = text_search("api_permission_requests", "user_id", user_id, alias="pr")
+                query += f" AND {clause}"
+                params.extend(clause_params)
             if method:
                 query += " AND al.method = ?"
                 params.append(method)
             if path:
-                query += " AND al.path LIKE ?"
-                params.append(f"%{path}%")
-            if start_date:
-                query += " AND DATE(pr.request_date) >= DATE(?)"
-                params.append(start_date)
-            if end_date:
-                query += " AND DATE(pr.request_date) <= DATE(?)"
-                params.append(end_date)
+                clause, clause_params = text_search("api_list", "path", path, alias="al")
+                query += f" AND {clause}"
+                params.extend(clause_params)
+            if start_date or end_date:
+                time_where, time_params = build_time_range("pr.request_date", start_date, end_date)
+                query += "".join(f" AND {clause}" for clause in time_where)
+                params.extend(time_params)
             if status:
                 query += " AND pr.status = ?"
                 params.append(status)
@@ -157,6 +194,7 @@ def approve_permission_request(request_id: int, login_id: str):
                     INSERT INTO api_permissions (api_id, method, user_id, create_id, update_id)
                     VALUES (?, ?, ?, ?, ?)
                 """, (row["api_id"], row["method"], row["user_id"], login_id, login_id))
+                bump_cache_epoch(conn, "api_permissions")
     except Exception as e:
         raise DatabaseError(f"[권한 승인 실패] {e}")
 
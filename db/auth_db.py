@@ -1,65 +1,96 @@
-from utils.db_config import get_conn, DatabaseError
+from utils.db_config import get_conn, after_transaction, DatabaseError
 from utils.common import password_hash_key
+from utils.cache import TTLCache, bump_cache_epoch
+from utils.config import Config
+from utils.sql_registry import register_sql
 from typing import Optional
 
+# ✅ user_id → 세션 사용자 정보 캐시 (로그인/토큰 갱신/수정/삭제 시 명시적으로 무효화)
+principal_cache = TTLCache("principal", Config.PRINCIPAL_CACHE_SIZE, Config.PRINCIPAL_CACHE_TTL_SECONDS, namespaces=("users",))
+
+# ✅ 인증 경로 문장 (요청마다 실행되므로 utils/sql_registry 에 등록해서 준비된 문장 재사용)
+_PRINCIPAL_COLUMNS = """
+    u.user_id,
+    u.user_name,
+    u.permission_code,
+    u.use_yn,
+    u.create_id,
+    u.create_date,
+    u.update_id,
+    u.update_date,
+    CASE WHEN k.api_key IS NOT NULL THEN TRUE ELSE FALSE END AS has_api_key
+"""
+_AUTHENTICATE_SQL = register_sql("auth.authenticate", f"""
+    SELECT {_PRINCIPAL_COLUMNS}
+    FROM users u
+    LEFT JOIN api_keys k ON u.user_id = k.user_id
+    WHERE u.user_id = ? AND u.password = ?
+""")
+_SESSION_PRINCIPAL_SQL = register_sql("auth.session_principal", f"""
+    SELECT {_PRINCIPAL_COLUMNS}, u.refresh_token
+    FROM users u
+    LEFT JOIN api_keys k ON u.user_id = k.user_id
+    WHERE u.user_id = ?
+""")
+_UPDATE_REFRESH_TOKEN_SQL = register_sql("auth.update_refresh_token", "UPDATE users SET refresh_token = ? WHERE user_id = ?")
+_CLEAR_REFRESH_TOKEN_SQL = register_sql("auth.clear_refresh_token", "UPDATE users SET refresh_token = NULL WHERE user_id = ?")
+
+def invalidate_principal(user_id: str):
+    principal_cache.invalidate(user_id)
+    after_transaction(principal_cache.invalidate, user_id)
+
 def authenticate_user(user_id, password) -> Optional[dict]:
     try:
         password_hashed_key = password_hash_key(password)
         with get_conn() as conn:
-            cur = conn.execute("""
-                SELECT 
-                    u.user_id, 
-                    u.user_name, 
-                    u.permission_code, 
-                    u.use_yn, 
-                    u.create_id, 
-                    u.create_date, 
-                    u.update_id, 
-                    u.update_date,
-                    CASE WHEN k.api_key IS NOT NULL THEN TRUE ELSE FALSE END AS has_api_key
-                FROM users u
-                LEFT JOIN api_keys k ON u.user_id = k.user_id
-                WHERE u.user_id = ? AND u.password = ?
-            """, (user_id, password_hashed_key))
+            cur = conn.execute(_AUTHENTICATE_SQL, (user_id, password_hashed_key))
             row = cur.fetchone()
             return dict(row) if row else None
     except Exception as e:
         raise DatabaseError(f"[로그인 인증 실패] {e}")
 
 
-def update_refresh_token(user_id: str, refresh_token: str):
+# ✅ 세션 검증용 사용자 정보 (활성 여부, refresh token, 권한, API Key 보유 여부) 단일 조회
+def load_session_principal(user_id: str) -> Optional[dict]:
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
     try:
         with get_conn() as conn:
-            conn.execute(
-                "UPDATE users SET refresh_token = ? WHERE user_id = ?",
-                (refresh_token, user_id)
-            )
-            conn.commit()
+            cur = conn.execute(_SESSION_PRINCIPAL_SQL, (user_id,))
+            row = cur.fetchone()
     except Exception as e:
-        raise DatabaseError(f"[Refresh Token 업데이트 실패] {e}")
+        raise DatabaseError(f"[세션 사용자 정보 조회 실패] {e}")
+    if not row:
+        return None
+    principal = dict(row)
+    principal_cache.set(user_id, principal)
+    return dict(principal)
 
 
-def get_refresh_token(user_id: str) -> Optional[str]:
+def update_refresh_token(user_id: str, refresh_token: str):
     try:
         with get_conn() as conn:
-            cur = conn.execute(
-                "SELECT refresh_token FROM users WHERE user_id = ?",
-                (user_id,)
-            )
-            row = cur.fetchone()
-            return row[0] if row else None
+            conn.execute(_UPDATE_REFRESH_TOKEN_SQL, (refresh_token, user_id))
+            bump_cache_epoch(conn, "users")
     except Exception as e:
-        raise DatabaseError(f"[Refresh Token 조회 실패] {e}")
+        raise DatabaseError(f"[Refresh Token 업데이트 실패] {e}")
+    finally:
+        invalidate_principal(user_id)
+
+
+def get_refresh_token(user_id: str) -> Optional[str]:
+    principal = load_session_principal(user_id)
+    return principal["refresh_token"] if principal else None
 
 
 def clear_refresh_token(user_id: str):
     try:
         with get_conn() as conn:
-            conn.execute(
-                "UPDATE users SET refresh_token = NULL WHERE user_id = ?",
-                (user_id,)
-            )
-            conn.commit()
+            conn.execute(_CLEAR_REFRESH_TOKEN_SQL, (user_id,))
+            bump_cache_epoch(conn, "users")
     except Exception as e:
         raise DatabaseError(f"[Refresh Token 삭제 실패] {e}")
+    finally:
+        invalidate_principal(user_id)
      
\ No newline at end of file
@@ -1,25 +1,79 @@
 from utils.db_config import get_conn, DatabaseError
-from typing import Optional, Dict, Any, List
-import math
+from utils.time_range import build_time_range, parse_time_bound
+from utils.pagination import fetch_page, count_rows
+from utils.sql_registry import named_sql
+from db.log_partition_db import partitions_for_range, union_from_sql, iter_union_chunks
+from db.log_archive_db import (
+    archived_segments_for_range, find_archived_rows, merge_archived_page, add_archived_count, iter_archived_rows,
+)
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+import base64, heapq, json, math
 
-def _normalize_dt_param(s: Optional[str], end: bool=False) -> Optional[str]:
-    """
-    '2025-08-27T16:14' → '2025-08-27 16:14:00'
-    end=True        → '2025-08-27 16:14:59'
-    이미 'YYYY-MM-DD HH:MM:SS' 이면 그대로 리턴
-    """
-    if not s:
-        return None
-    s = s.strip().replace('T', ' ')
-    # 길이에 따라 초 붙이기
-    # 'YYYY-MM-DD HH:MM' (16) → 초 부착
-    if len(s) == 16:
-        s = f"{s}:59" if end else f"{s}:00"
-    return s
+# ✅ keyset(seek) 페이지네이션 커서: (requested_at, log_id) 를 불투명 문자열로 인코딩
+def encode_log_cursor(requested_at: str, log_id: int) -> str:
+    raw = json.dumps([requested_at, log_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_log_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        requested_at, log_id = json.loads(raw)
+        if not isinstance(requested_at, str) or not isinstance(log_id, int):
+            raise ValueError
+        return requested_at, log_id
+    except Exception:
+        raise ValueError("유효하지 않은 cursor 입니다.")
 
 def row_to_dict(cur, row):
     return {desc[0]: row[i] for i, desc in enumerate(cur.description)}
 
+_LOG_COLUMNS = """
+    log_id, user_id, api_id, method, path, query_param, headers, body,
+    status_code, response, requested_at, responded_at, latency_ms,
+    client_ip, user_agent, is_success, error_message
+"""
+GATEWAY_LOG_COLUMNS = [col.strip() for col in _LOG_COLUMNS.split(",")]
+_LOG_ORDER_BY = "requested_at DESC, log_id DESC"
+_LOG_SORT_KEY = ("requested_at", "log_id")
+
+
+def _gateway_log_conditions(
+    user_id: Optional[str],
+    api_id: Optional[str],
+    method: Optional[str],
+    is_success: Optional[str],
+    status_code: Optional[int],
+    date_start: Optional[str],
+    date_end: Optional[str],
+) -> Tuple[List[str], List[Any], Dict[str, Any], Tuple[Optional[str], Optional[str]]]:
+    """공통 조회 조건 → (WHERE 조건 목록, 파라미터, 아카이브 조회용 컬럼=값 필터, 기간 [시작, 종료) 경계)"""
+    where: List[str] = []
+    params: List[Any] = []
+    filters: Dict[str, Any] = {}
+
+    if user_id:
+        filters["user_id"] = user_id
+    if api_id:
+        filters["api_id"] = api_id
+    if method and method.upper() != "ALL":
+        filters["method"] = method.upper()
+    if is_success and is_success in ("Y", "N"):
+        filters["is_success"] = is_success
+    if status_code is not None:
+        filters["status_code"] = int(status_code)
+    for col, value in filters.items():
+        where.append(f"{col} = ?")
+        params.append(value)
+
+    # ✅ 요청시간 기준 [시작, 종료) 반열림 구간 비교 (원본 컬럼 그대로 → 인덱스 range scan)
+    time_where, time_params = build_time_range("requested_at", date_start, date_end)
+    where.extend(time_where)
+    params.extend(time_params)
+
+    # 기간이 겹치는 월별 파티션 / 아카이브만 조회 대상 (db/log_partition_db.py, db/log_archive_db.py)
+    period = (parse_time_bound(date_start), parse_time_bound(date_end, end=True))
+    return where, params, filters, period
+
 def select_gateway_logs(
     page: int,
     per_page: int,
@@ -30,74 +84,132 @@ def select_gateway_logs(
     status_code: Optional[int],
     date_start: Optional[str],
     date_end: Optional[str],
+    seek: bool = False,
+    after: Optional[Tuple[str, int]] = None,
 ) -> Dict[str, Any]:
     """
-    gateway_logs 조회. 요청시간(requested_at) 기준, 최신순.
+    gateway_logs 조회. 요청시간(requested_at) 기준, 최신순. 기간이 겹치는 월별 파티션까지 함께 조회한다.
     화면에서 'YYYY-MM-DDTHH:MM'로 온 값을 여기서 정규화한다.
+    seek=True 이면 OFFSET/COUNT 없이 (requested_at, log_id) 커서 기준으로 다음 페이지를 조회한다.
+      - after: 이전 페이지 마지막 행의 (requested_at, log_id), 첫 페이지는 None
     """
     try:
-        # 🔧 화면에서 온 파라미터 정규화
-        date_start = _normalize_dt_param(date_start, end=False)  # 시작: :00
-        date_end   = _normalize_dt_param(date_end,   end=True)   # 끝:   :59
-
-        where = []
-        params: List[Any] = []
-
-        if user_id:
-            where.append("user_id = ?")
-            params.append(user_id)
-        if api_id:
-            where.append("api_id = ?")
-            params.append(api_id)
-        if method and method.upper() != "ALL":
-            where.append("method = ?")
-            params.append(method.upper())
-        if is_success and is_success in ("Y", "N"):
-            where.append("is_success = ?")
-            params.append(is_success)
-        if status_code is not None:
-            where.append("status_code = ?")
-            params.append(int(status_code))
-
-        # ✅ 요청시간 기준, 초 단위 비교 (인덱스 타기 쉬움)
-        if date_start and date_end:
-            where.append("requested_at BETWEEN ? AND ?")
-            params.extend([date_start, date_end])
-        elif date_start:
-            where.append("requested_at >= ?")
-            params.append(date_start)
-        elif date_end:
-            where.append("requested_at <= ?")
-            params.append(date_end)
+        where, params, filters, period = _gateway_log_conditions(
+            user_id, api_id, method, is_success, status_code, date_start, date_end
+        )
+
+        if seek:
+            return _select_gateway_logs_seek(where, params, per_page, after, period, filters)
 
         where_sql = "WHERE " + " AND ".join(where) if where else ""
         offset = (page - 1) * per_page
 
-        count_sql = f"SELECT COUNT(*) AS cnt FROM gateway_logs {where_sql}"
-        list_sql = f"""
-            SELECT
-              log_id, user_id, api_id, method, path, query_param, headers, body,
-              status_code, response, requested_at, responded_at, latency_ms,
-              client_ip, user_agent, is_success, error_message
-            FROM gateway_logs
-            {where_sql}
-            ORDER BY requested_at DESC
-            LIMIT ? OFFSET ?
-        """
-
         with get_conn() as conn:
-            conn.row_factory = lambda cur, row: row_to_dict(cur, row)
-            cur = conn.cursor()
-            cur.execute(count_sql, params)
-            row = cur.fetchone()
-            total_count = int(row["cnt"]) if row else 0
+            tables = partitions_for_range(conn, "gateway_logs", *period)
+            # 기간이 아카이브된 달과 겹치면 세그먼트 파일도 함께 조회 (시작일이 없는 조회 포함)
+            segments = archived_segments_for_range(conn, "gateway_logs", *period)
+
+            page_from, page_params = union_from_sql(
+                tables, _LOG_COLUMNS, lambda table: (where_sql, params), _LOG_ORDER_BY, offset + per_page
+            )
+            if segments:
+                # 아카이브와 합쳐서 자르기 위해 DB 쪽은 앞 페이지까지 모두 조회
+                items = fetch_page(conn, _LOG_COLUMNS, page_from, page_params, _LOG_ORDER_BY, 1, offset + per_page, name="gateway_logs.list")
+            else:
+                items = fetch_page(conn, _LOG_COLUMNS, page_from, page_params, _LOG_ORDER_BY, page, per_page, name="gateway_logs.list")
 
-            cur.execute(list_sql, params + [per_page, offset])
-            items = cur.fetchall() or []
+            # 전체 건수는 LIST_COUNT_CAP 까지만 세고 필터별로 잠깐 캐시 (대용량 로그에서 COUNT 가 가장 비쌈)
+            count_from, count_params = union_from_sql(tables, "log_id", lambda table: (where_sql, params))
+            total_count, capped = count_rows(conn, count_from, count_params, name="gateway_logs.list")
+
+        if segments:
+            # DB 가 앞 페이지까지 다 채웠으면 그 마지막 행보다 오래된 아카이브 블록은 읽지 않음
+            need = offset + per_page
+            floor = tuple(items[-1][col] for col in _LOG_SORT_KEY) if len(items) >= need else None
+            refs = find_archived_rows(segments, _LOG_SORT_KEY, *period, filters, need, floor=floor)
+            items = merge_archived_page(items, refs, _LOG_SORT_KEY, GATEWAY_LOG_COLUMNS, offset, per_page)
+            total_count, capped = add_archived_count(total_count, capped, segments, *period, filters)
 
         total_pages = max(1, math.ceil(total_count / per_page)) if per_page else 1
 
-        return {"items": items, "total_count": total_count, "total_pages": total_pages}
+        return {"items": items, "total_count": total_count, "total_pages": total_pages, "total_count_capped": capped}
 
     except Exception as e:
         raise DatabaseError(f"[Gateway 로그 조회 실패] {e}")
+
+
+def _select_gateway_logs_seek(
+    where: List[str],
+    params: List[Any],
+    per_page: int,
+    after: Optional[Tuple[str, int]],
+    period: Tuple[Optional[str], Optional[str]] = (None, None),
+    filters: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    # (requested_at, log_id) 복합 인덱스를 역방향으로 타면서 이전 행들을 건너뛰지 않고 바로 탐색
+    where = list(where)
+    params = list(params)
+    if after:
+        where.append("(requested_at, log_id) < (?, ?)")
+        params.extend(after)
+    where_sql = "WHERE " + " AND ".join(where) if where else ""
+
+    with get_conn() as conn:
+        tables = partitions_for_range(conn, "gateway_logs", *period)
+        segments = archived_segments_for_range(conn, "gateway_logs", *period)
+        from_sql, from_params = union_from_sql(
+            tables, _LOG_COLUMNS, lambda table: (where_sql, params), _LOG_ORDER_BY, per_page + 1
+        )
+        conn.row_factory = lambda cur, row: row_to_dict(cur, row)
+        items = conn.execute(
+            named_sql("gateway_logs.seek", f"SELECT {_LOG_COLUMNS} {from_sql} ORDER BY {_LOG_ORDER_BY} LIMIT ?"),
+            from_params + [per_page + 1],
+        ).fetchall() or []
+
+    if segments:
+        floor = tuple(items[-1][col] for col in _LOG_SORT_KEY) if len(items) > per_page else None
+        refs = find_archived_rows(segments, _LOG_SORT_KEY, *period, filters or {}, per_page + 1, before=after, floor=floor)
+        items = merge_archived_page(items, refs, _LOG_SORT_KEY, GATEWAY_LOG_COLUMNS, 0, per_page + 1)
+
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    next_cursor = encode_log_cursor(items[-1]["requested_at"], items[-1]["log_id"]) if has_more else None
+
+    return {"items": items, "next_cursor": next_cursor, "has_more": has_more}
+
+
+def iter_gateway_logs(
+    user_id: Optional[str],
+    api_id: Optional[str],
+    method: Optional[str],
+    is_success: Optional[str],
+    status_code: Optional[int],
+    date_start: Optional[str],
+    date_end: Optional[str],
+) -> Iterator[Dict[str, Any]]:
+    """
+    내보내기용: 조건에 맞는 로그를 오래된 순으로 한 건씩 반환 (메모리 사용량 일정)
+    - 파티션은 requested_at 기준 EXPORT_FETCH_SIZE 건씩 나눠 조회 (청크마다 커넥션을 짧게 빌리고 반납)
+    - 아카이브 세그먼트도 시간순으로 병합
+    """
+    where, params, filters, period = _gateway_log_conditions(
+        user_id, api_id, method, is_success, status_code, date_start, date_end
+    )
+    where_sql = "WHERE " + " AND ".join(where) if where else ""
+    try:
+        with get_conn() as conn:
+            tables = partitions_for_range(conn, "gateway_logs", *period)
+            segments = archived_segments_for_range(conn, "gateway_logs", *period)
+
+        rows: Iterator[Dict[str, Any]] = iter_union_chunks(
+            tables, _LOG_COLUMNS, lambda table: (where_sql, params), "requested_at", "log_id"
+        )
+        if segments:
+            rows = heapq.merge(
+                rows,
+                *(iter_archived_rows(path, GATEWAY_LOG_COLUMNS, *period, filters) for path in segments),
+                key=lambda row: (row["requested_at"], row["log_id"]),
+            )
+        yield from rows
+    except Exception as e:
+        raise DatabaseError(f"[Gateway 로그 내보내기 실패] {e}")
@@ -0,0 +1,377 @@
+import asyncio
+import functools
+import heapq
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterator, Optional, Sequence
+from utils.cache import TTLCache, bump_cache_epoch
+from utils.config import Config
+from utils.db_async import run_db
+from utils.db_config import get_conn, DatabaseError
+from utils.log_segment import SegmentReader, SegmentWriter
+from utils.pagination import count_cache
+from utils.time_range import DB_DATETIME_FORMAT
+from db.log_partition_db import PARTITIONED_TABLES, rotate_log_partitions, add_months, month_start, drop_rollup_period
+
+logger = logging.getLogger(__name__)
+
+# ✅ 오래된 로그 압축 아카이브
+# - 기간이 끝나고 LOG_ARCHIVE_AFTER_DAYS 가 지난 월별 파티션을 세그먼트 파일로 옮기고 테이블은 DROP
+# - headers/body/response 등 큰 TEXT 컬럼이 DB 밖으로 빠지므로 DB 크기와 페이지 캐시 부담이 줄어듦
+# - 조회는 archived_segments_for_range() + find_archived_rows() / merge_archived_page() (세그먼트의 블록별 최소/최대 시각 인덱스 사용)
+#   건수는 count_archived_rows() / add_archived_count() (LIST_COUNT_CAP 까지만)
+
+# 원본 테이블 → [(세그먼트 파일, 시작, 종료)] (아카이브 생성/삭제 시 log_partitions epoch 로 함께 무효화)
+_archive_cache = TTLCache("log_archives", 16, 300, namespaces=("log_partitions",))
+
+
+def _segment_path(segment_file: str) -> str:
+    return os.path.join(Config.LOG_ARCHIVE_DIR, segment_file)
+
+
+# ✅ 아카이브 생성
+def _archive_partition(base_table: str, partition: str, period_start: str, period_end: str) -> Optional[dict]:
+    time_column = PARTITIONED_TABLES[base_table]["time_column"]
+    os.makedirs(Config.LOG_ARCHIVE_DIR, exist_ok=True)
+    # 같은 달에 늦게 들어온 로그로 파티션이 다시 생겨도 겹치지 않도록 생성 시각을 파일명에 포함
+    segment_file = f"{partition}_{int(time.time())}.seg"
+
+    with get_conn() as conn:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({partition})")]
+        writer = SegmentWriter(_segment_path(segment_file), columns, time_column)
+        try:
+            cur = conn.execute(f"SELECT {', '.join(columns)} FROM {partition} ORDER BY {time_column}, rowid")
+            while True:
+                rows = cur.fetchmany(Config.LOG_ARCHIVE_BLOCK_ROWS)
+                if not rows:
+                    break
+                writer.write_block([tuple(row) for row in rows])
+            summary = writer.close()
+        except Exception:
+            writer.abort()
+            raise
+
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        registered = conn.execute("SELECT 1 FROM log_partitions WHERE partition_table = ?", (partition,)).fetchone()
+        current = conn.execute(f"SELECT COUNT(*) FROM {partition}").fetchone()[0] if registered else None
+        if current != summary["row_count"]:
+            # 다른 워커가 이미 처리했거나, 그 사이 늦게 들어온 로그가 옮겨짐 → 이번 파일은 버리고 다음 주기에 다시 시도
+            os.remove(_segment_path(segment_file))
+            return None
+        conn.execute("""
+            INSERT INTO log_archives (segment_file, base_table, partition_table, period_start, period_end,
+                                      min_time, max_time, row_count, codec, size_bytes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (segment_file, base_table, partition, period_start, period_end,
+              summary["min_time"], summary["max_time"], summary["row_count"], summary["codec"], summary["size_bytes"]))
+        conn.execute(f"DROP TABLE {partition}")
+        conn.execute("DELETE FROM log_partitions WHERE partition_table = ?", (partition,))
+        bump_cache_epoch(conn, "log_partitions")
+    return {"segment_file": segment_file, **summary}
+
+
+def archive_aged_partitions(now: Optional[datetime] = None) -> list[dict]:
+    """기간 종료 후 LOG_ARCHIVE_AFTER_DAYS 가 지난 파티션을 세그먼트 파일로 아카이브"""
+    if Config.LOG_ARCHIVE_AFTER_DAYS <= 0:
+        return []
+    now = now or datetime.now()
+    cutoff = (now - timedelta(days=Config.LOG_ARCHIVE_AFTER_DAYS)).strftime(DB_DATETIME_FORMAT)
+    with get_conn() as conn:
+        targets = conn.execute("""
+            SELECT base_table, partition_table, period_start, period_end
+            FROM log_partitions
+            WHERE period_end <= ?
+            ORDER BY period_start
+        """, (cutoff,)).fetchall()
+
+    archived = []
+    for base_table, partition, period_start, period_end in targets:
+        result = _archive_partition(base_table, partition, period_start, period_end)
+        if result:
+            archived.append(result)
+    if archived:
+        _archive_cache.clear()
+    return archived
+
+
+def drop_expired_archives(now: Optional[datetime] = None) -> list[str]:
+    """보존 기간(*_RETENTION_MONTHS)이 지난 세그먼트 파일 삭제"""
+    now = now or datetime.now()
+    dropped = []
+    with get_conn() as conn:
+        for base_table, spec in PARTITIONED_TABLES.items():
+            months = getattr(Config, spec["retention_setting"])
+            if months <= 0:
+                continue
+            cutoff = add_months(month_start(now), -months).strftime(DB_DATETIME_FORMAT)
+            rows = conn.execute(
+                "SELECT segment_file, period_start, period_end FROM log_archives WHERE base_table = ? AND period_end <= ?",
+                (base_table, cutoff),
+            ).fetchall()
+            for segment_file, period_start, period_end in rows:
+                conn.execute("DELETE FROM log_archives WHERE segment_file = ?", (segment_file,))
+                drop_rollup_period(conn, base_table, period_start, period_end)
+                dropped.append(segment_file)
+        if dropped:
+            bump_cache_epoch(conn, "log_partitions")
+    # 목록에서 먼저 빠진 뒤(커밋 후) 파일 삭제
+    for segment_file in dropped:
+        try:
+            os.remove(_segment_path(segment_file))
+        except FileNotFoundError:
+            pass
+    if dropped:
+        _archive_cache.clear()
+    return dropped
+
+
+# ✅ 로그 저장소 정리 작업 (파티션 이동 → 아카이브 → 보존 기간 지난 아카이브 삭제)
+def run_log_maintenance(now: Optional[datetime] = None) -> dict:
+    result = rotate_log_partitions(now)
+    try:
+        result["archived"] = [a["segment_file"] for a in archive_aged_partitions(now)]
+        result["dropped_archives"] = drop_expired_archives(now)
+    except Exception as e:
+        raise DatabaseError(f"[로그 아카이브 실패] {e}")
+    if result["archived"] or result["dropped_archives"]:
+        logger.info(f"[로그 아카이브] 생성: {result['archived']}, 삭제: {result['dropped_archives']}")
+    return result
+
+
+async def run_log_maintenance_loop(interval_seconds: int):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_db(run_log_maintenance)
+        except Exception as e:
+            logger.warning(str(e))
+
+
+# ✅ 아카이브 조회
+def archived_segments_for_range(conn, base_table: str, start: Optional[str] = None, end: Optional[str] = None) -> list[str]:
+    """[start, end) 와 겹치는 세그먼트 파일 경로 (최신순)"""
+    registry = _archive_cache.get(base_table)
+    if registry is None:
+        registry = [
+            (row[0], row[1], row[2])
+            for row in conn.execute("""
+                SELECT segment_file, period_start, period_end
+                FROM log_archives
+                WHERE base_table = ?
+                ORDER BY period_start DESC
+            """, (base_table,))
+        ]
+        _archive_cache.set(base_table, registry)
+    return [
+        _segment_path(segment_file) for segment_file, period_start, period_end in registry
+        if (start is None or period_end > start) and (end is None or period_start < end)
+    ]
+
+
+@dataclass(frozen=True)
+class Contains:
+    """아카이브 필터용 부분 일치 조건 (utils.fts.text_search 의 LIKE '%term%' 과 같은 결과, ASCII 대소문자 무시)"""
+    term: str
+
+    def __call__(self, value: Any) -> bool:
+        return value is not None and self.term.lower() in str(value).lower()
+
+
+def _row_matches(data: dict[str, list], i: int, filters: dict[str, Any]) -> bool:
+    for col, expected in filters.items():
+        value = data[col][i]
+        if isinstance(expected, Contains):
+            if not expected(value):
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+@functools.lru_cache(maxsize=128)
+def _reader(segment_path: str) -> SegmentReader:
+    # 세그먼트 파일은 만든 뒤 바뀌지 않으므로 footer(블록 인덱스)는 한 번만 읽음
+    return SegmentReader(segment_path)
+
+
+def find_archived_rows(
+    segment_paths: Sequence[str],
+    key_columns: Sequence[str],
+    start: Optional[str],
+    end: Optional[str],
+    filters: dict[str, Any],
+    limit: int,
+    before: Optional[tuple] = None,
+    floor: Optional[tuple] = None,
+) -> list[tuple]:
+    """
+    조건에 맞는 아카이브 행 중 정렬 키가 큰(최신) limit 건의 위치 → [(정렬 키..., 세그먼트 경로, 블록, 행 번호)] (최신순)
+    - key_columns[0] 은 시간 컬럼, 기간 [start, end) 와 filters(컬럼 = 값 / Contains)로 거름
+    - before: 정렬 키가 이 값보다 작은 행만 (keyset 페이지네이션)
+    - floor: DB 쪽에서 이미 limit 건을 채웠을 때 그 마지막 행의 정렬 키 → 이보다 오래된 행은 페이지에 들어올 수 없음
+    - 블록을 최대 시각 내림차순으로 읽다가, 남은 블록이 모은 limit 번째 행(또는 floor)보다 오래되면 중단
+      → 조회 비용이 아카이브 크기가 아니라 페이지 깊이에 비례
+    - 필터/정렬 컬럼만 풀어서 읽고, 나머지 컬럼은 load_archived_rows() 에서 필요한 행만 읽음
+    """
+    if limit <= 0:
+        return []
+    time_column = key_columns[0]
+    names = list(dict.fromkeys([*key_columns, *filters]))
+
+    blocks = []
+    for path in segment_paths:
+        reader = _reader(path)
+        for block_index in reader.blocks_for_range(start, end):
+            block = reader.blocks[block_index]
+            if before is not None and block["min_time"] > before[0]:
+                continue
+            blocks.append((block["max_time"], path, block_index))
+    blocks.sort(reverse=True)
+
+    top: list[tuple] = []  # (정렬 키, 경로, 블록, 행 번호) 최소 힙, 최대 limit 건
+    for max_time, path, block_index in blocks:
+        if floor is not None and max_time < floor[0]:
+            break
+        if len(top) >= limit and max_time < top[0][0][0]:
+            break
+        data = _reader(path).read_columns(block_index, names)
+        for i, t in enumerate(data[time_column]):
+            if (start is not None and t < start) or (end is not None and t >= end):
+                continue
+            if not _row_matches(data, i, filters):
+                continue
+            key = tuple(data[col][i] for col in key_columns)
+            if (before is not None and key >= tuple(before)) or (floor is not None and key < tuple(floor)):
+                continue
+            if len(top) < limit:
+                heapq.heappush(top, (key, path, block_index, i))
+            elif key > top[0][0]:
+                heapq.heapreplace(top, (key, path, block_index, i))
+    return [(*key, path, block_index, i) for key, path, block_index, i in sorted(top, reverse=True)]
+
+
+def load_archived_rows(refs: Sequence[tuple], columns: Sequence[str]) -> list[dict]:
+    """find_archived_rows() 결과 중 필요한 행만 전체 컬럼으로 읽기 (refs 순서 유지)"""
+    blocks: dict[tuple, dict] = {}
+    rows = []
+    for ref in refs:
+        path, block_index, i = ref[-3:]
+        if (path, block_index) not in blocks:
+            blocks[(path, block_index)] = _reader(path).read_columns(block_index, columns)
+        data = blocks[(path, block_index)]
+        rows.append({col: data[col][i] for col in columns})
+    return rows
+
+
+def merge_archived_page(
+    items: list[dict],
+    refs: list[tuple],
+    key_columns: Sequence[str],
+    columns: Sequence[str],
+    offset: int,
+    limit: int,
+) -> list[dict]:
+    """DB 조회 결과(최신순)와 아카이브 행 위치를 최신순으로 합쳐 [offset, offset + limit) 구간만 반환 (아카이브 행은 이때 읽음)"""
+    merged = [(tuple(item[col] for col in key_columns), item) for item in items]
+    merged += [(tuple(ref[:len(key_columns)]), ref) for ref in refs]
+    merged.sort(key=lambda pair: pair[0], reverse=True)
+    page = [value for _, value in merged[offset:offset + limit]]
+    archived = iter(load_archived_rows([value for value in page if isinstance(value, tuple)], columns))
+    return [next(archived) if isinstance(value, tuple) else value for value in page]
+
+
+def count_archived_rows(
+    segment_paths: Sequence[str],
+    start: Optional[str],
+    end: Optional[str],
+    filters: dict[str, Any],
+    cap: Optional[int] = None,
+) -> int:
+    """
+    조건에 맞는 아카이브 행 수 (cap 을 주면 cap 건을 넘는 순간 중단)
+    - 필터가 없고 기간 안에 통째로 들어가는 블록은 footer 의 블록 행 수만 더함 (압축 해제 없음)
+    - 같은 조건의 결과는 목록 건수 캐시(LIST_COUNT_CACHE_TTL_SECONDS)로 재사용
+    """
+    key = ("archived", tuple(segment_paths), start, end, tuple(sorted(filters.items(), key=lambda item: item[0])), cap)
+    cached = count_cache.get(key)
+    if cached is not None:
+        return cached
+
+    total = 0
+    for path in segment_paths:
+        reader = _reader(path)
+        for block_index in reader.blocks_for_range(start, end):
+            block = reader.blocks[block_index]
+            inside = (start is None or block["min_time"] >= start) and (end is None or block["max_time"] < end)
+            if inside and not filters:
+                total += block["rows"]
+            else:
+                data = reader.read_columns(block_index, list(dict.fromkeys([reader.time_column, *filters])))
+                total += sum(
+                    1 for i, t in enumerate(data[reader.time_column])
+                    if (start is None or t >= start) and (end is None or t < end) and _row_matches(data, i, filters)
+                )
+            if cap is not None and total > cap:
+                count_cache.set(key, total)
+                return total
+    count_cache.set(key, total)
+    return total
+
+
+def add_archived_count(
+    total_count: int,
+    capped: bool,
+    segment_paths: Sequence[str],
+    start: Optional[str],
+    end: Optional[str],
+    filters: dict[str, Any],
+) -> tuple[int, bool]:
+    """DB 건수(count_rows 결과)에 아카이브 건수를 더함 → (total_count, capped), LIST_COUNT_CAP 을 넘으면 상한으로 자름"""
+    if not segment_paths or capped:
+        return total_count, capped
+    cap = Config.LIST_COUNT_CAP
+    if cap <= 0:
+        return total_count + count_archived_rows(segment_paths, start, end, filters), False
+    total_count += count_archived_rows(segment_paths, start, end, filters, cap - total_count)
+    if total_count > cap:
+        return cap, True
+    return total_count, False
+
+
+def iter_archived_rows(
+    segment_path: str,
+    columns: Sequence[str],
+    start: Optional[str],
+    end: Optional[str],
+    filters: dict[str, Any],
+) -> Iterator[dict]:
+    """세그먼트 하나에서 조건에 맞는 행을 저장 순서(시각, rowid)대로 반환 (블록 단위로 읽음, 내보내기용)"""
+    reader = _reader(segment_path)
+    time_column = reader.time_column
+    for block_index in reader.blocks_for_range(start, end):
+        data = reader.read_columns(block_index, list(dict.fromkeys([*columns, time_column, *filters])))
+        for i in range(reader.blocks[block_index]["rows"]):
+            t = data[time_column][i]
+            if (start is not None and t < start) or (end is not None and t >= end):
+                continue
+            if not _row_matches(data, i, filters):
+                continue
+            yield {col: data[col][i] for col in columns}
+
+
+def get_log_archive_list() -> list[dict]:
+    try:
+        with get_conn() as conn:
+            rows = conn.execute("""
+                SELECT segment_file, base_table, partition_table, period_start, period_end,
+                       min_time, max_time, row_count, codec, size_bytes, created_at
+                FROM log_archives
+                ORDER BY base_table, period_start DESC
+            """).fetchall()
+            return [dict(row) for row in rows]
+    except Exception as e:
+        raise DatabaseError(f"[로그 아카이브 목록 조회 실패] {e}")
@@ -0,0 +1,287 @@
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional, Sequence
+from utils.cache import TTLCache, bump_cache_epoch
+from utils.config import Config
+from utils.db_config import get_conn, DatabaseError
+from utils.db_migrations import partition_index_sqls
+from utils.time_range import DB_DATETIME_FORMAT
+
+logger = logging.getLogger(__name__)
+
+# ✅ 로그 테이블 월별 파티션
+# - 외부 게이트웨이 / 사용 로그 기록기는 항상 원본(hot) 테이블에 기록
+# - rotate_log_partitions() 가 지난 달 로그를 {원본}_YYYYMM 테이블로 옮기고 log_partitions 에 등록
+# - 조회는 partitions_for_range() 로 기간이 겹치는 테이블만 골라 UNION ALL (union_from_sql)
+# - 보존 기간이 지난 파티션은 DROP TABLE 로 통째로 삭제 (대량 DELETE 없음)
+#   같은 기간의 집계 테이블(rollup_tables) 행도 함께 삭제 → 대시보드 총 호출 수 = 보관 중인 로그 건수
+PARTITIONED_TABLES: dict[str, dict[str, Any]] = {
+    "gateway_logs": {
+        "time_column": "requested_at",
+        "retention_setting": "GATEWAY_LOG_RETENTION_MONTHS",
+        "rollup_tables": ("gateway_stats_hourly",),
+    },
+    "api_usage_log": {
+        "time_column": "request_time",
+        "retention_setting": "USAGE_LOG_RETENTION_MONTHS",
+    },
+}
+
+# 원본 테이블 → [(파티션 테이블, 시작, 종료)] (파티션 생성/삭제 시 cache_epoch 로 무효화)
+_partition_cache = TTLCache("log_partitions", 16, 300, namespaces=("log_partitions",))
+
+
+def month_start(dt: datetime) -> datetime:
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    year, month = divmod(dt.month - 1 + months, 12)
+    return dt.replace(year=dt.year + year, month=month + 1, day=1)
+
+
+# ✅ 조회 대상 테이블 선택
+def partitions_for_range(conn, base_table: str, start: Optional[str] = None, end: Optional[str] = None) -> list[str]:
+    """
+    [start, end) 기간과 겹치는 테이블 목록 (원본 테이블은 항상 포함, 파티션은 최신순)
+    start / end 는 DB 형식 경계값 (utils.time_range.parse_time_bound)
+    """
+    registry = _partition_cache.get(base_table)
+    if registry is None:
+        registry = [
+            (row[0], row[1], row[2])
+            for row in conn.execute("""
+                SELECT partition_table, period_start, period_end
+                FROM log_partitions
+                WHERE base_table = ?
+                ORDER BY period_start DESC
+            """, (base_table,))
+        ]
+        _partition_cache.set(base_table, registry)
+    return [base_table] + [
+        table for table, period_start, period_end in registry
+        if (start is None or period_end > start) and (end is None or period_start < end)
+    ]
+
+
+def union_from_sql(
+    tables: Sequence[str],
+    columns: str,
+    build_where: Callable[[str], tuple[str, list]],
+    order_by: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[str, list]:
+    """
+    여러 파티션을 하나처럼 조회하는 FROM 절 → (from_sql, params)
+    - build_where(table) → ("WHERE ...", params) : 테이블마다 조건을 만들 수 있음 (FTS 인덱스 유무 등)
+    - order_by + limit 을 주면 각 파티션에서 상위 limit 건만 가져와 합침 (정렬 비용을 파티션별 인덱스로)
+    """
+    if len(tables) == 1:
+        where_sql, params = build_where(tables[0])
+        return f"FROM {tables[0]} {where_sql}", list(params)
+
+    # LIMIT 은 바인딩 파라미터로 → 페이지가 달라도 SQL 문자열이 같아서 준비된 문장 재사용
+    tail = f" ORDER BY {order_by} LIMIT ?" if order_by and limit is not None else ""
+    branches = []
+    params: list = []
+    for table in tables:
+        where_sql, where_params = build_where(table)
+        branches.append(f"SELECT * FROM (SELECT {columns} FROM {table} {where_sql}{tail})")
+        params.extend(where_params)
+        if tail:
+            params.append(int(limit))
+    return f"FROM ({' UNION ALL '.join(branches)})", params
+
+
+def union_select_sql(
+    tables: Sequence[str],
+    columns: str,
+    build_where: Callable[[str], tuple[str, list]],
+) -> tuple[str, list]:
+    """
+    여러 파티션을 하나의 복합 SELECT 로 → (select_sql, params)
+    - 바깥에 ORDER BY 를 붙이면 파티션별 인덱스 순서대로 병합 (MERGE (UNION ALL), 임시 정렬 없음 → 스트리밍 조회용)
+    """
+    branches = []
+    params: list = []
+    for table in tables:
+        where_sql, where_params = build_where(table)
+        branches.append(f"SELECT {columns} FROM {table} {where_sql}")
+        params.extend(where_params)
+    return " UNION ALL ".join(branches), params
+
+
+def iter_union_chunks(
+    tables: Sequence[str],
+    columns: str,
+    build_where: Callable[[str], tuple[str, list]],
+    time_column: str,
+    tie_column: str,
+    batch_size: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    여러 파티션을 (time_column, tie_column) 오름차순으로 batch_size 건씩 나눠 조회 (내보내기용)
+    - 청크마다 get_conn() 으로 짧게 읽고 반납 → 다운로드가 길어도 풀 커넥션 / 읽기 스냅샷(WAL 체크포인트)을 잡고 있지 않음
+    - 다음 청크는 time_column > 마지막 시각 (인덱스 range scan), 경계 시각의 행은 마지막 청크에 모두 포함
+    - build_where(table) 은 "WHERE ..." 또는 "" 를 반환
+    """
+    batch_size = batch_size or Config.EXPORT_FETCH_SIZE
+    after: Optional[Any] = None
+
+    def where_with(extra: Optional[str], value: Any) -> Callable[[str], tuple[str, list]]:
+        def build(table: str) -> tuple[str, list]:
+            where_sql, params = build_where(table)
+            if extra is None:
+                return where_sql, list(params)
+            clause = f"{time_column} {extra} ?"
+            return (f"{where_sql} AND {clause}" if where_sql else f"WHERE {clause}"), list(params) + [value]
+        return build
+
+    while True:
+        sql, params = union_select_sql(tables, columns, where_with(None if after is None else ">", after))
+        with get_conn() as conn:
+            rows = [dict(row) for row in conn.execute(f"{sql} ORDER BY {time_column} LIMIT ?", params + [batch_size]).fetchall()]
+            full = len(rows) == batch_size
+            if full:
+                # 경계 시각의 행이 다음 청크로 나뉘지 않도록 같은 시각의 행을 다시 모두 조회
+                last = rows[-1][time_column]
+                rows = [row for row in rows if row[time_column] != last]
+                tie_sql, tie_params = union_select_sql(tables, columns, where_with("=", last))
+                rows.extend(dict(row) for row in conn.execute(tie_sql, tie_params).fetchall())
+        if not rows:
+            return
+        rows.sort(key=lambda row: (row[time_column], row[tie_column]))
+        yield from rows
+        if not full:
+            return
+        after = rows[-1][time_column]
+
+
+# ✅ 파티션 이동 (지난 달 로그 → 월별 테이블)
+def _ensure_partition(conn, base_table: str, partition: str, period_start: str, period_end: str):
+    ddl = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (base_table,)).fetchone()[0]
+    ddl = re.sub(rf'^CREATE TABLE\s+"?{base_table}"?', f"CREATE TABLE IF NOT EXISTS {partition}", ddl, count=1)
+    conn.execute(ddl)
+    # 인덱스는 원본 테이블 마이그레이션과 같은 정의 사용 (utils/db_migrations.py LOG_TABLE_INDEXES)
+    for sql in partition_index_sqls(base_table, partition):
+        conn.execute(sql)
+    cur = conn.execute("""
+        INSERT OR IGNORE INTO log_partitions (partition_table, base_table, period_start, period_end)
+        VALUES (?, ?, ?, ?)
+    """, (partition, base_table, period_start, period_end))
+    if cur.rowcount:
+        bump_cache_epoch(conn, "log_partitions")
+    return bool(cur.rowcount)
+
+
+def _move_partition_chunk(base_table: str, before: str) -> int:
+    """원본 테이블에서 before 이전의 가장 오래된 달 로그를 최대 LOG_PARTITION_MOVE_BATCH_SIZE 건 이동"""
+    col = PARTITIONED_TABLES[base_table]["time_column"]
+    created = False
+    with get_conn() as conn:
+        # 여러 워커가 동시에 실행해도 같은 행을 두 번 옮기지 않도록 쓰기 잠금 선점
+        conn.execute("BEGIN IMMEDIATE")
+        oldest = conn.execute(f"SELECT MIN({col}) FROM {base_table}").fetchone()[0]
+        if not oldest or oldest >= before:
+            return 0
+        try:
+            month = datetime.strptime(str(oldest)[:7], "%Y-%m")
+        except ValueError:
+            logger.warning(f"[로그 파티션] {base_table}.{col} 값 형식을 알 수 없어 이동을 중단합니다: {oldest!r}")
+            return 0
+
+        period_start = month.strftime(DB_DATETIME_FORMAT)
+        period_end = add_months(month, 1).strftime(DB_DATETIME_FORMAT)
+        partition = f"{base_table}_{month:%Y%m}"
+        created = _ensure_partition(conn, base_table, partition, period_start, period_end)
+
+        rowids = [row[0] for row in conn.execute(
+            f"SELECT rowid FROM {base_table} WHERE {col} < ? LIMIT ?",
+            (period_end, Config.LOG_PARTITION_MOVE_BATCH_SIZE),
+        )]
+        ids_json = json.dumps(rowids)
+        conn.execute(f"INSERT INTO {partition} SELECT * FROM {base_table} WHERE rowid IN (SELECT value FROM json_each(?))", (ids_json,))
+        conn.execute(f"DELETE FROM {base_table} WHERE rowid IN (SELECT value FROM json_each(?))", (ids_json,))
+        conn.execute(
+            "UPDATE log_partitions SET row_count = row_count + ? WHERE partition_table = ?",
+            (len(rowids), partition),
+        )
+    if created:
+        # 커밋 전에 다른 요청이 이전 목록을 다시 캐시했을 수 있으므로 커밋 후 한 번 더 비움
+        _partition_cache.clear()
+    return len(rowids)
+
+
+def drop_rollup_period(conn, base_table: str, period_start: str, period_end: str):
+    """보존 기간이 지나 삭제하는 기간 [period_start, period_end) 의 시간대별 집계 행 삭제 (파티션 / 아카이브 삭제와 같은 트랜잭션에서 호출)"""
+    for table in PARTITIONED_TABLES[base_table].get("rollup_tables", ()):
+        # 집계 테이블의 hour 는 'YYYY-MM-DD HH:00' (utils/db_migrations.py _HOUR_BUCKET_SQL)
+        conn.execute(
+            f"DELETE FROM {table} WHERE hour >= ? AND hour < ?",
+            (period_start[:13] + ":00", period_end[:13] + ":00"),
+        )
+
+
+def drop_expired_partitions(now: Optional[datetime] = None) -> list[str]:
+    """보존 기간(*_RETENTION_MONTHS)이 지난 파티션 테이블 DROP"""
+    now = now or datetime.now()
+    dropped = []
+    with get_conn() as conn:
+        for base_table, spec in PARTITIONED_TABLES.items():
+            months = getattr(Config, spec["retention_setting"])
+            if months <= 0:
+                continue
+            cutoff = add_months(month_start(now), -months).strftime(DB_DATETIME_FORMAT)
+            rows = conn.execute(
+                "SELECT partition_table, period_start, period_end FROM log_partitions WHERE base_table = ? AND period_end <= ?",
+                (base_table, cutoff),
+            ).fetchall()
+            for partition, period_start, period_end in rows:
+                conn.execute(f"DROP TABLE IF EXISTS {partition}")
+                conn.execute("DELETE FROM log_partitions WHERE partition_table = ?", (partition,))
+                drop_rollup_period(conn, base_table, period_start, period_end)
+                dropped.append(partition)
+        if dropped:
+            bump_cache_epoch(conn, "log_partitions")
+    if dropped:
+        _partition_cache.clear()
+    return dropped
+
+
+def rotate_log_partitions(now: Optional[datetime] = None) -> dict:
+    """이번 달 이전 로그를 월별 파티션으로 이동 후 보존 기간 지난 파티션 삭제"""
+    now = now or datetime.now()
+    before = month_start(now).strftime(DB_DATETIME_FORMAT)
+    moved = {}
+    try:
+        for base_table in PARTITIONED_TABLES:
+            total = 0
+            while True:
+                count = _move_partition_chunk(base_table, before)
+                if not count:
+                    break
+                total += count
+            if total:
+                moved[base_table] = total
+        dropped = drop_expired_partitions(now)
+    except Exception as e:
+        raise DatabaseError(f"[로그 파티션 정리 실패] {e}")
+
+    if moved or dropped:
+        logger.info(f"[로그 파티션] 이동: {moved}, 삭제: {dropped}")
+    return {"moved": moved, "dropped": dropped}
+
+
+def get_log_partition_list() -> list[dict]:
+    try:
+        with get_conn() as conn:
+            rows = conn.execute("""
+                SELECT partition_table, base_table, period_start, period_end, row_count, created_at
+                FROM log_partitions
+                ORDER BY base_table, period_start DESC
+            """).fetchall()
+            return [dict(row) for row in rows]
+    except Exception as e:
+        raise DatabaseError(f"[로그 파티션 목록 조회 실패] {e}")
@@ -1,4 +1,6 @@
 from utils.db_config import get_conn, DatabaseError
+from utils.time_range import build_time_range
+from db.log_partition_db import partitions_for_range, union_from_sql
 from datetime import datetime, timedelta
 
 def get_overview_stats() -> dict:
@@ -15,78 +17,73 @@ def get_overview_stats() -> dict:
             cur.execute("SELECT COUNT(*) FROM api_keys")
             total_api_keys = cur.fetchone()[0]
 
-            # 3. 총 호출 수 (gateway_logs 기준)
-            cur.execute("SELECT COUNT(*) FROM gateway_logs")
+            # ✅ 호출 통계(3~7)는 gateway_stats_hourly 집계 테이블에서 조회 (로그 건수와 무관하게 일정한 비용)
+            # - gateway_logs INSERT 트리거가 시간 단위로 증분 반영 (utils/db_migrations.py v5)
+            # - 보존 기간이 지나 삭제된 로그의 집계도 함께 삭제되므로 총 호출 수 = 보관 중인 로그 건수
+            # - 날짜 경계는 서버 로컬 시각 기준 (requested_at 이 로컬 시각으로 기록됨, 오늘 호출 수와 같은 기준)
+            now = datetime.now()
+            today = now.strftime('%Y-%m-%d')
+            tomorrow = (now + timedelta(days=1)).strftime('%Y-%m-%d')
+            week_start = (now - timedelta(days=6)).strftime('%Y-%m-%d')
+
+            # 3. 총 호출 수
+            cur.execute("SELECT IFNULL(SUM(call_count), 0) FROM gateway_stats_hourly")
             total_calls = cur.fetchone()[0]
 
-            # 4. 오늘 호출 수 (gateway_logs 기준)
-            today = datetime.now().strftime('%Y-%m-%d')
+            # 4. 오늘 호출 수
             cur.execute(
-                "SELECT COUNT(*) FROM gateway_logs WHERE DATE(requested_at) = ?",
-                (today,)
+                "SELECT IFNULL(SUM(call_count), 0) FROM gateway_stats_hourly WHERE hour >= ? AND hour < ?",
+                (today, tomorrow)
             )
             today_calls = cur.fetchone()[0]
 
-            # 5. 최근 7일간의 호출 통계
-            cur.execute("""
-                WITH RECURSIVE date_series(date) AS (
-                    SELECT DATE('now', '-6 day')
-                    UNION ALL
-                    SELECT DATE(date, '+1 day')
-                    FROM date_series
-                    WHERE date < DATE('now')
-                )
-                SELECT
-                    ds.date,
-                    COUNT(gl.log_id) as count
-                FROM date_series ds
-                LEFT JOIN gateway_logs gl ON DATE(gl.requested_at) = ds.date
-                GROUP BY ds.date
-                ORDER BY ds.date ASC
-            """)
-            daily_stats = [dict(row) for row in cur.fetchall()]
-
-            # 6. 최근 7일간의 오류 통계
+            # 5, 6. 최근 7일간의 호출/오류 통계 (호출이 없는 날은 0 으로 채움)
             cur.execute("""
-                WITH RECURSIVE date_series(date) AS (
-                    SELECT DATE('now', '-6 day')
-                    UNION ALL
-                    SELECT DATE(date, '+1 day')
-                    FROM date_series
-                    WHERE date < DATE('now')
-                )
                 SELECT
-                    ds.date,
-                    COUNT(gl.log_id) as count
-                FROM date_series ds
-                LEFT JOIN gateway_logs gl ON DATE(gl.requested_at) = ds.date AND gl.status_code >= 400
-                GROUP BY ds.date
-                ORDER BY ds.date ASC
-            """)
-            daily_errors = [dict(row) for row in cur.fetchall()]
+                    substr(hour, 1, 10) AS date,
+                    SUM(call_count) AS call_count,
+                    SUM(error_count) AS error_count
+                FROM gateway_stats_hourly
+                WHERE hour >= ? AND hour < ?
+                GROUP BY substr(hour, 1, 10)
+            """, (week_start, tomorrow))
+            by_date = {row["date"]: row for row in cur.fetchall()}
+            dates = [(now - timedelta(days=d)).strftime('%Y-%m-%d') for d in range(6, -1, -1)]
+            daily_stats = [
+                {"date": d, "count": by_date[d]["call_count"] if d in by_date else 0} for d in dates
+            ]
+            daily_errors = [
+                {"date": d, "count": by_date[d]["error_count"] if d in by_date else 0} for d in dates
+            ]
 
-            # 7. 금일 많이 호출된 API TOP 5
+            # 7. 금일 많이 호출된 API TOP 5 (집계 테이블에 path 가 없으므로 api_id + method 로 api_list 와 매칭)
             cur.execute("""
                 SELECT
                     al.api_id,
                     al.api_name,
                     al.method,
-                    COUNT(gl.log_id) as count
-                FROM gateway_logs gl
-                JOIN api_list al ON gl.path = al.path AND gl.method = al.method
-                WHERE DATE(gl.requested_at) = CURRENT_DATE
+                    SUM(gs.call_count) as count
+                FROM gateway_stats_hourly gs
+                JOIN api_list al ON gs.api_id = al.api_id AND gs.method = al.method
+                WHERE gs.hour >= ? AND gs.hour < ?
                 GROUP BY al.api_id, al.api_name, al.method
                 ORDER BY count DESC
                 LIMIT 5
-            """)
+            """, (today, tomorrow))
             top_apis = [dict(row) for row in cur.fetchall()]
 
             # 8. API 권한 신청 대기 건수
             cur.execute("SELECT COUNT(*) FROM api_permission_requests WHERE status = 'PENDING'")
             pending_requests = cur.fetchone()[0]
 
-            # 9. 금일 오류 발생 로그
-            cur.execute("""
+            # 9. 금일 오류 발생 로그 (개별 로그가 필요하므로 gateway_logs 에서 기간 인덱스로 조회)
+            time_where, time_params = build_time_range("requested_at", today, today)
+            where_sql = "WHERE status_code >= 400 AND " + " AND ".join(time_where)
+            tables = partitions_for_range(conn, "gateway_logs", time_params[0], time_params[1])
+            error_from, error_params = union_from_sql(
+                tables, "requested_at, api_id, method, status_code, user_id", lambda table: (where_sql, time_params)
+            )
+            cur.execute(f"""
                 SELECT 
                     gl.requested_at as time, 
                     gl.api_id,
@@ -94,12 +91,10 @@ def get_overview_stats() -> dict:
                     gl.method,
                     gl.status_code, 
                     gl.user_id
-                FROM gateway_logs gl
+                FROM (SELECT requested_at, api_id, method, status_code, user_id {error_from}) gl
                 LEFT JOIN api_list al ON gl.api_id = al.api_id AND gl.method = al.method
-                WHERE gl.status_code >= 400
-                AND DATE(gl.requested_at) = CURRENT_DATE
                 ORDER BY gl.requested_at DESC
-            """)
+            """, error_params)
             recent_errors = [dict(row) for row in cur.fetchall()]
 
             return {
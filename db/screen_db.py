@@ -1,4 +1,10 @@
 from utils.db_config import get_conn, DatabaseError
+from utils.cache import TTLCache, bump_cache_epoch
+from utils.config import Config
+from utils.pagination import fetch_page_with_total
+from utils.fts import text_search
+from utils.set_diff import replace_row_set
+from utils.sql_registry import register_sql
 from typing import Optional
 
 def get_screen_list_info(screen_name: Optional[str], screen_path: Optional[str], use_yn: Optional[str], page: int, per_page: int) -> dict:
@@ -9,11 +15,13 @@ def get_screen_list_info(screen_name: Optional[str], screen_path: Optional[str],
             params = []
 
             if screen_name:
-                filters.append("screen_name LIKE ?")
-                params.append(f"%{screen_name}%")
+                clause, clause_params = text_search("screens", "screen_name", screen_name)
+                filters.append(clause)
+                params.extend(clause_params)
             if screen_path:
-                filters.append("screen_path LIKE ?")
-                params.append(f"%{screen_path}%")
+                clause, clause_params = text_search("screens", "screen_path", screen_path)
+                filters.append(clause)
+                params.extend(clause_params)
             if use_yn in ("Y", "N"):  # ✅ 필터가 주어졌을 때만 적용
                 filters.append("use_yn = ?")
                 params.append(use_yn)                
@@ -22,15 +30,17 @@ def get_screen_list_info(screen_name: Optional[str], screen_path: Optional[str],
             if where_clause:
                 base_query += " AND " + where_clause
 
-            # total count
-            count_sql = f"SELECT COUNT(*) {base_query}"
-            total_count = conn.execute(count_sql, params).fetchone()[0]
-
-            # paging
-            offset = (page - 1) * per_page
-            list_sql = f"SELECT screen_code, screen_name, screen_path, component_name, use_yn, description, create_id, create_date, update_id, update_date {base_query} ORDER BY create_date DESC LIMIT ? OFFSET ?"
-            rows = conn.execute(list_sql, params + [per_page, offset]).fetchall()
-            items = [dict(row) for row in rows]
+            # 목록 + 전체 건수 한 번에 조회
+            items, total_count = fetch_page_with_total(
+                conn,
+                "screen_code, screen_name, screen_path, component_name, use_yn, description, create_id, create_date, update_id, update_date",
+                base_query,
+                params,
+                "create_date DESC",
+                page,
+                per_page,
+                name="screens.list",
+            )
 
             return {"items": items, "total_count": total_count}
     except Exception as e:
@@ -70,6 +80,7 @@ def create_screen_info(data: dict, login_id):
                     login_id
                 )
             )
+            bump_cache_epoch(conn, "screens")
     except Exception as e:
         raise DatabaseError("화면 등록 중 오류 발생", e)
 
@@ -94,6 +105,7 @@ def update_screen_info(screen_code: str, data: dict, login_id) -> bool:
                         screen_code
                     )
             )
+            bump_cache_epoch(conn, "screens")
             return cur.rowcount > 0
     except Exception as e:
         raise DatabaseError("화면 수정 중 오류 발생", e)
@@ -106,6 +118,7 @@ def delete_screen_info(screen_code: str) -> bool:
                 "DELETE FROM screens WHERE screen_code = ?",
                 (screen_code,)
             )
+            bump_cache_epoch(conn, "screens")
             return cur.rowcount > 0
     except Exception as e:
         raise DatabaseError("화면 삭제 중 오류 발생", e)
@@ -128,16 +141,17 @@ def get_screen_ordered_list_info() -> list[dict]:
 def update_screen_order_info(order_list: list[dict]):
     try:
         with get_conn() as conn:
-            # 1. 전체 화면의 menu_order 초기화
-            conn.execute("UPDATE screens SET menu_order = NULL")
-
-            # 2. 전송된 항목만 다시 menu_order 지정
-            for item in order_list:
-                data = item.model_dump()  # Pydantic → dict
-                conn.execute(
-                    "UPDATE screens SET menu_order = ? WHERE screen_code = ?",
-                    (data["menu_order"], data["screen_code"])
-                )
+            # 전송된 항목만 menu_order 지정, 나머지는 NULL → 현재 값과 비교해 바뀐 행만 UPDATE
+            desired = {data["screen_code"]: data["menu_order"] for data in (item.model_dump() for item in order_list)}
+            current = {row["screen_code"]: row["menu_order"] for row in conn.execute("SELECT screen_code, menu_order FROM screens")}
+            changes = [
+                (desired.get(screen_code), screen_code)
+                for screen_code, menu_order in current.items()
+                if desired.get(screen_code) != menu_order
+            ]
+            if changes:
+                conn.executemany("UPDATE screens SET menu_order = ? WHERE screen_code = ?", changes)
+                bump_cache_epoch(conn, "screens")
     except Exception as e:
         raise DatabaseError("화면 순서 저장 중 오류 발생", e)
     
@@ -160,8 +174,10 @@ def get_screens_with_permissions(permission_code: str, search: Optional[str] = N
             params = [permission_code]
 
             if search:
-                sql += " AND (s.screen_name LIKE ? OR s.screen_path LIKE ?)"
-                params += [f"%{search}%", f"%{search}%"]
+                name_clause, name_params = text_search("screens", "screen_name", search, alias="s")
+                path_clause, path_params = text_search("screens", "screen_path", search, alias="s")
+                sql += f" AND ({name_clause} OR {path_clause})"
+                params += name_params + path_params
 
             sql += " ORDER BY CASE WHEN s.menu_order IS NULL THEN 1 ELSE 0 END, s.menu_order ASC"
             rows = conn.execute(sql, params).fetchall()
@@ -169,46 +185,71 @@ def get_screens_with_permissions(permission_code: str, search: Optional[str] = N
     except Exception as e:
         raise DatabaseError("화면 권한 목록 조회 중 오류 발생", e)
 
-def save_screen_permissions(permission_code: str, screen_codes: list[str]):
+def save_screen_permissions(permission_code: str, screen_codes: list[str]) -> dict:
+    """권한별 화면 목록을 screen_codes 로 교체 (바뀐 행만 반영) → {"added": [[screen_code], ...], "removed": [...]}"""
     try:
         with get_conn() as conn:
-            # 1. 기존 권한 삭제
-            conn.execute(
-                "DELETE FROM screen_permissions WHERE permission_code = ?",
-                (permission_code,)
+            diff = replace_row_set(
+                conn, "screen_permissions", {"permission_code": permission_code}, ("screen_code",),
+                [(code,) for code in screen_codes],
             )
-
-            # 2. 새로 insert
-            for code in screen_codes:
-                conn.execute(
-                    "INSERT INTO screen_permissions (permission_code, screen_code) VALUES (?, ?)",
-                    (permission_code, code)
-                )
+            if diff["added"] or diff["removed"]:
+                bump_cache_epoch(conn, "screen_permissions")
+            return diff
     except Exception as e:
         raise DatabaseError("화면 권한 저장 중 오류 발생", e)
     
+# ✅ 화면 접근 권한 캐시 (verify_screen_access)
+# - screen_path → screen_code : 사용 중인 화면 전체 (screens 변경 시 무효화)
+# - permission_code → 접근 가능한 screen_code frozenset (screens / screen_permissions 변경 시 무효화)
+_screen_path_cache = TTLCache("screen_path", 1, Config.SCREEN_ACCESS_CACHE_TTL_SECONDS, namespaces=("screens",))
+_screen_permission_cache = TTLCache(
+    "screen_permission_codes", 64, Config.SCREEN_ACCESS_CACHE_TTL_SECONDS, namespaces=("screens", "screen_permissions")
+)
+
+_SCREEN_PATHS_SQL = register_sql("screens.paths", "SELECT screen_path, screen_code FROM screens WHERE use_yn = 'Y'")
+_SCREEN_CODES_BY_PERMISSION_SQL = register_sql(
+    "screen_permissions.by_permission", "SELECT screen_code FROM screen_permissions WHERE permission_code = ?"
+)
+
 def get_screen_code_by_path(screen_path: str) -> Optional[str]:
-    try:
-        with get_conn() as conn:
-            row = conn.execute(
-                "SELECT screen_code FROM screens WHERE screen_path = ? AND use_yn = 'Y'",
-                (screen_path,)
-            ).fetchone()
-            return row["screen_code"] if row else None
-    except Exception as e:
-        raise DatabaseError("화면 코드 조회 중 오류 발생", e)    
-    
-def get_screen_codes_by_permission_code(permission_code: str) -> list[str]:
-    try:
-        with get_conn() as conn:
-            rows = conn.execute(
-                "SELECT screen_code FROM screen_permissions WHERE permission_code = ?",
-                (permission_code,)
-            ).fetchall()
-            return [row["screen_code"] for row in rows]
-    except Exception as e:
-        raise DatabaseError("권한별 접근 가능한 화면 목록 조회 중 오류 발생", e)    
-    
+    paths = _screen_path_cache.get("paths")
+    if paths is None:
+        try:
+            with get_conn() as conn:
+                rows = conn.execute(_SCREEN_PATHS_SQL).fetchall()
+        except Exception as e:
+            raise DatabaseError("화면 코드 조회 중 오류 발생", e)
+        paths = {row["screen_path"]: row["screen_code"] for row in rows}
+        _screen_path_cache.set("paths", paths)
+    return paths.get(screen_path)
+
+def get_screen_codes_by_permission_code(permission_code: str) -> frozenset[str]:
+    codes = _screen_permission_cache.get(permission_code)
+    if codes is None:
+        try:
+            with get_conn() as conn:
+                rows = conn.execute(_SCREEN_CODES_BY_PERMISSION_SQL, (permission_code,)).fetchall()
+        except Exception as e:
+            raise DatabaseError("권한별 접근 가능한 화면 목록 조회 중 오류 발생", e)
+        codes = frozenset(row["screen_code"] for row in rows)
+        _screen_permission_cache.set(permission_code, codes)
+    return codes
+
+def get_screen_access(permission_code: str, screen_path: str) -> tuple[Optional[str], bool]:
+    """(screen_code, 접근 가능 여부) - 화면이 없으면 (None, False)"""
+    screen_code = get_screen_code_by_path(screen_path)
+    return screen_code, screen_code is not None and screen_code in get_screen_codes_by_permission_code(permission_code)
+
+def peek_screen_access(permission_code: str, screen_path: str) -> Optional[tuple[Optional[str], bool]]:
+    """캐시에 있으면 get_screen_access() 결과, 없으면 None → 이벤트 루프에서 DB 없이 확인할 때 사용"""
+    paths = _screen_path_cache.get("paths")
+    codes = _screen_permission_cache.get(permission_code)
+    if paths is None or codes is None:
+        return None
+    screen_code = paths.get(screen_path)
+    return screen_code, screen_code is not None and screen_code in codes
+
 def get_screens_with_permissions_by_user(user_id: str) -> list[dict]:
     try:
         with get_conn() as conn:
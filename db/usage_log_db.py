@@ -1,80 +1,347 @@
 from utils.db_config import get_conn, DatabaseError
-import json, math
+from utils.config import Config
+from utils.time_range import build_time_range, parse_time_bound
+from utils.pagination import fetch_page, count_rows
+from utils.sql_registry import register_sql
+from utils.fts import text_search
+from utils.json_codec import RawJSON, dumps, encode_once
+from db.log_partition_db import partitions_for_range, union_from_sql, iter_union_chunks
+from db.log_archive_db import (
+    Contains, archived_segments_for_range, find_archived_rows, merge_archived_page, add_archived_count, iter_archived_rows,
+)
+from datetime import datetime
+from typing import Iterator, Optional
+import hashlib, heapq, json, math, logging, queue, threading, time
+
+logger = logging.getLogger(__name__)
+
+USAGE_LOG_COLUMNS = ["user_id", "path", "method", "status_code", "request_data", "response_data", "request_time"]
+_USAGE_LOG_COLUMNS = ", ".join(USAGE_LOG_COLUMNS)
+_USAGE_LOG_SORT_KEY = ("request_time",)
+
+
+# ✅ 공통 조건 구성 (FTS 인덱스는 원본 테이블에만 있으므로 테이블별로 생성)
+def _usage_log_where(table, searchDateStart, searchDateEnd, user_id=None, path=None, method=None):
+    # 기간은 request_time 원본 컬럼에 [시작, 종료) 로 비교 (request_time 인덱스)
+    where_clauses, params = build_time_range("request_time", searchDateStart, searchDateEnd)
+
+    if user_id:
+        clause, clause_params = text_search(table, "user_id", user_id)
+        where_clauses.append(clause)
+        params.extend(clause_params)
+    if path:
+        clause, clause_params = text_search(table, "path", path)
+        where_clauses.append(clause)
+        params.extend(clause_params)
+    if method:
+        where_clauses.append("method = ?")
+        params.append(method)
+
+    return "WHERE " + " AND ".join(where_clauses) if where_clauses else "", params
+
+
+def _usage_log_archive_filters(user_id=None, path=None, method=None) -> dict:
+    """_usage_log_where() 와 같은 조건의 아카이브 필터 (user_id / path 는 부분 일치)"""
+    filters = {}
+    if user_id:
+        filters["user_id"] = Contains(user_id)
+    if path:
+        filters["path"] = Contains(path)
+    if method:
+        filters["method"] = method
+    return filters
+
 
 # ✅ 사용 로그 목록 조회
 def get_usage_log_list(page, per_page, searchDateStart, searchDateEnd, user_id=None, path=None, method=None):
     try:
         with get_conn() as conn:
-            cur = conn.cursor()
-
-            # ✅ 공통 조건 구성
-            where_clauses = ["strftime('%Y-%m-%d %H:%M', request_time) BETWEEN ? AND ?"]
-            params = [searchDateStart, searchDateEnd]
-
-            if user_id:
-                where_clauses.append("user_id LIKE ?")
-                params.append(f"%{user_id}%")
-            if path:
-                where_clauses.append("path LIKE ?")
-                params.append(f"%{path}%")
-            if method:
-                where_clauses.append("method = ?")
-                params.append(method)
-
-            where_sql = " AND ".join(where_clauses)
-
-            # ✅ 메인 쿼리
-            query = f"""
-                SELECT user_id, path, method, status_code, request_data, response_data, request_time
-                FROM api_usage_log
-                WHERE {where_sql}
-                ORDER BY request_time DESC
-                LIMIT ? OFFSET ?
-            """
-            cur.execute(query, params + [per_page, (page - 1) * per_page])
-            rows = cur.fetchall()
-
-            # ✅ 카운트 쿼리
-            count_query = f"""
-                SELECT COUNT(*)
-                FROM api_usage_log
-                WHERE {where_sql}
-            """
-            cur.execute(count_query, params)
-            total_count = cur.fetchone()[0]
-
-            return {
-                "items": [dict(row) for row in rows],
-                "total_pages": math.ceil(total_count / per_page),
-                "total_count": total_count
-            }
+            # ✅ 기간이 겹치는 월별 파티션만 조회 대상 (db/log_partition_db.py)
+            period = (parse_time_bound(searchDateStart), parse_time_bound(searchDateEnd, end=True))
+            tables = partitions_for_range(conn, "api_usage_log", *period)
+            # 아카이브된 달과 겹치는 기간이면 세그먼트 파일도 함께 조회 (db/log_archive_db.py)
+            segments = archived_segments_for_range(conn, "api_usage_log", *period)
+
+            def build_where(table):
+                return _usage_log_where(table, searchDateStart, searchDateEnd, user_id, path, method)
+
+            offset = (page - 1) * per_page
+
+            # ✅ 목록 조회 (아카이브와 합칠 때는 DB 쪽을 앞 페이지까지 모두 조회)
+            page_from, page_params = union_from_sql(tables, _USAGE_LOG_COLUMNS, build_where, "request_time DESC", offset + per_page)
+            if segments:
+                items = fetch_page(conn, _USAGE_LOG_COLUMNS, page_from, page_params, "request_time DESC", 1, offset + per_page, name="usage_log.list")
+            else:
+                items = fetch_page(conn, _USAGE_LOG_COLUMNS, page_from, page_params, "request_time DESC", page, per_page, name="usage_log.list")
+
+            # ✅ 전체 건수 (LIST_COUNT_CAP 까지만, 필터별 캐시)
+            count_from, count_params = union_from_sql(tables, "log_id", build_where)
+            total_count, capped = count_rows(conn, count_from, count_params, name="usage_log.list")
+
+        if segments:
+            filters = _usage_log_archive_filters(user_id, path, method)
+            need = offset + per_page
+            floor = (items[-1]["request_time"],) if len(items) >= need else None
+            refs = find_archived_rows(segments, _USAGE_LOG_SORT_KEY, *period, filters, need, floor=floor)
+            items = merge_archived_page(items, refs, _USAGE_LOG_SORT_KEY, USAGE_LOG_COLUMNS, offset, per_page)
+            total_count, capped = add_archived_count(total_count, capped, segments, *period, filters)
+
+        return {
+            "items": items,
+            "total_pages": math.ceil(total_count / per_page),
+            "total_count": total_count,
+            "total_count_capped": capped,
+        }
 
     except Exception as e:
         raise DatabaseError(f"[로그 조회 실패] {e}")
 
 
+# ✅ 사용 로그 내보내기 (오래된 순, 서버 측 커서로 한 건씩 → 메모리 사용량 일정)
+def iter_usage_logs(searchDateStart, searchDateEnd, user_id=None, path=None, method=None) -> Iterator[dict]:
+    try:
+        period = (parse_time_bound(searchDateStart), parse_time_bound(searchDateEnd, end=True))
+        with get_conn() as conn:
+            tables = partitions_for_range(conn, "api_usage_log", *period)
+            segments = archived_segments_for_range(conn, "api_usage_log", *period)
+
+        # request_time 기준 청크 조회 (같은 시각은 log_id 순, 청크마다 커넥션을 짧게 빌리고 반납)
+        rows: Iterator[dict] = iter_union_chunks(
+            tables,
+            f"{_USAGE_LOG_COLUMNS}, log_id",
+            lambda table: _usage_log_where(table, searchDateStart, searchDateEnd, user_id, path, method),
+            "request_time",
+            "log_id",
+        )
+        if segments:
+            # 아카이브 세그먼트도 시간순으로 병합 (gateway_logs 내보내기와 같은 방식)
+            filters = _usage_log_archive_filters(user_id, path, method)
+            rows = heapq.merge(
+                rows,
+                *(iter_archived_rows(seg, USAGE_LOG_COLUMNS, *period, filters) for seg in segments),
+                key=lambda row: row["request_time"],
+            )
+        yield from rows
+    except Exception as e:
+        raise DatabaseError(f"[로그 내보내기 실패] {e}")
 
 
 def to_json_safe(obj):
+    if isinstance(obj, RawJSON):
+        return obj
     try:
-        return json.dumps(obj, ensure_ascii=False)
-    except TypeError:
+        return dumps(obj).decode("utf-8")
+    except (TypeError, ValueError):
         return json.dumps(str(obj), ensure_ascii=False)
-    
+
+
+_INSERT_USAGE_LOG_SQL = register_sql("api_usage_log.insert", """
+    INSERT INTO api_usage_log (user_id, path, method, request_data, response_data, status_code, request_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+""")
+
+def _to_insert_params(entry: tuple) -> tuple:
+    login_id, path, method, request_data, response_data, status_code, request_time = entry
+    return (
+        login_id,
+        path,
+        method,
+        to_json_safe(request_data),
+        to_json_safe(response_data),
+        status_code,
+        request_time
+    )
+
+
+class UsageLogWriter:
+    """
+    api_usage_log 백그라운드 배치 기록기.
+    - 요청 경로에서는 메모리 큐에 넣기만 함 (디스크 fsync 없음)
+    - 전용 스레드가 batch_size 건 또는 flush_interval_ms 마다 executemany 로 한 트랜잭션에 기록
+    - 큐가 가득 차면 요청을 막지 않고 해당 로그를 버리고 dropped 카운터 증가
+    - stop() 시 큐에 남은 로그를 모두 기록한 뒤 종료
+    """
+    _STOP = object()
+
+    def __init__(self, queue_size: int, batch_size: int, flush_interval_ms: int):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="usage-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, entry: tuple) -> bool:
+        try:
+            self._queue.put_nowait(entry)
+            self._enqueued += 1
+            return True
+        except queue.Full:
+            self._dropped += 1
+            if self._dropped % 1000 == 1:
+                logger.warning(f"[사용 로그 큐 포화] 로그를 버렸습니다. (누적 {self._dropped}건)")
+            return False
+
+    def stop(self, timeout: float = 10.0):
+        if not self.running:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is self._STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+        # 종료 시 남은 로그 모두 기록 (graceful drain)
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._STOP:
+                batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch: list):
+        try:
+            with get_conn() as conn:
+                conn.executemany(_INSERT_USAGE_LOG_SQL, [_to_insert_params(entry) for entry in batch])
+            self._written += len(batch)
+            self._batches += 1
+        except Exception as e:
+            self._failed += len(batch)
+            logger.warning(f"[사용 로그 배치 기록 실패] {len(batch)}건: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queue_size": self._queue.qsize(),
+            "queue_max_size": self._queue.maxsize,
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "batches": self._batches,
+            "dropped": self._dropped,
+            "failed": self._failed,
+        }
+
+
+usage_log_writer = UsageLogWriter(
+    queue_size=Config.USAGE_LOG_QUEUE_SIZE,
+    batch_size=Config.USAGE_LOG_BATCH_SIZE,
+    flush_interval_ms=Config.USAGE_LOG_FLUSH_INTERVAL_MS,
+)
+
+def start_usage_log_writer():
+    usage_log_writer.start()
+
+def stop_usage_log_writer():
+    usage_log_writer.stop()
+
+def get_usage_log_writer_stats() -> dict:
+    return usage_log_writer.stats()
+
+# ✅ 응답 기록 정책 (모든 log_api_usage 호출에 공통 적용)
+# - GET 목록 응답(리스트, items/data 리스트 또는 페이지 정보를 담은 dict): 행 수 / 페이지 정보 / 크기 / 본문 해시만 기록
+# - 그 외 응답: USAGE_LOG_RESPONSE_MAX_BYTES 까지만 기록, 넘으면 앞부분 + 전체 크기 / 해시
+# - USAGE_LOG_FULL_CAPTURE_PATHS 에 등록한 경로는 전체 기록
+# 인코딩 결과는 응답 본문과 공유하므로(encode_once) 요약/해시를 위한 추가 인코딩 없음
+_PAGE_KEYS = ("page", "per_page", "total_count", "total_pages", "total_count_capped", "has_more", "next_cursor")
+_LIST_KEYS = ("items", "data")
+
+
+def _row_counts(data):
+    """목록 응답이면 행 수 (list → 건수, dict → 리스트 키별 건수), 목록 응답이 아니면 None"""
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict) and (
+        any(isinstance(data.get(key), list) for key in _LIST_KEYS) or any(key in data for key in _PAGE_KEYS)
+    ):
+        return {key: len(value) for key, value in data.items() if isinstance(value, list)}
+    return None
+
+
+def capture_response(path, method, response_data):
+    try:
+        encoded = encode_once(response_data)
+    except (TypeError, ValueError):
+        return response_data
+    if path in Config.USAGE_LOG_FULL_CAPTURE_PATHS:
+        return RawJSON(encoded.decode("utf-8"))
+
+    digest = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+    if method == "GET":
+        rows = _row_counts(response_data)
+        if rows is not None:
+            summary = {"summary": True, "rows": rows, "bytes": len(encoded), "hash": digest}
+            if isinstance(response_data, dict):
+                summary.update({key: response_data[key] for key in _PAGE_KEYS if key in response_data})
+            return summary
+
+    limit = Config.USAGE_LOG_RESPONSE_MAX_BYTES
+    if limit <= 0 or len(encoded) <= limit:
+        return RawJSON(encoded.decode("utf-8"))
+    return {
+        "truncated": True,
+        "bytes": len(encoded),
+        "hash": digest,
+        "head": encoded[:limit].decode("utf-8", errors="ignore"),
+    }
+
+
 # ✅ 사용 로그 기록
+# - 앱 실행 중에는 백그라운드 기록기 큐에 적재만 하고 즉시 반환
+# - 기록기가 없는 환경(스크립트 등)에서는 기존처럼 바로 INSERT
 def log_api_usage(login_id, path, method, request_data, response_data, status_code):
+    response_data = capture_response(path, method, response_data)
+    entry = (
+        login_id,
+        path,
+        method,
+        request_data,
+        response_data,
+        status_code,
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    )
+    if usage_log_writer.running:
+        usage_log_writer.submit(entry)
+        return
     try:
         with get_conn() as conn:
-            conn.execute("""
-                INSERT INTO api_usage_log (user_id, path, method, request_data, response_data, status_code, request_time)
-                VALUES (?, ?, ?, ?, ?, ?, datetime('now', 'localtime'))
-            """, (
-                login_id,
-                path,
-                method,
-                to_json_safe(request_data),
-                to_json_safe(response_data),
-                status_code
-            ))
+            conn.execute(_INSERT_USAGE_LOG_SQL, _to_insert_params(entry))
     except Exception as e:
         raise DatabaseError(f"[로그 기록 실패] {e}")
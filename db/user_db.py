@@ -1,5 +1,9 @@
 from utils.db_config import get_conn, DatabaseError
+from utils.cache import bump_cache_epoch
+from utils.pagination import fetch_page_with_total
+from utils.fts import text_search
 from utils.common import password_hash_key
+from db.auth_db import load_session_principal, invalidate_principal
 from typing import Optional
 import math
 
@@ -29,17 +33,17 @@ def authenticate_user(user_id, password) -> Optional[dict]:
 def get_user_list(page=1, per_page=15, user_id=None, user_name=None, use_yn=None):
     try:
         with get_conn() as conn:
-            cur = conn.cursor()
-
             # 공통 조건문 작성
             where_clauses = []
             params = []
             if user_id:
-                where_clauses.append("u.user_id LIKE ?")
-                params.append(f"%{user_id}%")
+                clause, clause_params = text_search("users", "user_id", user_id, alias="u")
+                where_clauses.append(clause)
+                params.extend(clause_params)
             if user_name:
-                where_clauses.append("u.user_name LIKE ?")
-                params.append(f"%{user_name}%")
+                clause, clause_params = text_search("users", "user_name", user_name, alias="u")
+                where_clauses.append(clause)
+                params.extend(clause_params)
             if use_yn:
                 where_clauses.append("u.use_yn = ?")
                 params.append(use_yn)
@@ -48,34 +52,25 @@ def get_user_list(page=1, per_page=15, user_id=None, user_name=None, use_yn=None
             if where_sql:
                 where_sql = " AND " + where_sql
 
-            # 목록 조회
-            query = f"""
-                SELECT 
-                    u.*, 
-                    upt.permission_name 
-                FROM users u
-                LEFT JOIN user_permission_types upt ON u.permission_code = upt.permission_code
-                WHERE 1=1
-                {where_sql}
-                ORDER BY u.create_date DESC
-                LIMIT ? OFFSET ?
-            """
-            cur.execute(query, params + [per_page, (page - 1) * per_page])
-            rows = cur.fetchall()
-
-            # 총 개수 조회
-            count_query = f"""
-                SELECT COUNT(*) 
+            # 목록 + 전체 건수 한 번에 조회
+            items, total_count = fetch_page_with_total(
+                conn,
+                "u.*, upt.permission_name",
+                f"""
                 FROM users u
                 LEFT JOIN user_permission_types upt ON u.permission_code = upt.permission_code
                 WHERE 1=1
                 {where_sql}
-            """
-            cur.execute(count_query, params)
-            total_count = cur.fetchone()[0]
+                """,
+                params,
+                "u.create_date DESC",
+                page,
+                per_page,
+                name="users.list",
+            )
 
             return {
-                "items": [dict(row) for row in rows],
+                "items": items,
                 "total_count": total_count,
                 "total_pages": math.ceil(total_count / per_page)
             }
@@ -97,6 +92,7 @@ def insert_user(user: dict):
                 user["user_id"], password_hashed_key, user["user_name"], user["permission_code"],
                 user["use_yn"], user["login_id"], user["login_id"]
             ))
+            bump_cache_epoch(conn, "users")
 
     except Exception as e:
         raise DatabaseError(f"[사용자 등록 실패] {e}")
@@ -109,9 +105,12 @@ def update_user_info(user: dict):
                 SET user_name = ?, update_id = ?, update_date = CURRENT_TIMESTAMP, permission_code = ?, use_yn = ?
                 WHERE user_id = ?
             """, (user["user_name"], user["login_id"], user["permission_code"], user["use_yn"], user["user_id"]))
+            bump_cache_epoch(conn, "users")
             return cur.rowcount > 0
     except Exception as e:
         raise DatabaseError(f"[사용자 정보 수정 실패] {e}")
+    finally:
+        invalidate_principal(user["user_id"])
 
 def update_user_password(user_id: str, new_password: str, updater_id: str) -> bool:
     try:
@@ -121,9 +120,12 @@ def update_user_password(user_id: str, new_password: str, updater_id: str) -> bo
                 SET password = ?, update_id = ?, update_date = CURRENT_TIMESTAMP
                 WHERE user_id = ?
             """, (password_hash_key(new_password), updater_id, user_id))
+            bump_cache_epoch(conn, "users")
             return cur.rowcount > 0
     except Exception as e:
         raise DatabaseError(f"[비밀번호 변경 실패] {e}")
+    finally:
+        invalidate_principal(user_id)
     
 def delete_user_overall_logic(user_id: str):
     try:
@@ -138,17 +140,16 @@ def delete_user_overall_logic(user_id: str):
 
             # 권한 삭제
             conn.execute("DELETE FROM api_permissions WHERE user_id = ?", (user_id,))
+            bump_cache_epoch(conn, "users", "api_permissions")
             
     except Exception as e:
-        raise DatabaseError(f"[유저, API-Key, API 권한 삭제 실패] {e}")    
+        raise DatabaseError(f"[유저, API-Key, API 권한 삭제 실패] {e}")
+    finally:
+        invalidate_principal(user_id)    
     
 def is_active_user_id(user_id: str) -> bool:
-    try:
-        with get_conn() as conn:
-            cur = conn.execute("SELECT 1 FROM users WHERE user_id = ? AND use_yn = 'Y' LIMIT 1", (user_id,))
-            return cur.fetchone() is not None
-    except Exception as e:
-        raise DatabaseError(f"[유저 활성 상태 확인 실패] {e}")    
+    principal = load_session_principal(user_id)
+    return bool(principal and principal["use_yn"] == "Y")
 
 def is_existing_user_id(user_id) -> bool:
     try:
@@ -159,24 +160,8 @@ def is_existing_user_id(user_id) -> bool:
         raise DatabaseError(f"[사용자 존재 여부 확인 실패] {e}")    
 
 def get_user_info(user_id: str) -> Optional[dict]:
-    try:
-        with get_conn() as conn:
-            cur = conn.execute("""
-                SELECT 
-                    u.user_id, 
-                    u.user_name, 
-                    u.permission_code, 
-                    u.use_yn, 
-                    u.create_id, 
-                    u.create_date, 
-                    u.update_id, 
-                    u.update_date,
-                    CASE WHEN k.api_key IS NOT NULL THEN TRUE ELSE FALSE END AS has_api_key
-                FROM users u
-                LEFT JOIN api_keys k ON u.user_id = k.user_id
-                WHERE u.user_id = ?
-            """, (user_id,))
-            row = cur.fetchone()
-            return dict(row) if row else None
-    except Exception as e:
-        raise DatabaseError(f"[유저 정보 조회 실패] {e}")    
\ No newline at end of file
+    principal = load_session_principal(user_id)
+    if not principal:
+        return None
+    principal.pop("refresh_token", None)
+    return principal
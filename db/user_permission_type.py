@@ -1,4 +1,5 @@
 from utils.db_config import get_conn, DatabaseError
+from utils.fts import text_search
 from typing import Optional
 
 def get_user_permission_types(
@@ -81,11 +82,13 @@ def get_users_with_user_permission_type(permission_code: str, user_id=None, user
             """
             params = [permission_code]
             if user_id:
-                query += " AND u.user_id LIKE ?"
-                params.append(f"%{user_id}%")
+                clause, clause_params = text_search("users", "user_id", user_id, alias="u")
+                query += f" AND {clause}"
+                params.extend(clause_params)
             if user_name:
-                query += " AND u.user_name LIKE ?"
-                params.append(f"%{user_name}%")
+                clause, clause_params = text_search("users", "user_name", user_name, alias="u")
+                query += f" AND {clause}"
+                params.extend(clause_params)
             query += " ORDER BY u.user_id ASC"
 
             rows = conn.execute(query, tuple(params)).fetchall()
@@ -1,9 +1,11 @@
+import asyncio
 import logging
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from utils.config import Config
+from utils.middleware import WebServiceMiddleware
+from utils.json_codec import FastJSONResponse
 from contextlib import asynccontextmanager
 from utils.init_sync import ( sync_api_on_startup )
 from utils.exception_handler import (
@@ -13,10 +15,11 @@ from utils.exception_handler import (
     handle_unexpected_exception,
     handle_database_error
 )
-from utils.db_config import init_db, DatabaseError
+from utils.db_config import init_db, close_pool, get_pool_stats, run_wal_checkpoint_loop, checkpoint_wal, DatabaseError
+from utils.db_async import run_db, shutdown_db_executor
+from db.usage_log_db import start_usage_log_writer, stop_usage_log_writer, get_usage_log_writer_stats
+from db.log_archive_db import run_log_maintenance_loop
 from routers import overview, auth, user, screen, api, api_key, api_permission, usage_log, user_permission_type, gateway_log
-ACCESS_TOKEN_EXPIRE_MINUTES = Config.ACCESS_TOKEN_EXPIRE_MINUTES
-REFRESH_TOKEN_EXPIRE_DAYS = Config.REFRESH_TOKEN_EXPIRE_DAYS
 
 # 🔧 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -28,18 +31,40 @@ async def lifespan(app: FastAPI):
     # ✅ 앱 실행 전에 수행할 초기화 작업
     logger.info("🚀 앱 시작: DB 설정중...")
     await init_db()                 # DB 테이블 생성 (없으면)
+    start_usage_log_writer()        # API 사용 로그 배치 기록기 시작
     #await sync_api_on_startup(app)
 
+    # 주기적 WAL 체크포인트 작업
+    background_tasks = []
+    if Config.DB_WAL_CHECKPOINT_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_wal_checkpoint_loop(Config.DB_WAL_CHECKPOINT_INTERVAL_SECONDS)))
+    # 지난 달 로그 월별 파티션 이동 + 오래된 파티션 아카이브 + 보존 기간 지난 파티션/아카이브 삭제
+    if Config.LOG_PARTITION_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_log_maintenance_loop(Config.LOG_PARTITION_INTERVAL_SECONDS)))
+
     yield  # 👈 여기서 FastAPI 앱이 실행됩니다 (요청 수신 가능 상태로 진입)
 
     # 🛑 앱 종료 직전에 실행할 정리 작업 (옵션)
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await asyncio.to_thread(stop_usage_log_writer)  # 큐에 남은 사용 로그 모두 기록 후 종료
+    logger.info(f"📊 사용 로그 기록기 통계: {get_usage_log_writer_stats()}")
+    try:
+        await run_db(checkpoint_wal)
+    except Exception as e:
+        logger.warning(f"[WAL 체크포인트 실패] {e}")
+    logger.info(f"📊 DB 커넥션 풀 통계: {get_pool_stats()}")
+    shutdown_db_executor()
+    close_pool()
     logger.info("🛑 앱 종료")
 
 app = FastAPI(
     title="Web Service API",
     version="1.0.0",
     description="API Gateway에서 프록시되는 실제 웹 서비스 API",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,  # orjson (없으면 표준 json), utils/json_codec.py
 )
 
 # ✅ CORS 설정
@@ -51,6 +76,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ✅ 주소창 직접 접근 차단 + 토큰 쿠키 갱신 (순수 ASGI 미들웨어, utils/middleware.py)
+app.add_middleware(WebServiceMiddleware)
+
 # ✅ 예외 핸들러 등록
 app.add_exception_handler(HTTPException, handle_http_exception)
 app.add_exception_handler(RequestValidationError, handle_validation_error)
@@ -69,51 +97,3 @@ app.include_router(api_permission.router, prefix="")
 app.include_router(usage_log.router, prefix="")
 app.include_router(user_permission_type.router, prefix="")
 app.include_router(gateway_log.router, prefix="")
-
-@app.middleware("http")
-async def set_sliding_token_cookie(request: Request, call_next):
-    response = await call_next(request)
-
-    if hasattr(request.state, "new_access_token"):
-        response.set_cookie(
-            key="access_token",
-            value=request.state.new_access_token,
-            httponly=True,
-            secure=True,  # 운영 환경에서 반드시 True
-            samesite="Lax",
-            max_age=60 * ACCESS_TOKEN_EXPIRE_MINUTES, # 초 * 분
-            path="/"
-        )
-
-    if hasattr(request.state, "new_refresh_token"):
-        response.set_cookie(
-            key="refresh_token",
-            value=request.state.new_refresh_token,
-            httponly=True,
-            secure=True,
-            samesite="Lax",
-            max_age=60 * 60 * 24 * REFRESH_TOKEN_EXPIRE_DAYS,  # 초 * 분 * 시 * 일
-            path="/"
-        )
-
-    return response
-
-@app.middleware("http")
-async def block_direct_browser_access(request: Request, call_next):
-    if request.url.path.startswith("/apim"):
-        ua = request.headers.get("user-agent", "")
-        accept = request.headers.get("accept", "")
-        xrw = request.headers.get("x-requested-with", "")
-
-        # 조건: 주소창 직접 입력으로 보이는 경우
-        if (
-            not xrw == "XMLHttpRequest" and
-            "text/html" in accept and
-            "Mozilla" in ua
-        ):
-            return JSONResponse(
-                status_code=403,
-                content={"detail": "❌ 주소창 직접 접근이 차단되었습니다."}
-            )
-
-    return await call_next(request)
\ No newline at end of file
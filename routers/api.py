@@ -3,23 +3,25 @@ from typing import Optional
 from schemas.api_schema import ApiCreateRequest, ApiUpdateRequest
 from services.api_service import *
 from services.auth_service import verify_authentication
+from utils.db_config import db_unit_of_work, UnitOfWork
+from utils.json_codec import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/apim/api")
-async def create_api_router(payload: ApiCreateRequest, request: Request, _: str = Depends(verify_authentication)):
+async def create_api_router(payload: ApiCreateRequest, request: Request, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     login_id = request.state.user_id
-    return create_api_service(payload, login_id)
+    return await create_api_service(payload, login_id)
 
 @router.put("/apim/api/{method}/{api_id}")
-async def update_api_router(api_id: str, method: str, payload: ApiUpdateRequest, request: Request, _: str = Depends(verify_authentication)):
+async def update_api_router(api_id: str, method: str, payload: ApiUpdateRequest, request: Request, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     login_id = request.state.user_id
-    return update_api_service(api_id, method, payload, login_id)
+    return await update_api_service(api_id, method, payload, login_id)
 
 @router.delete("/apim/api/{method}/{api_id}")
-async def delete_api_route(api_id: str, method: str, request: Request, _: str = Depends(verify_authentication)):
+async def delete_api_route(api_id: str, method: str, request: Request, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     login_id = request.state.user_id
-    return delete_api_service(api_id, method, login_id)
+    return await delete_api_service(api_id, method, login_id)
 
 @router.get("/apim/api")
 async def get_api_list_router(
@@ -32,4 +34,4 @@ async def get_api_list_router(
     _: str = Depends(verify_authentication)
 ):
     login_id = request.state.user_id
-    return get_api_list_service(page, per_page, api_name, path, use_yn, login_id)
+    return await get_api_list_service(page, per_page, api_name, path, use_yn, login_id)
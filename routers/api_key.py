@@ -3,8 +3,10 @@ from typing import Optional
 from schemas.api_key_schema import ApiKeyCreateRequest, ApiKeyUpdateRequest
 from services.api_key_service import *
 from services.auth_service import verify_authentication
+from utils.db_config import db_unit_of_work, UnitOfWork
+from utils.json_codec import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.get("/apim/api-key")
 async def api_key_list_router(
@@ -16,24 +18,24 @@ async def api_key_list_router(
     _: str = Depends(verify_authentication)
 ):
     login_id = request.state.user_id
-    return get_api_key_list_service(page, per_page, user_id, comment, login_id, request)
+    return await get_api_key_list_service(page, per_page, user_id, comment, login_id, request)
 
 @router.post("/apim/api-key")
-async def create_api_key_router(payload: ApiKeyCreateRequest, request: Request, _: str = Depends(verify_authentication)):
+async def create_api_key_router(payload: ApiKeyCreateRequest, request: Request, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     login_id = request.state.user_id
-    return generate_api_key_service(payload, login_id)
+    return await generate_api_key_service(payload, login_id, request.state.principal)
 
 @router.put("/apim/api-key/{user_id}")
-async def update_api_key_router(user_id: str, payload: ApiKeyUpdateRequest, request: Request, _: str = Depends(verify_authentication)):
+async def update_api_key_router(user_id: str, payload: ApiKeyUpdateRequest, request: Request, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     login_id = request.state.user_id
-    return update_api_key_service(user_id, payload.comment, login_id)
+    return await update_api_key_service(user_id, payload.comment, login_id)
 
 @router.put("/apim/api-key/{user_id}/regenerate")
-async def regenerate_api_key_router(user_id: str, request: Request, _: str = Depends(verify_authentication)):
+async def regenerate_api_key_router(user_id: str, request: Request, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     login_id = request.state.user_id
-    return regenerate_api_key_service(user_id, login_id)
+    return await regenerate_api_key_service(user_id, login_id)
 
 @router.delete("/apim/api-key/{user_id}")
-async def delete_api_key_router(user_id: str, request: Request, _: str = Depends(verify_authentication)):
+async def delete_api_key_router(user_id: str, request: Request, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     login_id = request.state.user_id
-    return delete_api_key_service(user_id, login_id)
+    return await delete_api_key_service(user_id, login_id)
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Request, Depends
 from services.api_permission_service import *
 from services.auth_service import verify_authentication
+from utils.db_config import db_unit_of_work, UnitOfWork
+from utils.json_codec import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 # 유저 API 권한 전체 조회
 @router.get("/apim/api-permissions/{user_id}")
@@ -12,7 +14,7 @@ async def get_api_permissions_router(request: Request, user_id: str, _: str = De
 
 # 유저 API 권한 저장
 @router.post("/apim/api-permissions/{user_id}")
-async def save_user_api_permissions_router(request: Request, user_id: str, _: str = Depends(verify_authentication)):
+async def save_user_api_permissions_router(request: Request, user_id: str, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     data = await request.json()
     login_id = request.state.user_id
     return await save_user_api_permissions_service(user_id, data, login_id)
@@ -34,25 +36,25 @@ async def get_permission_requests_list_router(
 
 # 권한 신청 승인
 @router.post("/apim/api-permission-requests/{request_id}/approve")
-async def approve_request_router(request: Request, request_id: int, _: str = Depends(verify_authentication)):
+async def approve_request_router(request: Request, request_id: int, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     login_id = request.state.user_id
-    return approve_permission_request_service(request_id, login_id)
+    return await approve_permission_request_service(request_id, login_id)
 
 # 권한 신청 반려
 @router.post("/apim/api-permission-requests/{request_id}/reject")
-async def reject_request_router(request: Request, request_id: int, _: str = Depends(verify_authentication)):
+async def reject_request_router(request: Request, request_id: int, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     login_id = request.state.user_id
-    return reject_permission_request_service(request_id, login_id)
+    return await reject_permission_request_service(request_id, login_id)
 
 # 권한 신청 수
 @router.get("/apim/api-permission-requests/pending-count")
 async def get_pending_permission_count_router(request: Request, _: str = Depends(verify_authentication)):
     login_id = request.state.user_id
-    return get_pending_permission_count_service(login_id)
+    return await get_pending_permission_count_service(login_id)
 
 # API 권한 신청
 @router.post("/apim/api-permission-requests/{user_id}")
-async def request_api_permission_router(request: Request, user_id: str, _: str = Depends(verify_authentication)):
+async def request_api_permission_router(request: Request, user_id: str, _: str = Depends(verify_authentication), uow: UnitOfWork = Depends(db_unit_of_work, scope="function")):
     data = await request.json()
     print(data)
-    return request_api_permission_service(user_id, data)
+    return await request_api_permission_service(user_id, data)
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Request, Depends, HTTPException, Cookie, Query
 from typing import Optional
-from fastapi.responses import JSONResponse
 from schemas.auth_schema import LoginRequest
 from services.auth_service import *
 from db.auth_db import *
 from db.user_db import get_user_info
+from utils.db_async import run_db
+from utils.json_codec import FastJSONRoute, FastJSONResponse
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 async def verify_authentication_optional(
     request: Request,
@@ -19,6 +20,8 @@ async def verify_authentication_optional(
     - verify_authentication을 직접 호출하되, FastAPI가 주입해 준 문자열/쿠키를 그대로 전달.
     - 실패(HTTPException)이면 None으로 삼켜서 silent 처리가 가능하도록 한다.
     """
+    # 선택 인증: 화면 접근 권한 검사 없이 로그인 여부만 확인 (screen_path 없이 호출됨)
+    request.state.optional_auth = True
     try:
         # verify_authentication이 async면 await, sync면 그대로 호출
         return await verify_authentication(
@@ -32,7 +35,7 @@ async def verify_authentication_optional(
     
 @router.post("/apim/auth/login")
 async def login(request: Request, payload: LoginRequest):
-    user = authenticate_user(payload.user_id, payload.password)
+    user = await run_db(authenticate_user, payload.user_id, payload.password)
     if not user:
         raise HTTPException(401, "아이디 또는 비밀번호가 올바르지 않습니다.")
 
@@ -41,13 +44,13 @@ async def login(request: Request, payload: LoginRequest):
     
     access_token = create_access_token(payload.user_id)
     refresh_token = create_refresh_token(payload.user_id)
-    update_refresh_token(payload.user_id, refresh_token)
+    await run_db(update_refresh_token, payload.user_id, refresh_token)
 
     # ✅ 쿠키는 middleware에서 처리
     request.state.new_access_token = access_token
     request.state.new_refresh_token = refresh_token
 
-    return JSONResponse(content={"user": user})
+    return FastJSONResponse(content={"user": user})
 
 @router.post("/apim/auth/refresh")
 async def refresh(
@@ -55,23 +58,23 @@ async def refresh(
     user_id: str = Depends(decode_refresh_token),
     refresh_token: str = Cookie(None)
 ):
-    user = get_user_info(user_id)
+    user = await run_db(load_session_principal, user_id)
     if not user:
         raise HTTPException(status_code=403, detail="유저 정보를 찾을 수 없습니다.")
 
-    stored_token = get_refresh_token(user_id)
+    stored_token = user["refresh_token"]
     if refresh_token != stored_token:
         raise HTTPException(status_code=401, detail="다른 기기에서 로그인되어 세션이 무효화되었습니다.")
 
     access_token = create_access_token(user_id)
     new_refresh_token = create_refresh_token(user_id)
-    update_refresh_token(user_id, new_refresh_token)
+    await run_db(update_refresh_token, user_id, new_refresh_token)
 
     # ✅ 쿠키는 middleware에서 처리
     request.state.new_access_token = access_token
     request.state.new_refresh_token = new_refresh_token
 
-    return JSONResponse(content={
+    return FastJSONResponse(content={
         "message": "토큰이 갱신되었습니다.",
         "access_token_refreshed": True,
         "refresh_token_refreshed": True
@@ -79,18 +82,20 @@ async def refresh(
 
 @router.get("/apim/auth/profile")
 async def get_profile(
+    request: Request,
     silent: bool = Query(False),
     user_id: Optional[str] = Depends(verify_authentication_optional),
 ):
     if not user_id:
         if silent:
-            return JSONResponse(status_code=200, content={"authenticated": False, "user": None})
+            return FastJSONResponse(status_code=200, content={"authenticated": False, "user": None})
         raise HTTPException(status_code=440, detail="⛔ 로그인 후 접근 가능한 페이지입니다.")
 
-    user = get_user_info(user_id)
+    # verify_authentication 에서 조회한 사용자 정보 재사용
+    user = getattr(request.state, "principal", None) or await run_db(get_user_info, user_id)
     if not user:
         # if silent:
-        #     return JSONResponse(status_code=200, content={"authenticated": False, "user": None})
+        #     return FastJSONResponse(status_code=200, content={"authenticated": False, "user": None})
         raise HTTPException(status_code=404, detail="사용자 정보를 찾을 수 없습니다.")
 
     return {"authenticated": True, "user": user} if silent else {"user": user}
@@ -101,7 +106,7 @@ async def logout(request: Request, user_id: str = Depends(try_verify_authenticat
     #    clear_refresh_token(user_id)
 
     # ✅ 삭제는 직접 해도 됨 (middleware는 상태 기반으로만 set)
-    res = JSONResponse(content={"message": "로그아웃이 완료되었습니다."})
+    res = FastJSONResponse(content={"message": "로그아웃이 완료되었습니다."})
     res.delete_cookie("access_token", path="/", samesite="Lax")
     res.delete_cookie("refresh_token", path="/", samesite="Lax")
     res.delete_cookie("last_screen_path", path="/", samesite="Lax")
@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Request, Depends, Query
-from typing import Optional
-from services.gateway_logs_service import get_gateway_logs_service
-from services.auth_service import verify_authentication
-from db.user_db import get_user_info
+from typing import Literal, Optional
+from services.gateway_logs_service import get_gateway_logs_service, export_gateway_logs_service
+from services.auth_service import verify_authentication, is_admin as is_admin_principal
+from utils.json_codec import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.get("/apim/gateway-logs")
 async def get_gateway_logs_router(
@@ -18,18 +18,18 @@ async def get_gateway_logs_router(
     status_code: Optional[int] = None,     # 200 ...
     searchDateStart: Optional[str] = None, # 'YYYY-MM-DDTHH:MM'
     searchDateEnd: Optional[str] = None,   # 'YYYY-MM-DDTHH:MM'
+    cursor: Optional[str] = None,          # keyset 페이지네이션 (빈 값 = 첫 페이지, 응답의 next_cursor 전달)
     _: str = Depends(verify_authentication)  # 세션 인증
 ):
     login_id = request.state.user_id
 
-    # 권한 확인 (api_key와 동일한 정책: permission_code == 'admin' 이면 관리자)
-    user_info = get_user_info(login_id)
-    is_admin = bool(user_info and user_info.get("permission_code") == "ADMIN")
+    # 권한 확인 (api_key와 동일한 정책: services.auth_service.is_admin)
+    is_admin = is_admin_principal(request.state.principal)
 
     # 일반 유저는 자신의 로그만 강제
     effective_user_id = user_id if is_admin else login_id
 
-    return get_gateway_logs_service(
+    return await get_gateway_logs_service(
         page=page,
         per_page=per_page,
         login_id=login_id,
@@ -42,4 +42,42 @@ async def get_gateway_logs_router(
         status_code=status_code,
         date_start=searchDateStart,
         date_end=searchDateEnd,
+        cursor=cursor,
+    )
+
+
+# ✅ 로그 내보내기 (목록과 같은 필터, 오래된 순으로 전체 스트리밍)
+@router.get("/apim/gateway-logs/export")
+async def export_gateway_logs_router(
+    request: Request,
+    user_id: Optional[str] = None,
+    api_id: Optional[str] = None,
+    method: Optional[str] = None,
+    is_success: Optional[str] = None,
+    status_code: Optional[int] = None,
+    searchDateStart: Optional[str] = None,
+    searchDateEnd: Optional[str] = None,
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    _: str = Depends(verify_authentication)
+):
+    login_id = request.state.user_id
+
+    is_admin = is_admin_principal(request.state.principal)
+
+    # 일반 유저는 자신의 로그만 강제
+    effective_user_id = user_id if is_admin else login_id
+
+    return await export_gateway_logs_service(
+        login_id=login_id,
+        request=request,
+        user_id=effective_user_id,
+        api_id=api_id,
+        method=method,
+        is_success=is_success,
+        status_code=status_code,
+        date_start=searchDateStart,
+        date_end=searchDateEnd,
+        fmt=format,
+        use_gzip=gzip,
     )
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Request, Depends
-from services.overview_service import get_overview_stats_service
+from services.overview_service import get_overview_stats_service, get_db_stats_service
 from services.auth_service import verify_authentication
+from utils.json_codec import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.get("/apim/overview/stats")
 async def get_overview_stats_router(
@@ -11,4 +12,13 @@ async def get_overview_stats_router(
 ):
     """대시보드에 필요한 모든 통계 데이터를 반환합니다."""
     login_id = request.state.user_id
-    return get_overview_stats_service(login_id)
\ No newline at end of file
+    return await get_overview_stats_service(login_id)
+
+@router.get("/apim/overview/db-stats")
+async def get_db_stats_router(
+    request: Request,
+    _: str = Depends(verify_authentication)
+):
+    """DB 커넥션 풀 대기 시간 등 런타임 지표를 반환합니다. (관리자 전용)"""
+    login_id = request.state.user_id
+    return await get_db_stats_service(login_id, request.state.principal)
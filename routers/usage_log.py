@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Request, Depends, Query
-from typing import Optional
-from services.usage_log_service import get_usage_log_service
+from typing import Literal, Optional
+from services.usage_log_service import get_usage_log_service, export_usage_log_service
 from services.auth_service import verify_authentication
+from utils.json_codec import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.get("/apim/usage-log")
 async def get_usage_log_router(
@@ -18,8 +19,27 @@ async def get_usage_log_router(
     _: str = Depends(verify_authentication)
 ):
     login_id = request.state.user_id
-    return get_usage_log_service(
+    return await get_usage_log_service(
         page, per_page, searchDateStart, searchDateEnd,
         user_id, path, method
     )
 
+
+
+@router.get("/apim/usage-log/export")
+async def export_usage_log_router(
+    request: Request,
+    user_id: Optional[str] = None,
+    path: Optional[str] = None,
+    method: Optional[str] = None,
+    searchDateStart: str = Query(..., description="시작일자 (필수)"),
+    searchDateEnd: str = Query(..., description="종료일자 (필수)"),
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    _: str = Depends(verify_authentication)
+):
+    login_id = request.state.user_id
+    return await export_usage_log_service(
+        login_id, request, searchDateStart, searchDateEnd,
+        user_id, path, method, format, gzip, request.state.principal
+    )
@@ -9,8 +9,10 @@ from services.user_permission_type_service import (
     read_users_with_user_permission_type_service
 )
 from services.auth_service import verify_authentication
+from utils.db_config import db_unit_of_work, UnitOfWork
+from utils.json_codec import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/apim/user-permission-types")
@@ -22,17 +24,18 @@ async def get_user_permission_type_list_router(
     _: str = Depends(verify_authentication)
 ):
     login_id = request.state.user_id
-    return get_user_permission_type_list_service(search, search_field, use_yn, login_id)
+    return await get_user_permission_type_list_service(search, search_field, use_yn, login_id)
 
 
 @router.post("/apim/user-permission-types")
 async def create_user_permission_type_router(
     payload: UserPermissionTypeCreate,
     request: Request,
-    _: str = Depends(verify_authentication)
+    _: str = Depends(verify_authentication),
+    uow: UnitOfWork = Depends(db_unit_of_work, scope="function")
 ):
     login_id = request.state.user_id
-    return create_user_permission_type_service(payload, login_id)
+    return await create_user_permission_type_service(payload, login_id)
 
 
 @router.put("/apim/user-permission-types/{permission_code}")
@@ -40,20 +43,22 @@ async def update_user_permission_type_router(
     permission_code: str,
     payload: UserPermissionTypeUpdate,
     request: Request,
-    _: str = Depends(verify_authentication)
+    _: str = Depends(verify_authentication),
+    uow: UnitOfWork = Depends(db_unit_of_work, scope="function")
 ):
     login_id = request.state.user_id
-    return update_user_permission_type_service(permission_code, payload, login_id)
+    return await update_user_permission_type_service(permission_code, payload, login_id)
 
 
 @router.delete("/apim/user-permission-types/{permission_code}")
 async def delete_user_permission_type_router(
     permission_code: str,
     request: Request,
-    _: str = Depends(verify_authentication)
+    _: str = Depends(verify_authentication),
+    uow: UnitOfWork = Depends(db_unit_of_work, scope="function")
 ):
     login_id = request.state.user_id
-    return delete_user_permission_type_service(permission_code, login_id)
+    return await delete_user_permission_type_service(permission_code, login_id)
 
 
 @router.get("/apim/users-with-permission-types")
@@ -65,4 +70,4 @@ async def get_users_with_user_permission_type_router(
     _: str = Depends(verify_authentication)
 ):
     login_id = request.state.user_id
-    return read_users_with_user_permission_type_service(permission_code, user_id, user_name, login_id)
+    return await read_users_with_user_permission_type_service(permission_code, user_id, user_name, login_id)
@@ -1,4 +1,5 @@
 import secrets
+from typing import Optional
 from fastapi import HTTPException
 from db.api_key_db import (
     get_api_key_list, insert_api_key, update_api_key_comment,
@@ -6,10 +7,12 @@ from db.api_key_db import (
 )
 from db.user_db import get_user_info
 from db.usage_log_db import log_api_usage
+from services.auth_service import is_admin
+from utils.db_async import run_db
 
 
-def get_api_key_list_service(page, per_page, user_id, comment, login_id, request):
-    result = get_api_key_list(page, per_page, user_id=user_id, comment=comment)
+async def get_api_key_list_service(page, per_page, user_id, comment, login_id, request):
+    result = await run_db(get_api_key_list, page, per_page, user_id=user_id, comment=comment)
 
     res = {"items": result["items"], "total_pages": result["total_pages"], "total_count": result["total_count"]}
 
@@ -17,25 +20,25 @@ def get_api_key_list_service(page, per_page, user_id, comment, login_id, request
 
     return res
 
-def generate_api_key_service(data: dict, login_id: str):
+async def generate_api_key_service(data: dict, login_id: str, principal: Optional[dict] = None):
     user_id = data.user_id
     comment = data.comment
 
     if not user_id:
         raise HTTPException(400, "유저ID는 필수 정보입니다.")
 
-    user_info = get_user_info(login_id) ## 등록을 진행하는 사람 정보
+    user_info = principal or await run_db(get_user_info, login_id) ## 등록을 진행하는 사람 정보
     if not user_info:
         raise HTTPException(403, "유저 정보를 확인할 수 없습니다.")
 
-    if login_id != user_id and user_info["permission_code"] != "admin":
+    if login_id != user_id and not is_admin(user_info):
         raise HTTPException(403, "다른 사용자에 대한 API Key 발급은 관리자만 가능합니다.")
 
-    if is_api_key_existing_id(user_id):
+    if await run_db(is_api_key_existing_id, user_id):
         raise HTTPException(400, f"이미 API Key가 발급된 ID입니다: {user_id}")
 
     api_key = f"ets-{secrets.token_hex(16)}"
-    insert_api_key(user_id, api_key, comment, login_id)
+    await run_db(insert_api_key, user_id, api_key, comment, login_id)
 
     res = {
         "user_id": user_id,
@@ -48,11 +51,11 @@ def generate_api_key_service(data: dict, login_id: str):
 
     return res
 
-def update_api_key_service(user_id: str, comment: str, login_id: str):
-    if not is_api_key_existing_id(user_id):
+async def update_api_key_service(user_id: str, comment: str, login_id: str):
+    if not await run_db(is_api_key_existing_id, user_id):
         raise HTTPException(400, f"USER_ID({user_id})는 존재하지 않습니다.")
     
-    update_api_key_comment(user_id, comment, login_id)
+    await run_db(update_api_key_comment, user_id, comment, login_id)
 
     res = {"user_id": user_id, "new_comment": comment, "message": "API Key 정보 수정을 완료하였습니다."}
 
@@ -60,11 +63,11 @@ def update_api_key_service(user_id: str, comment: str, login_id: str):
 
     return res
 
-def regenerate_api_key_service(user_id: str, login_id: str):
-    if not is_api_key_existing_id(user_id):
+async def regenerate_api_key_service(user_id: str, login_id: str):
+    if not await run_db(is_api_key_existing_id, user_id):
         raise HTTPException(400, f"USER_ID({user_id})는 존재하지 않습니다.")
     
-    new_key, comment = regenerate_api_key(user_id, login_id)
+    new_key, comment = await run_db(regenerate_api_key, user_id, login_id)
 
     res = {
         "user_id": user_id,
@@ -76,11 +79,11 @@ def regenerate_api_key_service(user_id: str, login_id: str):
     log_api_usage(login_id, "/apim/api-key/{user_id}/regenerate", "PUT", {"user_id": user_id}, res, 200)
     return res
 
-def delete_api_key_service(user_id: str, login_id: str):
-    if not is_api_key_existing_id(user_id):
+async def delete_api_key_service(user_id: str, login_id: str):
+    if not await run_db(is_api_key_existing_id, user_id):
         raise HTTPException(400, f"USER_ID({user_id})는 존재하지 않습니다.")
     
-    delete_api_key(user_id)
+    await run_db(delete_api_key, user_id)
 
     res = {"message": "API Key 삭제를 완료하였습니다."}
 
@@ -5,33 +5,34 @@ from db.api_db import (
 from fastapi import HTTPException
 from schemas.api_schema import ApiCreateRequest, ApiUpdateRequest
 from db.usage_log_db import log_api_usage
+from utils.db_async import run_db
 
-def create_api_service(data: ApiCreateRequest, login_id: str):
-    if is_existing_api_id(data.api_id, data.method):
+async def create_api_service(data: ApiCreateRequest, login_id: str):
+    if await run_db(is_existing_api_id, data.api_id, data.method):
         raise HTTPException(400, f"API ID-METHOD({data.api_id + '-' + data.method})가 이미 존재합니다.")
     
-    insert_api_list(data.model_dump(), login_id)
+    await run_db(insert_api_list, data.model_dump(), login_id)
     res = {"message": f"입력하신 API({data.api_name}) 정보 등록을 성공하였습니다."}
     log_api_usage(login_id, "/apim/api", "POST", data.model_dump(), res, 200)
     return res
 
-def update_api_service(api_id: str, method: str, data: ApiUpdateRequest, login_id: str):
-    if not is_existing_api_id(api_id, method):
+async def update_api_service(api_id: str, method: str, data: ApiUpdateRequest, login_id: str):
+    if not await run_db(is_existing_api_id, api_id, method):
         raise HTTPException(400, f"API ID-Method({api_id + '-' + method})가 존재하지 않습니다.")
-    update_api_info(api_id, method, data.model_dump(), login_id)
+    await run_db(update_api_info, api_id, method, data.model_dump(), login_id)
     res = {"message": f"입력하신 API({data.api_name}) 수정이 완료되었습니다."}
     log_api_usage(login_id, "/apim/api/{method}/{api_id}", "PUT", data.model_dump(), res, 200)
     return res
 
-def delete_api_service(api_id: str, method: str, login_id: str):
-    if not is_existing_api_id(api_id, method):
+async def delete_api_service(api_id: str, method: str, login_id: str):
+    if not await run_db(is_existing_api_id, api_id, method):
         raise HTTPException(400, f"삭제하신 API({api_id + '-' + method})가 존재하지 않습니다.")
-    delete_api_info(api_id, method)
+    await run_db(delete_api_info, api_id, method)
     res = {"message": "선택하신 API 삭제를 완료하였습니다."}
     log_api_usage(login_id, "/apim/api/{method}/{api_id}", "DELETE", {"api_id": api_id, "method": method}, res, 200)
     return res
 
-def get_api_list_service(page, per_page, api_name, path, use_yn, login_id):
-    result = get_api_list_info(page, per_page, api_name, path, use_yn)
+async def get_api_list_service(page, per_page, api_name, path, use_yn, login_id):
+    result = await run_db(get_api_list_info, page, per_page, api_name, path, use_yn)
     log_api_usage(login_id, "/apim/api", "GET", {}, result, 200)
     return result
@@ -1,14 +1,16 @@
 import jwt
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
-from typing import Optional
+from typing import Optional, Set, Tuple
 from datetime import datetime, timedelta, timezone
 from fastapi import Request, HTTPException, Cookie, Header
 from utils.config import Config
-from db.auth_db import get_refresh_token
-from db.user_db import get_user_info, is_active_user_id
-from db.api_permission_db import has_user_api_permission
+from db.auth_db import load_session_principal
+from db.user_db import get_user_info
+from db.api_permission_db import has_user_api_permission, peek_user_api_permission
 from db.api_key_db import get_user_id_by_api_key
-from db.screen_db import get_screen_code_by_path, get_screen_codes_by_permission_code
+from db.screen_db import get_screen_access, peek_screen_access
+from utils.db_async import run_db
+from utils.cache import sync_cache_epochs
 
 JWT_SECRET = Config.JWT_SECRET
 JWT_ALGORITHM = Config.JWT_ALGORITHM
@@ -16,6 +18,23 @@ ACCESS_TOKEN_EXPIRE_MINUTES = Config.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = Config.REFRESH_TOKEN_EXPIRE_DAYS
 TOKEN_REFRESH_THRESHOLD_SECONDS = Config.TOKEN_REFRESH_THRESHOLD_SECONDS #액세스 토큰 리프레쉬 시간 10분 이하로 남으면 리프레쉬
 
+# ✅ 관리자 권한 코드 (user_permission_types 에는 대문자로 저장됨)
+ADMIN_PERMISSION_CODE = "ADMIN"
+
+
+def is_admin(principal: Optional[dict]) -> bool:
+    """사용자 정보(principal / get_user_info 결과)가 관리자 권한인지 (대소문자 무시)"""
+    return bool(principal) and str(principal.get("permission_code") or "").upper() == ADMIN_PERMISSION_CODE
+
+
+# ✅ 화면 접근 권한 검사 제외 라우트 (method, 라우트 경로)
+# - screen_path 가 검사 키가 아니라 화면 검색 조건 / 등록·수정 데이터로 쓰이는 화면 관리 API
+SCREEN_GATE_EXEMPT_ROUTES: Set[Tuple[str, str]] = {
+    ("GET", "/apim/screens"),
+    ("POST", "/apim/screens"),
+    ("PUT", "/apim/screens/{screen_code}"),
+}
+
     
 # ✅ Access Token 생성
 def create_access_token(user_id: str) -> str:
@@ -45,6 +64,11 @@ def create_refresh_token(user_id: str) -> str:
     print(f"[Refresh Token] {token}")
     return token
 
+# ✅ 다른 워커의 쓰기를 반영(cache_epoch 확인)한 뒤 세션 사용자 정보 조회
+def _load_session_principal(user_id: str):
+    sync_cache_epochs()
+    return load_session_principal(user_id)
+
 # ✅ Refresh Token 검증 후 사용자 ID 반환
 def decode_refresh_token(refresh_token: str = Cookie(None)) -> str:
     if not refresh_token:
@@ -75,7 +99,7 @@ async def verify_authentication(
     #     user_id = get_user_id_by_api_key(api_key)
     #     if not user_id:
     #         raise HTTPException(status_code=401, detail="유효하지 않은 API 키입니다.")
-    #     if not is_active_user_id(user_id):
+    #     if not await run_db(is_active_user_id, user_id):
     #         raise HTTPException(status_code=403, detail="비활성화된 계정입니다. 관리자에게 문의해주세요.")
     #     request.state.user_id = user_id
 
@@ -95,10 +119,13 @@ async def verify_authentication(
 
         if not user_id or not exp_timestamp:
             raise HTTPException(status_code=419, detail="세션이 만료되었습니다. 다시 로그인 해주세요.")
-        if not is_active_user_id(user_id):
+
+        # ✅ 활성 여부 + refresh token + 권한 정보를 한 번에 조회
+        principal = await run_db(_load_session_principal, user_id)
+        if not principal or principal.get("use_yn") != "Y":
             raise HTTPException(status_code=403, detail="비활성화된 계정입니다. 관리자에게 문의해주세요.")
 
-        db_refresh_token = get_refresh_token(user_id)
+        db_refresh_token = principal.pop("refresh_token", None)
 
         # ✅ refresh token 아예 없음 (로그인 정보 초기화됨)
         if not db_refresh_token:
@@ -111,6 +138,7 @@ async def verify_authentication(
             raise HTTPException(status_code=440, detail="다른 기기에서 로그인되어 현재 세션이 만료되었습니다.")
 
         request.state.user_id = user_id
+        request.state.principal = principal  # 이후 서비스/라우터에서 users 재조회 없이 사용
 
         now = datetime.now(timezone.utc).timestamp()
         if exp_timestamp - now < TOKEN_REFRESH_THRESHOLD_SECONDS:
@@ -125,16 +153,22 @@ async def verify_authentication(
     except InvalidTokenError:
         raise HTTPException(status_code=419, detail="세션이 만료되었습니다. 다시 로그인 해주세요.")
 
-    # ✅ 공통 권한 검사
-    # user_info = get_user_info(user_id)
-    # if not user_info:
-    #     raise HTTPException(status_code=403, detail="유저 정보를 확인할 수 없습니다.")
-    # if user_info.get("permission_code") != "admin":
-    #     if not has_user_api_permission(user_id, method.upper(), path):
-    #         raise HTTPException(status_code=403, detail="해당 API에 접근 권한이 없습니다.")
-
-    # ✅ 화면 접근 권한 검사
-    #await verify_screen_access(request)
+    # ✅ 공통 권한 검사 (메모리 권한 인덱스 → 평소에는 SQLite 조회 없음)
+    if Config.API_PERMISSION_ENFORCED and not is_admin(request.state.principal):
+        allowed = peek_user_api_permission(user_id, method, path)
+        if allowed is None:
+            # 인덱스가 무효화된 직후에만 스레드풀에서 재구성
+            allowed = await run_db(has_user_api_permission, user_id, method, path)
+        if not allowed:
+            raise HTTPException(status_code=403, detail="해당 API에 접근 권한이 없습니다.")
+
+    # ✅ 화면 접근 권한 검사 (screen_path 가 데이터인 라우트 / 선택 인증 라우트는 제외)
+    if (
+        Config.SCREEN_ACCESS_ENFORCED
+        and (method, path) not in SCREEN_GATE_EXEMPT_ROUTES
+        and not getattr(request.state, "optional_auth", False)
+    ):
+        await verify_screen_access(request)
     return user_id
 
 
@@ -153,31 +187,35 @@ def try_verify_authentication(
     return None
 
 async def verify_screen_access(request: Request):
-    screen_path = request.query_params.get("screen_path")
-    
-    print(screen_path)
-    # POST/PUT/PATCH일 경우 body에서 추출
+    # 쿼리 파라미터 → X-Screen-Path 헤더 → (POST/PUT/PATCH) JSON 본문 순서로 추출
+    screen_path = request.query_params.get("screen_path") or request.headers.get("x-screen-path")
+
     if not screen_path and request.method in ("POST", "PUT", "PATCH"):
+        # 본문 모델이 있는 라우트는 FastAPI 가 이미 request.json() 으로 파싱해 캐시해 둔 값을 재사용
         try:
             body = await request.json()
+        except (ValueError, UnicodeDecodeError):
+            body = None
+        if isinstance(body, dict):
             screen_path = body.get("screen_path")
-        except:
-            screen_path = None
 
     if not screen_path:
         raise HTTPException(400, detail="screen_path가 요청에 포함되어야 합니다.")
     
-    if screen_path == '/' or not screen_path:
+    if screen_path == '/':
         return  # 권한 검사 하지 않음
 
-    # DB에서 screen_code 조회
-    screen_code = get_screen_code_by_path(screen_path)
-    if not screen_code:
-        raise HTTPException(404, detail=f"해당 경로에 대한 화면이 존재하지 않습니다: {screen_path}")
-
     user_id = request.state.user_id
-    permission_code = get_user_info(user_id).get("permission_code")
-    allowed_screen_codes = get_screen_codes_by_permission_code(permission_code)
+    principal = getattr(request.state, "principal", None) or await run_db(get_user_info, user_id)
+    permission_code = principal.get("permission_code")
+
+    # 화면 경로 / 권한별 화면 목록 캐시 (비어 있을 때만 스레드풀에서 DB 조회)
+    access = peek_screen_access(permission_code, screen_path)
+    if access is None:
+        access = await run_db(get_screen_access, permission_code, screen_path)
+    screen_code, allowed = access
 
-    if screen_code not in allowed_screen_codes:
-        raise HTTPException(403, detail="해당 화면에 접근할 수 있는 권한이 없습니다.")
\ No newline at end of file
+    if not screen_code:
+        raise HTTPException(404, detail=f"해당 경로에 대한 화면이 존재하지 않습니다: {screen_path}")
+    if not allowed:
+        raise HTTPException(403, detail="해당 화면에 접근할 수 있는 권한이 없습니다.")
@@ -1,7 +1,9 @@
 from fastapi import HTTPException
 from typing import Optional
-from db.gateway_logs_db import select_gateway_logs
+from db.gateway_logs_db import select_gateway_logs, decode_log_cursor, iter_gateway_logs, GATEWAY_LOG_COLUMNS
 from db.usage_log_db import log_api_usage
+from utils.db_async import run_db
+from utils.export import export_response
 
 def _validate_dt(dt: Optional[str]) -> Optional[str]:
     if not dt:
@@ -13,7 +15,7 @@ def _validate_dt(dt: Optional[str]) -> Optional[str]:
         raise HTTPException(400, "searchDateStart/End 형식은 YYYY-MM-DDTHH:MM 이어야 합니다.")
     return dt
 
-def get_gateway_logs_service(
+async def get_gateway_logs_service(
     page: int,
     per_page: int,
     login_id: str,
@@ -26,12 +28,23 @@ def get_gateway_logs_service(
     status_code: Optional[int],
     date_start: Optional[str],
     date_end: Optional[str],
+    cursor: Optional[str] = None,
 ):
     date_start = _validate_dt(date_start)
     date_end = _validate_dt(date_end)
 
+    # cursor 파라미터가 있으면(빈 값 = 첫 페이지) keyset 페이지네이션
+    seek = cursor is not None
+    after = None
+    if cursor:
+        try:
+            after = decode_log_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+
     # DB 조회
-    result = select_gateway_logs(
+    result = await run_db(
+        select_gateway_logs,
         page=page,
         per_page=per_page,
         # 권한 반영된 user_id (관리자면 None 가능, 일반 사용자는 본인)
@@ -42,13 +55,55 @@ def get_gateway_logs_service(
         status_code=status_code,
         date_start=date_start,
         date_end=date_end,
+        seek=seek,
+        after=after,
     )
 
-    res = {
-        "items": result["items"],
-        "total_count": result["total_count"],
-        "total_pages": result["total_pages"],
-    }
+    if seek:
+        res = {
+            "items": result["items"],
+            "next_cursor": result["next_cursor"],
+            "has_more": result["has_more"],
+        }
+    else:
+        res = {
+            "items": result["items"],
+            "total_count": result["total_count"],
+            "total_pages": result["total_pages"],
+            "total_count_capped": result["total_count_capped"],
+        }
 
     log_api_usage(login_id, "/apim/gateway-logs", "GET", dict(request.query_params), res, 200)
     return res
+
+
+async def export_gateway_logs_service(
+    login_id: str,
+    request,
+    user_id: Optional[str],
+    api_id: Optional[str],
+    method: Optional[str],
+    is_success: Optional[str],
+    status_code: Optional[int],
+    date_start: Optional[str],
+    date_end: Optional[str],
+    fmt: str,
+    use_gzip: bool,
+):
+    date_start = _validate_dt(date_start)
+    date_end = _validate_dt(date_end)
+
+    # 조회는 응답을 보내면서 스레드풀에서 진행 (오래된 순, 서버 측 커서)
+    rows = iter_gateway_logs(
+        user_id=user_id,
+        api_id=api_id,
+        method=method,
+        is_success=is_success,
+        status_code=status_code,
+        date_start=date_start,
+        date_end=date_end,
+    )
+
+    response = export_response(rows, GATEWAY_LOG_COLUMNS, fmt, use_gzip, "gateway_logs")
+    log_api_usage(login_id, "/apim/gateway-logs/export", "GET", dict(request.query_params), {"format": fmt, "gzip": use_gzip}, 200)
+    return response
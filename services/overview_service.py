@@ -1,13 +1,36 @@
 from db.overview_db import get_overview_stats
-from db.usage_log_db import log_api_usage
+from db.usage_log_db import log_api_usage, get_usage_log_writer_stats
+from db.log_partition_db import get_log_partition_list
+from db.log_archive_db import get_log_archive_list
+from utils.db_async import run_db
+from utils.db_config import get_pool_stats, get_statement_cache_stats
+from utils.cache import get_cache_stats
+from services.auth_service import is_admin
 from fastapi import HTTPException
+from typing import Optional
 
-def get_overview_stats_service(login_id: str):
+async def get_overview_stats_service(login_id: str):
     """대시보드 통계 데이터를 조회하고 API 사용 로그를 기록합니다."""
     try:
-        stats = get_overview_stats()
+        stats = await run_db(get_overview_stats)
         log_api_usage(login_id, "/apim/overview/stats", "GET", {}, stats, 200)
         return stats
     except Exception as e:
         # DB 조회 중 발생한 예외를 처리합니다.
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def get_db_stats_service(login_id: str, principal: Optional[dict] = None):
+    """DB 커넥션 풀, 준비된 문장 캐시, 캐시 hit/miss, 사용 로그 기록기, 로그 파티션/아카이브 등 런타임 지표를 조회합니다. (관리자 전용)"""
+    if not is_admin(principal):
+        raise HTTPException(403, "DB 런타임 지표는 관리자만 조회할 수 있습니다.")
+
+    stats = {
+        "pool": get_pool_stats(),
+        "statement_cache": get_statement_cache_stats(),
+        "caches": get_cache_stats(),
+        "usage_log_writer": get_usage_log_writer_stats(),
+        "log_partitions": await run_db(get_log_partition_list),
+        "log_archives": await run_db(get_log_archive_list),
+    }
+    log_api_usage(login_id, "/apim/overview/db-stats", "GET", {}, stats, 200)
+    return stats
@@ -1,8 +1,30 @@
-from db.usage_log_db import get_usage_log_list
+from fastapi import HTTPException
+from db.usage_log_db import get_usage_log_list, iter_usage_logs, log_api_usage, USAGE_LOG_COLUMNS
+from utils.db_async import run_db
+from utils.time_range import parse_time_bound
+from utils.export import export_response
+from services.auth_service import is_admin
 
-def get_usage_log_service(page, per_page, search_start, search_end, user_id, path, method):
-    search_start = search_start.replace("T", " ")
-    search_end = search_end.replace("T", " ")
-    result = get_usage_log_list(page, per_page, search_start, search_end, user_id, path, method)
-    res = {"items": result["items"], "total_pages": result["total_pages"], "total_count": result["total_count"]}
+async def get_usage_log_service(page, per_page, search_start, search_end, user_id, path, method):
+    try:
+        parse_time_bound(search_start)
+        parse_time_bound(search_end)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    result = await run_db(get_usage_log_list, page, per_page, search_start, search_end, user_id, path, method)
+    res = {"items": result["items"], "total_pages": result["total_pages"], "total_count": result["total_count"], "total_count_capped": result["total_count_capped"]}
     return res
+
+async def export_usage_log_service(login_id, request, search_start, search_end, user_id, path, method, fmt, use_gzip, principal=None):
+    # 요청/응답 본문까지 포함된 전체 사용자 로그이므로 관리자만 (user_id 는 부분 일치 검색이라 본인 로그로 제한할 수 없음)
+    if not is_admin(principal):
+        raise HTTPException(403, "사용 로그 내보내기는 관리자만 가능합니다.")
+    try:
+        parse_time_bound(search_start)
+        parse_time_bound(search_end)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    rows = iter_usage_logs(search_start, search_end, user_id, path, method)
+    response = export_response(rows, USAGE_LOG_COLUMNS, fmt, use_gzip, "usage_log")
+    log_api_usage(login_id, "/apim/usage-log/export", "GET", dict(request.query_params), {"format": fmt, "gzip": use_gzip}, 200)
+    return response
@@ -8,23 +8,24 @@ from db.user_permission_type import (
 from fastapi import HTTPException
 from schemas.user_permission_type import UserPermissionTypeCreate, UserPermissionTypeUpdate
 from db.usage_log_db import log_api_usage
+from utils.db_async import run_db
 
 
-def get_user_permission_type_list_service(search: str, search_field: str, use_yn: str, login_id: str):
-    result = get_user_permission_types(search, search_field, use_yn)
+async def get_user_permission_type_list_service(search: str, search_field: str, use_yn: str, login_id: str):
+    result = await run_db(get_user_permission_types, search, search_field, use_yn)
     log_api_usage(login_id, "/apim/user-permission-types", "GET", {"search": search, "search_field": search_field, "use_yn": use_yn}, result, 200)
     return result
 
 
-def create_user_permission_type_service(payload: UserPermissionTypeCreate, login_id: str):
-    create_user_permission_type(payload.model_dump(), login_id)
+async def create_user_permission_type_service(payload: UserPermissionTypeCreate, login_id: str):
+    await run_db(create_user_permission_type, payload.model_dump(), login_id)
     res = {"message": "권한이 등록되었습니다."}
     log_api_usage(login_id, "/apim/user-permission-types", "POST", {**payload.model_dump()}, res, 200)
     return res
 
 
-def update_user_permission_type_service(permission_code: str, payload: UserPermissionTypeUpdate, login_id: str):
-    success = update_user_permission_type(permission_code, payload.model_dump(), login_id)
+async def update_user_permission_type_service(permission_code: str, payload: UserPermissionTypeUpdate, login_id: str):
+    success = await run_db(update_user_permission_type, permission_code, payload.model_dump(), login_id)
     if not success:
         raise HTTPException(404, f"{permission_code} 에 해당하는 권한이 없습니다.")
     res = {"message": "권한이 수정되었습니다."}
@@ -32,8 +33,8 @@ def update_user_permission_type_service(permission_code: str, payload: UserPermi
     return res
 
 
-def delete_user_permission_type_service(permission_code: str, login_id: str):
-    success = delete_user_permission_type(permission_code)
+async def delete_user_permission_type_service(permission_code: str, login_id: str):
+    success = await run_db(delete_user_permission_type, permission_code)
     if not success:
         raise HTTPException(404, f"{permission_code} 에 해당하는 권한이 없습니다.")
     res = {"message": "권한이 삭제되었습니다."}
@@ -41,8 +42,8 @@ def delete_user_permission_type_service(permission_code: str, login_id: str):
     return res
 
 
-def read_users_with_user_permission_type_service(permission_code: str, user_id: str, user_name: str, login_id: str):
-    result = get_users_with_user_permission_type(permission_code, user_id, user_name)
+async def read_users_with_user_permission_type_service(permission_code: str, user_id: str, user_name: str, login_id: str):
+    result = await run_db(get_users_with_user_permission_type, permission_code, user_id, user_name)
     log_api_usage(login_id, "/apim/users-with-user-permission-type", "GET", {
         "permission_code": permission_code,
         "user_id": user_id,
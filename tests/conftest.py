@@ -0,0 +1,17 @@
+import os
+import sys
+import tempfile
+
+# ✅ 테스트 전용 설정 (utils.config 가 import 시점에 환경변수를 읽으므로 가장 먼저 지정)
+_TEST_DIR = tempfile.mkdtemp(prefix="web-service-test-")
+os.environ.setdefault("DB_PATH", os.path.join(_TEST_DIR, "test.db"))
+os.environ.setdefault("API_SALT", "test-api-salt")
+os.environ.setdefault("PASSWORD_SALT", "test-password-salt")
+os.environ.setdefault("JWT_SECRET", "test-jwt-secret-0123456789abcdef0123456789")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "1")
+os.environ.setdefault("TOKEN_REFRESH_THRESHOLD_SECONDS", "600")
+os.environ.setdefault("LOG_ARCHIVE_DIR", os.path.join(_TEST_DIR, "archive"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
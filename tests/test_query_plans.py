@@ -0,0 +1,147 @@
+import asyncio
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.config import Config
+import utils.db_config as db_config
+from utils.db_config import init_db, close_pool, get_conn
+from utils.db_migrations import LOG_TABLE_INDEXES
+from db.gateway_logs_db import select_gateway_logs
+from db.log_partition_db import rotate_log_partitions, partitions_for_range
+from db.overview_db import get_overview_stats
+
+# ✅ 로그 조회 쿼리 실행 계획 회귀 테스트
+# - 마이그레이션이 끝난 DB 에 지난 달(파티션) + 이번 달(원본) 로그를 넣고
+# - 실제 조회 함수가 실행한 SQL 을 그대로 EXPLAIN QUERY PLAN 해서 gateway_logs* 를 전체 스캔하지 않는지 확인
+
+_TABLE_RE = re.compile(r"\b(?:SCAN|SEARCH) (gateway_logs(?:_\d{6})?)\b")
+
+
+@pytest.fixture(scope="module")
+def traced_sql():
+    """조회 함수가 실행한 SQL (바인딩 값이 채워진 문장) 목록을 모으는 리스트"""
+    statements: list[str] = []
+    apply_pragmas = db_config.apply_pragmas
+
+    def on_connect(conn: sqlite3.Connection):
+        apply_pragmas(conn)
+        conn.set_trace_callback(statements.append)
+
+    close_pool()
+    db_config.apply_pragmas = on_connect
+    try:
+        asyncio.run(init_db())
+
+        now = datetime.now()
+        rows = [
+            (
+                f"user{i % 20}", f"API{i % 10}", "GET" if i % 3 else "POST", f"/api/{i % 10}",
+                500 if i % 17 == 0 else 200,
+                (now - timedelta(minutes=37 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+                "Y" if i % 17 else "N",
+            )
+            for i in range(5000)
+        ]
+        with get_conn() as conn:
+            conn.executemany("""
+                INSERT INTO gateway_logs (user_id, api_id, method, path, status_code, requested_at, responded_at, is_success, latency_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 10)
+            """, [row[:6] + (row[5], row[6]) for row in rows])
+
+        # 지난 달 이전 로그 → 월별 파티션 테이블 (파티션도 원본과 같은 인덱스를 가져야 함)
+        rotate_log_partitions(now)
+        with get_conn() as conn:
+            conn.execute("ANALYZE")
+
+        yield statements
+    finally:
+        db_config.apply_pragmas = apply_pragmas
+        close_pool()
+
+
+def _range(days: int) -> tuple[str, str]:
+    now = datetime.now()
+    return (now - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M"), (now + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M")
+
+
+def _plans_for(statements: list[str], run) -> list[tuple[str, list[str]]]:
+    """run() 실행 중 gateway_logs* 를 읽은 SELECT 문마다 (SQL, 실행 계획 행) 목록"""
+    start = len(statements)
+    run()
+    plans = []
+    with sqlite3.connect(Config.DB_PATH) as conn:
+        for sql in statements[start:]:
+            if not sql.lstrip().upper().startswith("SELECT") or "gateway_logs" not in sql:
+                continue
+            if "sqlite_master" in sql or "log_partitions" in sql or "log_archives" in sql:
+                continue
+            details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()]
+            plans.append((sql, details))
+    return plans
+
+
+def _assert_index_search(plans: list[tuple[str, list[str]]], expect_tables: int = 1):
+    assert plans, "gateway_logs 조회 SQL 이 실행되지 않음"
+    for sql, details in plans:
+        log_lines = [d for d in details if _TABLE_RE.search(d)]
+        assert len(log_lines) >= expect_tables, f"{sql}\n{details}"
+        for line in log_lines:
+            assert line.startswith("SEARCH "), f"전체 스캔: {line}\n{sql}"
+            assert "USING INDEX" in line or "USING COVERING INDEX" in line, f"인덱스 미사용: {line}\n{sql}"
+
+
+def _partition_count(days: int) -> int:
+    start, end = _range(days)
+    with get_conn() as conn:
+        return len(partitions_for_range(conn, "gateway_logs", start.replace("T", " ") + ":00", end.replace("T", " ") + ":00"))
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"user_id": "user3"},
+    {"api_id": "API4", "method": "GET"},
+    {"status_code": 500},
+])
+def test_select_gateway_logs_uses_index(traced_sql, filters):
+    start, end = _range(60)
+    args = {"user_id": None, "api_id": None, "method": None, "is_success": None, "status_code": None, **filters}
+    plans = _plans_for(traced_sql, lambda: select_gateway_logs(
+        3, 20, args["user_id"], args["api_id"], args["method"], args["is_success"], args["status_code"], start, end
+    ))
+    _assert_index_search(plans, expect_tables=_partition_count(60))
+
+
+@pytest.mark.parametrize("filters", [{}, {"status_code": 500}])
+def test_select_gateway_logs_seek_uses_index(traced_sql, filters):
+    start, end = _range(60)
+    status_code = filters.get("status_code")
+    first = select_gateway_logs(1, 20, None, None, None, None, status_code, start, end, seek=True)
+    last = first["items"][-1]
+    plans = _plans_for(traced_sql, lambda: select_gateway_logs(
+        1, 20, None, None, None, None, status_code, start, end, seek=True, after=(last["requested_at"], last["log_id"])
+    ))
+    _assert_index_search(plans, expect_tables=_partition_count(60))
+
+
+def test_overview_recent_errors_uses_index(traced_sql):
+    plans = _plans_for(traced_sql, get_overview_stats)
+    _assert_index_search(plans)
+
+
+def test_partitions_have_base_table_indexes(traced_sql):
+    with get_conn() as conn:
+        partitions = partitions_for_range(conn, "gateway_logs")
+        indexed = {
+            table: {
+                tuple(col[2] for col in conn.execute(f"PRAGMA index_info({index[1]})").fetchall())
+                for index in conn.execute(f"PRAGMA index_list({table})").fetchall()
+            }
+            for table in partitions
+        }
+    assert len(indexed) > 1
+    for table, columns in indexed.items():
+        for cols in LOG_TABLE_INDEXES["gateway_logs"].values():
+            assert cols in columns, f"{table} 에 {cols} 인덱스 없음"
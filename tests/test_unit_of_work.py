@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+
+from utils.config import Config
+from utils.db_async import run_db, shutdown_db_executor
+from utils.db_config import init_db, close_pool, get_conn, db_unit_of_work
+
+# ✅ 요청 단위 트랜잭션(db_unit_of_work) 동시성 회귀 테스트
+# - 풀 커넥션 2개 / DB 스레드 2개에서 쓰기 요청 2개가 커넥션을 잡은 채 await 하는 동안 읽기 요청 2개가 들어오는 상황
+# - 읽기 요청이 스레드를 모두 차지하고 pool.acquire 에서 기다려도, 쓰기 요청은 다음 DAO / 커밋을 진행할 수 있어야 함
+
+POOL_TIMEOUT_SECONDS = 3.0
+
+
+@pytest.fixture
+def small_pool():
+    saved = (Config.DB_POOL_SIZE, Config.DB_ASYNC_MAX_CONCURRENCY, Config.DB_POOL_TIMEOUT_SECONDS)
+    close_pool()
+    shutdown_db_executor()
+    asyncio.run(init_db())
+    with get_conn() as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS uow_probe (name TEXT, step INTEGER)")
+        conn.execute("DELETE FROM uow_probe")
+
+    close_pool()
+    Config.DB_POOL_SIZE, Config.DB_ASYNC_MAX_CONCURRENCY, Config.DB_POOL_TIMEOUT_SECONDS = 2, 2, POOL_TIMEOUT_SECONDS
+    try:
+        yield
+    finally:
+        close_pool()
+        shutdown_db_executor()
+        Config.DB_POOL_SIZE, Config.DB_ASYNC_MAX_CONCURRENCY, Config.DB_POOL_TIMEOUT_SECONDS = saved
+
+
+def _write(name: str, step: int):
+    with get_conn() as conn:
+        conn.execute("INSERT INTO uow_probe (name, step) VALUES (?, ?)", (name, step))
+
+
+def _read() -> int:
+    with get_conn() as conn:
+        return conn.execute("SELECT COUNT(*) FROM uow_probe").fetchone()[0]
+
+
+async def _unit_request(name: str, holding: asyncio.Event, proceed: asyncio.Event):
+    """db_unit_of_work 의존성과 같은 순서로: 쓰기 → (다른 요청 처리) → 쓰기 → 커밋"""
+    dependency = db_unit_of_work()
+    await dependency.__anext__()
+    await run_db(_write, name, 1)
+    holding.set()
+    await proceed.wait()
+    await run_db(_write, name, 2)
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+
+
+async def _scenario():
+    # unit1: 쓰기 트랜잭션(커넥션 + 쓰기 잠금)을 잡은 채 await
+    holding, proceed = asyncio.Event(), asyncio.Event()
+    first = asyncio.create_task(_unit_request("unit1", holding, proceed))
+    await holding.wait()
+
+    # unit2: 첫 쓰기가 unit1 의 커밋을 기다리며 DB 스레드 하나를 점유 (busy_timeout)
+    second_holding = asyncio.Event()
+    second_holding.set()
+    second = asyncio.create_task(_unit_request("unit2", asyncio.Event(), second_holding))
+    await asyncio.sleep(0.05)
+
+    # 읽기 2개: 남은 DB 스레드 / 세마포어를 차지하고 pool.acquire 에서 대기
+    reads = [asyncio.create_task(run_db(_read)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    # unit1 은 다음 DAO / 커밋을 진행할 수 있어야 함
+    proceed.set()
+    return await asyncio.gather(first, second, *reads)
+
+
+def test_units_and_reads_do_not_stall_on_small_pool(small_pool):
+    started = time.monotonic()
+    results = asyncio.run(asyncio.wait_for(_scenario(), POOL_TIMEOUT_SECONDS * 2))
+    elapsed = time.monotonic() - started
+
+    assert elapsed < POOL_TIMEOUT_SECONDS / 2, f"풀 대기 시간 초과까지 멈춤 ({elapsed:.2f}s)"
+    assert all(count in (2, 4) for count in results[2:]), results  # 읽기는 커밋된 쓰기만 봄
+    assert _read() == 4
+
+
+def test_read_only_unit_returns_connection_between_calls(small_pool):
+    async def scenario():
+        dependency = db_unit_of_work()
+        unit = await dependency.__anext__()
+        await run_db(_read)
+        held_after_read = unit.pooled is not None
+        await run_db(_write, "unit", 1)
+        held_after_write = unit.pooled is not None
+        with pytest.raises(StopAsyncIteration):
+            await dependency.__anext__()
+        return held_after_read, held_after_write
+
+    held_after_read, held_after_write = asyncio.run(scenario())
+    assert not held_after_read   # 읽기만 했으면 커넥션을 바로 반납
+    assert held_after_write      # 쓰기 트랜잭션이 열린 뒤에는 커밋까지 유지
+    assert _read() == 1
@@ -0,0 +1,144 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable
+from utils.config import Config
+from utils.db_config import get_conn, after_transaction
+from utils.sql_registry import register_sql
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    프로세스 내 LRU + TTL 캐시.
+    - max_size 를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    - ttl_seconds 가 지난 항목은 조회 시 만료 처리
+    - hit/miss 카운터 제공
+    - namespaces: 이 캐시가 의존하는 테이블 그룹. 해당 namespace 의 cache_epoch 가 바뀌면 통째로 비움
+    """
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float, namespaces: Iterable[str] = ()):
+        self.name = name
+        self.namespaces = tuple(namespaces)
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        _registry.append(self)
+        for ns in self.namespaces:
+            _namespace_caches.setdefault(ns, []).append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] <= now:
+                if entry is not _MISSING:
+                    del self._data[key]
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            if self._data.pop(key, _MISSING) is not _MISSING:
+                self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 4) if total else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+_registry: list[TTLCache] = []
+_namespace_caches: dict[str, list[TTLCache]] = {}
+
+
+def get_cache_stats() -> dict:
+    return {cache.name: cache.stats() for cache in _registry}
+
+
+# ✅ 워커 간 캐시 무효화 (cache_epoch 테이블)
+# - 쓰기 함수는 같은 트랜잭션 안에서 bump_cache_epoch(conn, "users") 처럼 namespace 의 epoch 를 올린다
+# - 각 워커는 요청마다 sync_cache_epochs() 로 epoch 를 확인해서 바뀐 namespace 의 캐시만 비운다
+_seen_epochs: dict[str, int] = {}
+_epoch_lock = threading.Lock()
+_last_epoch_sync = 0.0
+
+
+def invalidate_namespaces(*namespaces: str):
+    for ns in namespaces:
+        for cache in _namespace_caches.get(ns, ()):
+            cache.clear()
+
+
+_BUMP_EPOCH_SQL = register_sql("cache_epoch.bump", """
+    INSERT INTO cache_epoch (namespace, epoch) VALUES (?, 1)
+    ON CONFLICT(namespace) DO UPDATE SET epoch = epoch + 1
+""")
+_SELECT_EPOCHS_SQL = register_sql("cache_epoch.sync", "SELECT namespace, epoch FROM cache_epoch")
+
+
+def bump_cache_epoch(conn: sqlite3.Connection, *namespaces: str):
+    conn.executemany(_BUMP_EPOCH_SQL, [(ns,) for ns in namespaces])
+    # 현재 워커는 즉시 비움 (다른 워커는 다음 sync 에서 반영)
+    # 요청 단위 트랜잭션 안이면 커밋/롤백 후 한 번 더 비움 (그 사이 다시 채워진 옛 값/롤백된 값 제거)
+    invalidate_namespaces(*namespaces)
+    after_transaction(invalidate_namespaces, *namespaces)
+
+
+def sync_cache_epochs(force: bool = False):
+    global _last_epoch_sync
+    now = time.monotonic()
+    if not force and now - _last_epoch_sync < Config.CACHE_EPOCH_CHECK_INTERVAL_MS / 1000:
+        return
+    try:
+        with get_conn() as conn:
+            rows = conn.execute(_SELECT_EPOCHS_SQL).fetchall()
+    except Exception as e:
+        logger.warning(f"[cache_epoch 조회 실패] {e}")
+        return
+
+    changed = []
+    with _epoch_lock:
+        _last_epoch_sync = now
+        for namespace, epoch in rows:
+            if _seen_epochs.get(namespace, 0) != epoch:
+                _seen_epochs[namespace] = epoch
+                changed.append(namespace)
+    if changed:
+        invalidate_namespaces(*changed)
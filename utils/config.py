@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -17,6 +18,67 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int
     TOKEN_REFRESH_THRESHOLD_SECONDS: int
 
+    # 3. DB 커넥션 풀 설정
+    DB_POOL_SIZE: int = 10                      # 프로세스당 최대 커넥션 수
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0       # 커넥션 체크아웃 최대 대기 시간
+    DB_POOL_MAX_LIFETIME_SECONDS: int = 1800    # 이 시간이 지난 커넥션은 폐기 후 재생성
+    DB_POOL_PING_INTERVAL_SECONDS: int = 30     # 이 시간 이상 놀던 커넥션은 체크아웃 시 상태 확인
+    DB_CACHED_STATEMENTS: int = 512             # 커넥션별 준비된 문장 캐시 크기 (sqlite3 기본 128)
+    DB_STATEMENT_STATS: bool = False            # 문장별 실행 횟수 집계 (실행마다 Python 래퍼를 거치므로 진단 시에만)
+    DB_STATEMENT_CACHE_ESTIMATE: bool = False   # 문장 캐시 hit/miss 추정 (Python 에서 LRU 를 따라 기록, 실행마다 비용 → 진단 시에만, 실행 횟수 집계 포함)
+
+    # 4. SQLite PRAGMA 프로파일 (풀 커넥션 생성 시 1회 적용)
+    DB_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = "WAL"
+    DB_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    DB_CACHE_SIZE: int = -20000                 # 음수면 KiB 단위 (-20000 ≒ 20MB)
+    DB_MMAP_SIZE: int = 268435456               # 256MB
+    DB_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    DB_BUSY_TIMEOUT_MS: int = 5000
+    DB_WAL_CHECKPOINT_INTERVAL_SECONDS: int = 300   # 0 이면 주기적 체크포인트 비활성화
+    DB_WAL_CHECKPOINT_MODE: Literal["PASSIVE", "FULL", "RESTART", "TRUNCATE"] = "TRUNCATE"
+
+    # 5. 비동기 DB 접근 (DB 전용 스레드 풀 크기 = 동시 DB 작업 상한)
+    DB_ASYNC_MAX_CONCURRENCY: int = 8
+
+    # 6. 사용자 정보(principal) 캐시
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    CACHE_EPOCH_CHECK_INTERVAL_MS: int = 0      # 워커 간 캐시 무효화 확인 주기 (0 이면 매 요청)
+    API_PERMISSION_ENFORCED: bool = False       # 관리자 외 사용자는 api_permissions 에 등록된 API 만 호출 가능
+    API_PERMISSION_INDEX_TTL_SECONDS: float = 300.0
+    SCREEN_ACCESS_ENFORCED: bool = False        # 모든 인증 요청에서 화면 접근 권한 검사 (screen_path 쿼리 / X-Screen-Path 헤더 / JSON 본문 필요)
+    SCREEN_ACCESS_CACHE_TTL_SECONDS: float = 300.0
+
+    # 7. API 사용 로그 백그라운드 배치 기록
+    USAGE_LOG_QUEUE_SIZE: int = 10000           # 큐가 가득 차면 로그를 버리고 dropped 카운트
+    USAGE_LOG_BATCH_SIZE: int = 200
+    USAGE_LOG_FLUSH_INTERVAL_MS: int = 200
+    # 응답 기록 정책: GET 목록은 요약(행 수/페이지/해시)만, 그 외는 크기 제한 (db/usage_log_db.capture_response)
+    USAGE_LOG_RESPONSE_MAX_BYTES: int = 4096    # 넘으면 앞부분 + 전체 크기/해시만 기록 (0 = 제한 없음)
+    USAGE_LOG_FULL_CAPTURE_PATHS: list[str] = []  # 응답 전체를 기록할 경로 (JSON 배열, 예: ["/apim/api-key"])
+
+    # 8. 목록 조회 전체 건수 (로그 테이블)
+    LIST_COUNT_CAP: int = 10000                  # 이 건수까지만 세고 넘으면 "10000+" 로 표시 (0 = 제한 없음)
+    LIST_COUNT_CACHE_SIZE: int = 256             # 필터 조합별 건수 캐시 개수
+    LIST_COUNT_CACHE_TTL_SECONDS: float = 10.0
+
+    # 9. 로그 테이블 월별 파티션 / 보존 기간 (gateway_logs, api_usage_log)
+    LOG_PARTITION_INTERVAL_SECONDS: int = 3600  # 지난 달 로그를 월별 테이블로 옮기는 주기 (0 이면 비활성화)
+    LOG_PARTITION_MOVE_BATCH_SIZE: int = 5000   # 한 트랜잭션에서 옮기는 행 수 (쓰기 잠금 시간 제한)
+    GATEWAY_LOG_RETENTION_MONTHS: int = 0       # 이번 달 제외 최근 N개월만 보관, 이전 파티션은 DROP (0 이면 영구 보관)
+    USAGE_LOG_RETENTION_MONTHS: int = 0
+
+    # 10. 오래된 로그 압축 아카이브 (월별 파티션 → 컬럼 단위 압축 세그먼트 파일)
+    LOG_ARCHIVE_AFTER_DAYS: int = 0             # 파티션 기간이 끝나고 N일 지나면 아카이브 후 DROP (0 이면 비활성화)
+    LOG_ARCHIVE_DIR: str = "log_archive"
+    LOG_ARCHIVE_BLOCK_ROWS: int = 4096          # 블록(최소/최대 시각 인덱스 단위) 당 행 수
+
+    # 11. 로그 내보내기 (/apim/gateway-logs/export, /apim/usage-log/export)
+    EXPORT_FETCH_SIZE: int = 1000               # 한 번의 청크 조회로 가져오는 행 수 (청크마다 커넥션을 빌리고 반납)
+    EXPORT_CHUNK_BYTES: int = 65536             # 응답으로 내보내는 청크 크기
+    EXPORT_GZIP_LEVEL: int = 6
+    EXPORT_MAX_CONCURRENCY: int = 4             # 동시 내보내기 수 (초과 요청은 429)
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
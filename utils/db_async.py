@@ -0,0 +1,78 @@
+import asyncio
+import contextvars
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+from utils.config import Config
+
+# ✅ DB 전용 스레드 풀: 동기 sqlite3 DAO 를 이벤트 루프 밖에서 실행
+_executor: Optional[ThreadPoolExecutor] = None
+# 이벤트 루프별 동시 DB 작업 제한 (Semaphore 는 루프에 묶이므로 루프마다 생성)
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+# ✅ 요청 단위 트랜잭션(utils/db_config.UnitOfWork) 전용 스레드 풀
+# - 쓰기 트랜잭션을 연 요청은 커넥션을 잡은 채 await 하므로, 다음 DAO / 커밋은 pool.acquire 없이 바로 실행 가능
+# - 공용 스레드/세마포어는 커넥션을 기다리는 작업이 모두 차지할 수 있으므로 분리
+#   (커넥션을 가진 요청 수 ≤ DB_POOL_SIZE → 요청당 한 번에 하나씩만 실행하면 항상 스레드가 있음)
+_unit_executor: Optional[ThreadPoolExecutor] = None
+current_unit: ContextVar[Optional[Any]] = ContextVar("db_unit_of_work", default=None)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=Config.DB_ASYNC_MAX_CONCURRENCY,
+            thread_name_prefix="db-worker",
+        )
+    return _executor
+
+
+def _get_unit_executor() -> ThreadPoolExecutor:
+    global _unit_executor
+    if _unit_executor is None:
+        _unit_executor = ThreadPoolExecutor(
+            max_workers=max(1, Config.DB_POOL_SIZE),
+            thread_name_prefix="db-unit-worker",
+        )
+    return _unit_executor
+
+
+def _get_semaphore(loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+    sem = _semaphores.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(Config.DB_ASYNC_MAX_CONCURRENCY)
+        _semaphores[loop] = sem
+    return sem
+
+
+async def run_db(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    동기 DAO 함수를 DB 스레드 풀에서 실행하고 결과를 await 한다.
+    - 동시에 실행되는 DB 작업 수는 DB_ASYNC_MAX_CONCURRENCY 로 제한
+    - contextvars 를 복사해서 넘기므로 요청 단위 컨텍스트가 DAO 에서도 유지됨
+    - 커넥션을 잡고 있는 요청 단위 트랜잭션의 작업은 공용 제한 없이 전용 스레드 풀에서 실행
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+
+    unit = current_unit.get()
+    if unit is not None and unit.pooled is not None:
+        async with unit.call_lock:
+            return await loop.run_in_executor(_get_unit_executor(), call)
+
+    async with _get_semaphore(loop):
+        return await loop.run_in_executor(_get_executor(), call)
+
+
+def shutdown_db_executor():
+    global _executor, _unit_executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    if _unit_executor is not None:
+        _unit_executor.shutdown(wait=True)
+        _unit_executor = None
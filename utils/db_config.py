@@ -1,24 +1,254 @@
+import os
+import asyncio
+import logging
 import sqlite3
+import threading
 from contextlib import contextmanager
+from typing import Any, Callable, Optional
 from utils.config import Config
+from utils.db_pool import ConnectionPool, PoolTimeoutError
+from utils.sql_registry import get_sql_registry_stats
+from utils.db_async import run_db, current_unit as _current_unit
+from utils.db_migrations import run_migrations
+from utils.fts import load_fts_indexes
 
 DB_PATH = Config.DB_PATH
 
+logger = logging.getLogger(__name__)
+
 class DatabaseError(Exception):
     pass
 
+# ✅ 커넥션 생성 시 1회 적용할 PRAGMA 프로파일
+def apply_pragmas(conn: sqlite3.Connection):
+    conn.execute(f"PRAGMA busy_timeout = {int(Config.DB_BUSY_TIMEOUT_MS)}")
+    conn.execute(f"PRAGMA journal_mode = {Config.DB_JOURNAL_MODE}")
+    conn.execute(f"PRAGMA synchronous = {Config.DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = {int(Config.DB_CACHE_SIZE)}")
+    conn.execute(f"PRAGMA mmap_size = {int(Config.DB_MMAP_SIZE)}")
+    conn.execute(f"PRAGMA temp_store = {Config.DB_TEMP_STORE}")
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+# ✅ 프로세스별 커넥션 풀 (uvicorn 워커가 fork 되면 자식 프로세스에서 새로 생성)
+def get_pool() -> ConnectionPool:
+    global _pool
+    pool = _pool
+    if pool is None or pool._pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool._pid != os.getpid():
+                _pool = ConnectionPool(
+                    DB_PATH,
+                    max_size=Config.DB_POOL_SIZE,
+                    timeout=Config.DB_POOL_TIMEOUT_SECONDS,
+                    max_lifetime=Config.DB_POOL_MAX_LIFETIME_SECONDS,
+                    ping_interval=Config.DB_POOL_PING_INTERVAL_SECONDS,
+                    on_connect=apply_pragmas,
+                    cached_statements=Config.DB_CACHED_STATEMENTS,
+                    statement_stats=Config.DB_STATEMENT_STATS,
+                    statement_cache_estimate=Config.DB_STATEMENT_CACHE_ESTIMATE,
+                )
+            pool = _pool
+    return pool
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+def get_pool_stats() -> dict:
+    return get_pool().stats()
+
+def get_statement_cache_stats() -> dict:
+    """문장별 실행 횟수 (DB_STATEMENT_STATS 설정 시, + 준비된 문장 캐시 hit/miss 추정치) + 레지스트리에 등록된 문장별 변형 수"""
+    stats = get_pool().statement_cache_stats()
+    stats["registered"] = get_sql_registry_stats()
+    return stats
+
+# ✅ 요청 단위 트랜잭션 (Unit of Work)
+# - db_unit_of_work 의존성이 활성화된 요청에서는 get_conn() 이 매번 풀에서 빌리지 않고 같은 커넥션을 사용
+# - 커밋은 요청 끝에 한 번, 예외로 끝나면 전체 롤백
+# - 쓰기 트랜잭션이 열린 뒤의 get_conn() 블록은 SAVEPOINT 로 감싸서, 블록 하나가 실패하면 그 블록만 되돌림
+#   (첫 쓰기 전까지는 기존처럼 자동 커밋 읽기 → 오래된 스냅샷을 잡고 있지 않음)
+# - 커넥션은 쓰기 트랜잭션이 열려 있는 동안만 유지 (읽기만 한 블록이 끝나면 바로 풀에 반납)
+# - 커넥션을 가진 동안의 run_db 호출은 전용 스레드 풀에서 실행 (utils/db_async: 공용 스레드가 모두
+#   커넥션을 기다리고 있어도 커밋까지 진행 → 풀 대기 시간 초과까지 서로 멈추지 않음)
+class UnitOfWork:
+    __slots__ = ("pooled", "lock", "call_lock", "callbacks", "savepoints", "rollback_only")
+
+    def __init__(self):
+        self.pooled = None
+        self.lock = threading.RLock()  # 같은 요청의 DAO 호출이 겹치더라도 커넥션은 한 번에 하나만 사용
+        self.call_lock = asyncio.Lock()  # 전용 스레드 풀에서는 요청당 한 번에 하나의 작업만 실행
+        self.callbacks: list[tuple[Callable, tuple]] = []
+        self.savepoints = 0
+        self.rollback_only = False  # 블록 단위 되돌리기에 실패 → 커밋하지 않고 전체 롤백
+
+    def connection(self) -> sqlite3.Connection:
+        if self.pooled is None:
+            try:
+                self.pooled = get_pool().acquire()
+            except PoolTimeoutError as e:
+                raise DatabaseError(f"[DB 커넥션 풀 오류] {e}")
+            except sqlite3.Error as e:
+                raise DatabaseError(f"[DB 연결 실패] {e}")
+        return self.pooled.conn
+
+    def release_if_idle(self):
+        """열린 트랜잭션이 없으면 (읽기만 했으면) 커넥션을 풀에 반납"""
+        pooled = self.pooled
+        if pooled is not None and not pooled.conn.in_transaction:
+            self.pooled = None
+            self.savepoints = 0
+            get_pool().release(pooled)
+
+    def finish(self, commit: bool):
+        """커밋(또는 롤백) 후 커넥션 반납, 트랜잭션 종료 후 실행할 작업(캐시 무효화 등) 실행"""
+        pooled, self.pooled = self.pooled, None
+        try:
+            if pooled is not None:
+                broken = False
+                try:
+                    if commit and self.rollback_only:
+                        raise sqlite3.OperationalError("실패한 블록을 되돌리지 못해 트랜잭션 전체를 롤백합니다.")
+                    if commit:
+                        pooled.conn.commit()
+                    else:
+                        pooled.conn.rollback()
+                except Exception as e:
+                    try:
+                        pooled.conn.rollback()
+                    except sqlite3.Error:
+                        broken = True
+                    raise DatabaseError(f"[DB 커밋 실패] {e}")
+                finally:
+                    get_pool().release(pooled, discard=broken)
+        finally:
+            callbacks, self.callbacks = self.callbacks, []
+            for fn, args in callbacks:
+                try:
+                    fn(*args)
+                except Exception as e:
+                    logger.warning(f"[트랜잭션 종료 후 작업 실패] {e}")
+
+
+def after_transaction(fn: Callable, *args: Any):
+    """
+    요청 단위 트랜잭션 안이면 커밋/롤백 후에, 아니면 바로 실행
+    - 커밋 전에 다른 요청이 옛 값을 다시 캐시하거나, 롤백된 값이 캐시에 남는 일을 막기 위한 캐시 무효화용
+    """
+    unit = _current_unit.get()
+    if unit is None:
+        fn(*args)
+    else:
+        unit.callbacks.append((fn, args))
+
+
+async def db_unit_of_work():
+    """
+    FastAPI 의존성: 요청 하나의 DAO 호출을 커넥션 하나/트랜잭션 하나로 묶음
+    - 인증 의존성 뒤에 선언 (토큰 갱신 등 인증 단계의 쓰기는 요청 결과와 관계없이 반영)
+    - scope="function" 으로 사용해야 응답을 보내기 전에 커밋 결과가 확정됨
+    """
+    unit = UnitOfWork()
+    token = _current_unit.set(unit)
+    try:
+        yield unit
+    except BaseException:
+        # 요청이 취소되어도 커넥션이 반납되도록 shield
+        await asyncio.shield(run_db(unit.finish, False))
+        raise
+    else:
+        if unit.pooled is None:
+            unit.finish(True)  # DB 를 쓰지 않았으면 스레드 이동 없이 종료 작업만
+        else:
+            await asyncio.shield(run_db(unit.finish, True))
+    finally:
+        _current_unit.reset(token)
+
+
+@contextmanager
+def _unit_conn(unit: UnitOfWork):
+    with unit.lock:
+        conn = unit.connection()
+        savepoint = None
+        if conn.in_transaction:
+            unit.savepoints += 1
+            savepoint = f"uow_{unit.savepoints}"
+            conn.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield conn
+            if savepoint:
+                conn.execute(f"RELEASE {savepoint}")
+        except Exception as e:
+            try:
+                if savepoint:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                else:
+                    # 이 블록에서 트랜잭션이 시작됨 → 되돌릴 것은 이 블록의 쓰기뿐
+                    conn.rollback()
+            except sqlite3.Error:
+                unit.rollback_only = True
+            raise DatabaseError(f"[DB 오류] {e}")
+        finally:
+            if not unit.rollback_only:
+                unit.release_if_idle()
+
+
 @contextmanager
 def get_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    unit = _current_unit.get()
+    if unit is not None:
+        with _unit_conn(unit) as conn:
+            yield conn
+        return
+
+    pool = get_pool()
+    try:
+        pooled = pool.acquire()
+    except PoolTimeoutError as e:
+        raise DatabaseError(f"[DB 커넥션 풀 오류] {e}")
+    except sqlite3.Error as e:
+        raise DatabaseError(f"[DB 연결 실패] {e}")
+
+    conn = pooled.conn
+    broken = False
     try:
         yield conn
         conn.commit()
     except Exception as e:
-        conn.rollback()
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            broken = True
         raise DatabaseError(f"[DB 오류] {e}")
     finally:
-        conn.close()
+        pool.release(pooled, discard=broken)
+
+
+# ✅ WAL 체크포인트 (WAL 파일이 무한정 커지지 않도록)
+def checkpoint_wal(mode: str = None) -> Optional[tuple]:
+    if Config.DB_JOURNAL_MODE != "WAL":
+        return None
+    mode = mode or Config.DB_WAL_CHECKPOINT_MODE
+    with get_conn() as conn:
+        row = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    busy, log_frames, checkpointed = tuple(row)
+    if busy:
+        logger.warning(f"[WAL 체크포인트] 읽기/쓰기 중인 커넥션으로 일부만 반영됨 (log={log_frames}, checkpointed={checkpointed})")
+    return busy, log_frames, checkpointed
+
+async def run_wal_checkpoint_loop(interval_seconds: int):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_db(checkpoint_wal)
+        except Exception as e:
+            logger.warning(f"[WAL 체크포인트 실패] {e}")
 
 
 async def init_db():
@@ -148,6 +378,11 @@ async def init_db():
                     update_date DATETIME DEFAULT CURRENT_TIMESTAMP
                 );
 
+                CREATE TABLE IF NOT EXISTS cache_epoch (
+                    namespace TEXT PRIMARY KEY,   -- 캐시 무효화 단위 (users, api_list, api_permissions ...)
+                    epoch INTEGER NOT NULL DEFAULT 0
+                );
+
                 CREATE TABLE IF NOT EXISTS users (
                     user_id TEXT PRIMARY KEY,
                     password TEXT NOT NULL,
@@ -162,5 +397,7 @@ async def init_db():
                 );
 
             ''')
+            run_migrations(conn)
+            load_fts_indexes(conn)
     except Exception as e:
         raise DatabaseError(f"[DB 초기화 실패] {e}")        
@@ -0,0 +1,200 @@
+import logging
+import sqlite3
+from typing import Callable, Union
+from utils.fts import FTS_INDEXES, create_fts_index, is_trigram_supported
+
+logger = logging.getLogger(__name__)
+
+# ✅ 버전 관리되는 스키마 마이그레이션 (PRAGMA user_version 기준)
+# - (버전, 설명, SQL 문 목록 또는 conn 을 받는 함수) 순서대로 한 번씩만 적용
+# - 기존 테이블은 init_db 의 CREATE TABLE IF NOT EXISTS 로 만들어진 뒤 적용됨
+# - 큰 테이블 인덱스 생성은 단계별로 나눠 쓰기 잠금 시간을 짧게 유지 (WAL 이므로 읽기는 계속 가능)
+Migration = tuple[int, str, Union[list[str], Callable[[sqlite3.Connection], None]]]
+
+# ✅ 로그 테이블 인덱스 정의 (이름 → 컬럼)
+# - 원본 테이블 마이그레이션과 월별 파티션 테이블(db/log_partition_db.py)이 같은 정의로 인덱스 생성
+LOG_TABLE_INDEXES: dict[str, dict[str, tuple[str, ...]]] = {
+    "gateway_logs": {
+        "requested_at": ("requested_at", "log_id"),
+        "user_requested": ("user_id", "requested_at"),
+        "api_method_requested": ("api_id", "method", "requested_at"),
+        "status_requested": ("status_code", "requested_at"),
+    },
+    "api_usage_log": {
+        "request_time": ("request_time", "user_id"),
+    },
+}
+
+
+def _log_index_sql(base_table: str, name: str) -> str:
+    cols = LOG_TABLE_INDEXES[base_table][name]
+    return f"CREATE INDEX IF NOT EXISTS {base_table}_{name}_IDX ON {base_table} ({', '.join(cols)})"
+
+
+def partition_index_sqls(base_table: str, partition: str) -> list[str]:
+    """월별 파티션 테이블에 원본 테이블과 같은 인덱스 생성 SQL"""
+    return [
+        f"CREATE INDEX IF NOT EXISTS {partition}_{'_'.join(cols)}_IDX ON {partition} ({', '.join(cols)})"
+        for cols in LOG_TABLE_INDEXES[base_table].values()
+    ]
+
+
+def _create_missing_partition_indexes(conn: sqlite3.Connection):
+    """이미 만들어진 파티션 테이블에 누락된 인덱스 보강 (원본 인덱스 정의 기준)"""
+    rows = conn.execute("""
+        SELECT p.base_table, p.partition_table FROM log_partitions p
+        JOIN sqlite_master m ON m.type = 'table' AND m.name = p.partition_table
+    """).fetchall()
+    for base_table, partition in rows:
+        if base_table in LOG_TABLE_INDEXES:
+            for sql in partition_index_sqls(base_table, partition):
+                conn.execute(sql)
+
+
+# 시간 버킷: requested_at 문자열 기준 'YYYY-MM-DD HH:00' (타임존 변환 없이 저장된 로컬 시각 그대로 사용)
+_HOUR_BUCKET_SQL = "substr(replace({col}, 'T', ' '), 1, 13) || ':00'"
+
+
+def _create_gateway_stats_hourly(conn: sqlite3.Connection):
+    """대시보드용 시간대별 집계 테이블 + gateway_logs INSERT 시 증분 반영 트리거 + 기존 로그 백필"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS gateway_stats_hourly (
+            hour TEXT NOT NULL,                    -- 'YYYY-MM-DD HH:00'
+            api_id TEXT NOT NULL DEFAULT '',
+            method TEXT NOT NULL,
+            status_class INTEGER NOT NULL,         -- status_code / 100 (2, 4, 5 ... / 없으면 0)
+            call_count INTEGER NOT NULL DEFAULT 0,
+            error_count INTEGER NOT NULL DEFAULT 0, -- status_code >= 400
+            latency_sum INTEGER NOT NULL DEFAULT 0, -- latency_ms 합계 (평균 = latency_sum / call_count)
+            PRIMARY KEY (hour, api_id, method, status_class)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS gateway_logs_stats_hourly_AI
+        AFTER INSERT ON gateway_logs
+        BEGIN
+            INSERT INTO gateway_stats_hourly (hour, api_id, method, status_class, call_count, error_count, latency_sum)
+            VALUES (
+                {_HOUR_BUCKET_SQL.format(col="NEW.requested_at")},
+                IFNULL(NEW.api_id, ''),
+                NEW.method,
+                IFNULL(NEW.status_code, 0) / 100,
+                1,
+                CASE WHEN NEW.status_code >= 400 THEN 1 ELSE 0 END,
+                IFNULL(NEW.latency_ms, 0)
+            )
+            ON CONFLICT(hour, api_id, method, status_class) DO UPDATE SET
+                call_count = call_count + 1,
+                error_count = error_count + excluded.error_count,
+                latency_sum = latency_sum + excluded.latency_sum;
+        END
+    """)
+    # 트리거 생성과 같은 트랜잭션에서 백필하므로 누락/중복 없이 이어짐
+    conn.execute("DELETE FROM gateway_stats_hourly")
+    conn.execute(f"""
+        INSERT INTO gateway_stats_hourly (hour, api_id, method, status_class, call_count, error_count, latency_sum)
+        SELECT
+            {_HOUR_BUCKET_SQL.format(col="requested_at")} AS hour,
+            IFNULL(api_id, '') AS api_id,
+            method,
+            IFNULL(status_code, 0) / 100 AS status_class,
+            COUNT(*),
+            SUM(CASE WHEN status_code >= 400 THEN 1 ELSE 0 END),
+            IFNULL(SUM(latency_ms), 0)
+        FROM gateway_logs
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+
+def _create_fts_indexes(conn: sqlite3.Connection):
+    """LIKE '%...%' 부분 검색 대상 컬럼의 FTS5 trigram 인덱스 (utils/fts.py)"""
+    if not is_trigram_supported(conn):
+        logger.warning("[DB 마이그레이션] SQLite 에 FTS5 trigram 토크나이저가 없어 부분 검색 인덱스를 건너뜁니다.")
+        return
+    for table in FTS_INDEXES:
+        create_fts_index(conn, table)
+
+
+MIGRATIONS: list[Migration] = [
+    (1, "gateway_logs (requested_at, log_id) 인덱스 - 기간 조회/최신순 정렬/keyset 페이지네이션", [
+        _log_index_sql("gateway_logs", "requested_at"),
+    ]),
+    (2, "gateway_logs (user_id, requested_at) 인덱스 - 일반 사용자 본인 로그 조회", [
+        _log_index_sql("gateway_logs", "user_requested"),
+    ]),
+    (3, "gateway_logs (api_id, method, requested_at) 인덱스 - API/메서드별 로그 조회", [
+        _log_index_sql("gateway_logs", "api_method_requested"),
+    ]),
+    (4, "gateway_logs (status_code, requested_at) 인덱스 - 상태 코드/오류 로그 조회", [
+        _log_index_sql("gateway_logs", "status_requested"),
+    ]),
+    (5, "gateway_stats_hourly 시간대별 집계 테이블 (대시보드)", _create_gateway_stats_hourly),
+    (6, "api_usage_log (request_time, user_id) 인덱스 - 기간 조회/최신순 정렬", [
+        _log_index_sql("api_usage_log", "request_time"),
+    ]),
+    (7, "FTS5 trigram 부분 검색 인덱스 (users, api_list, screens, api_keys, api_usage_log, api_permission_requests)", _create_fts_indexes),
+    (8, "log_partitions 월별 로그 파티션 목록 (db/log_partition_db.py)", [
+        """
+        CREATE TABLE IF NOT EXISTS log_partitions (
+            partition_table TEXT PRIMARY KEY,       -- ex) gateway_logs_202501
+            base_table TEXT NOT NULL,               -- gateway_logs / api_usage_log
+            period_start TEXT NOT NULL,             -- 'YYYY-MM-01 00:00:00' (포함)
+            period_end TEXT NOT NULL,               -- 다음 달 1일 (미포함)
+            row_count INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT DEFAULT (datetime('now', 'localtime'))
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS log_partitions_base_period_IDX ON log_partitions (base_table, period_start)",
+    ]),
+    (9, "log_archives 압축 아카이브 세그먼트 목록 (db/log_archive_db.py)", [
+        """
+        CREATE TABLE IF NOT EXISTS log_archives (
+            segment_file TEXT PRIMARY KEY,          -- LOG_ARCHIVE_DIR 기준 파일명
+            base_table TEXT NOT NULL,
+            partition_table TEXT NOT NULL,
+            period_start TEXT NOT NULL,
+            period_end TEXT NOT NULL,
+            min_time TEXT,
+            max_time TEXT,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            codec TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT DEFAULT (datetime('now', 'localtime'))
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS log_archives_base_period_IDX ON log_archives (base_table, period_start)",
+    ]),
+    (10, "기존 월별 파티션 테이블에 누락된 gateway_logs 인덱스 보강 (api_id/method, status_code)", _create_missing_partition_indexes),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(conn: sqlite3.Connection):
+    for version, description, step in MIGRATIONS:
+        if get_schema_version(conn) >= version:
+            continue
+
+        # BEGIN IMMEDIATE: 여러 워커가 동시에 기동해도 한 곳에서만 적용되도록 쓰기 잠금 선점
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            if callable(step):
+                step(conn)
+            else:
+                for sql in step:
+                    conn.execute(sql)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logger.info(f"[DB 마이그레이션] v{version} 적용: {description}")
+
+    # 새 인덱스를 쿼리 플래너가 활용할 수 있도록 통계 갱신 (필요한 테이블만 분석)
+    conn.execute("PRAGMA optimize")
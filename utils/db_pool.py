@@ -0,0 +1,307 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Optional
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class StatementCacheConnection(sqlite3.Connection):
+    """
+    SQL 문장별 실행 횟수를 집계하는 커넥션
+    - utils/sql_registry 에 등록된 문장은 이름별로, 나머지는 "_other" 로 집계 (반납 시 풀 통계에 합산)
+    - enable_cache_estimate() 시 준비된 문장 캐시 hit/miss 도 추정
+      (sqlite3 내부 캐시는 조회할 수 없으므로 같은 크기의 LRU 를 Python 에서 따라 기록 → 실행마다 비용이 있어 진단용)
+    """
+
+    def __init__(self, *args, cached_statements: int = 128, **kwargs):
+        super().__init__(*args, cached_statements=cached_statements, **kwargs)
+        self.statement_capacity = cached_statements
+        self._statements: "Optional[OrderedDict[str, None]]" = None
+        self.statement_stats: dict[str, list[int]] = {}  # 이름 → [calls, 추정 hits, 추정 misses] (마지막 반납 이후)
+
+    def enable_cache_estimate(self):
+        self._statements = OrderedDict()
+
+    def _track(self, sql: str):
+        name = getattr(sql, "sql_name", "_other")
+        counts = self.statement_stats.get(name) or self.statement_stats.setdefault(name, [0, 0, 0])
+        counts[0] += 1
+        statements = self._statements
+        if statements is None:
+            return
+        if sql in statements:
+            statements.move_to_end(sql)
+            counts[1] += 1
+            return
+        counts[2] += 1
+        statements[sql] = None
+        if len(statements) > self.statement_capacity:
+            statements.popitem(last=False)
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or StatementCacheCursor)
+
+    def execute(self, sql, parameters=(), /):
+        self._track(sql)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, parameters, /):
+        self._track(sql)
+        return super().executemany(sql, parameters)
+
+
+class StatementCacheCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=(), /):
+        self.connection._track(sql)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        self.connection._track(sql)
+        return super().executemany(sql, seq_of_parameters)
+
+
+class PooledConnection:
+    """풀에서 관리하는 SQLite 커넥션 (생성/마지막 사용 시각 포함)"""
+    __slots__ = ("conn", "created_at", "last_used_at")
+
+    def __init__(self, conn: sqlite3.Connection):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used_at = now
+
+
+class ConnectionPool:
+    """
+    체크아웃 방식의 SQLite 커넥션 풀.
+    - max_size 개까지만 커넥션을 열고, 모두 사용 중이면 timeout 초 동안 대기
+    - max_lifetime 초가 지난 커넥션은 반납 시 폐기 후 재생성 (recycle)
+    - ping_interval 초 이상 놀던 커넥션은 체크아웃 시 SELECT 1 로 상태 확인
+    - cached_statements: 커넥션별 준비된 문장 캐시 크기 (커넥션을 오래 재사용하므로 자주 쓰는 쿼리는 파싱/실행 계획 1회)
+    - statement_stats: 문장별 실행 횟수 집계 (StatementCacheConnection, 실행마다 비용이 있어 기본은 sqlite3.Connection 그대로 사용)
+    - statement_cache_estimate: 실행 횟수에 더해 준비된 문장 캐시 hit/miss 추정치도 집계 (진단용, statement_stats 포함)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_size: int,
+        timeout: float,
+        max_lifetime: float,
+        ping_interval: float,
+        on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+        cached_statements: int = 128,
+        statement_stats: bool = False,
+        statement_cache_estimate: bool = False,
+    ):
+        self.db_path = db_path
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+        self.on_connect = on_connect
+        self.cached_statements = max(0, cached_statements)
+        self.statement_cache_estimate = statement_cache_estimate
+        self.statement_stats = statement_stats or statement_cache_estimate
+
+        self._idle: deque[PooledConnection] = deque()
+        self._cond = threading.Condition()
+        self._size = 0
+        self._closed = False
+        self._pid = os.getpid()
+
+        # 📊 풀 메트릭
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._discarded = 0
+        self._statement_stats: dict[str, list[int]] = {}
+
+    # ✅ 커넥션 생성 (PRAGMA 등 초기화는 on_connect 에서 1회만 수행)
+    def _create(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            factory=StatementCacheConnection if self.statement_stats else sqlite3.Connection,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        if self.statement_cache_estimate:
+            conn.enable_cache_estimate()
+        try:
+            if self.on_connect:
+                self.on_connect(conn)
+        except Exception:
+            conn.close()
+            raise
+        with self._cond:
+            self._created += 1
+        return PooledConnection(conn)
+
+    def _is_expired(self, pooled: PooledConnection, now: float) -> bool:
+        return bool(self.max_lifetime) and now - pooled.created_at >= self.max_lifetime
+
+    def _is_healthy(self, pooled: PooledConnection, now: float) -> bool:
+        if now - pooled.last_used_at < self.ping_interval:
+            return True
+        try:
+            pooled.conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(pooled: PooledConnection):
+        try:
+            pooled.conn.close()
+        except sqlite3.Error:
+            pass
+
+    # ✅ 커넥션 체크아웃
+    def acquire(self) -> PooledConnection:
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+
+        with self._cond:
+            if self._closed:
+                raise PoolTimeoutError("커넥션 풀이 종료되었습니다.")
+            while True:
+                if self._idle:
+                    pooled = self._idle.pop()  # LIFO: 최근에 쓴 커넥션(캐시가 따뜻한)을 우선 재사용
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    pooled = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"커넥션 풀 대기 시간 초과 ({self.timeout}s, max_size={self.max_size})"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            self._checkouts += 1
+            if waited:
+                elapsed = time.monotonic() - started
+                self._waits += 1
+                self._wait_time_total += elapsed
+                self._wait_time_max = max(self._wait_time_max, elapsed)
+
+        # 커넥션 생성/상태 확인은 락 밖에서 수행
+        try:
+            now = time.monotonic()
+            if pooled is not None and (self._is_expired(pooled, now) or not self._is_healthy(pooled, now)):
+                self._close_quietly(pooled)
+                with self._cond:
+                    self._discarded += 1
+                pooled = None
+            if pooled is None:
+                pooled = self._create()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        return pooled
+
+    # ✅ 커넥션 반납
+    def release(self, pooled: PooledConnection, discard: bool = False):
+        conn = pooled.conn
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                # DAO 에서 row_factory 를 바꿔 쓰는 경우가 있으므로 기본값으로 복원
+                conn.row_factory = sqlite3.Row
+            except sqlite3.Error:
+                discard = True
+
+        now = time.monotonic()
+        pooled.last_used_at = now
+        recycle = not discard and self._is_expired(pooled, now)
+
+        with self._cond:
+            self._merge_statement_stats(conn)
+            if discard or recycle or self._closed or self._pid != os.getpid():
+                self._size -= 1
+                if recycle:
+                    self._recycled += 1
+                elif discard:
+                    self._discarded += 1
+                self._close_quietly(pooled)
+            else:
+                self._idle.append(pooled)
+            self._cond.notify()
+
+    def _merge_statement_stats(self, conn: sqlite3.Connection):
+        local = getattr(conn, "statement_stats", None)
+        if not local:
+            return
+        for name, counts in local.items():
+            total = self._statement_stats.setdefault(name, [0, 0, 0])
+            for i, value in enumerate(counts):
+                total[i] += value
+        local.clear()
+
+    def statement_cache_stats(self) -> dict:
+        """문장별 실행 횟수 (statement_stats 시, 반납된 커넥션 기준, 이름별 + 전체) + statement_cache_estimate 시 hit/miss 추정치"""
+        with self._cond:
+            by_name = {name: tuple(counts) for name, counts in self._statement_stats.items()}
+
+        def summary(calls: int, hits: int, misses: int) -> dict:
+            result = {"calls": calls}
+            if self.statement_cache_estimate:
+                total = hits + misses
+                result.update({
+                    "estimated_hits": hits,
+                    "estimated_misses": misses,
+                    "estimated_hit_rate": round(hits / total, 4) if total else 0.0,
+                })
+            return result
+
+        totals = [sum(counts[i] for counts in by_name.values()) for i in range(3)]
+        return {
+            "capacity": self.cached_statements,
+            "enabled": self.statement_stats,
+            "estimate": self.statement_cache_estimate,
+            **summary(*totals),
+            "statements": {name: summary(*by_name[name]) for name in sorted(by_name)},
+        }
+
+    # ✅ 유휴 커넥션 정리 (앱 종료 시)
+    def close(self):
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._close_quietly(self._idle.pop())
+                self._size -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_time_total_ms": round(self._wait_time_total * 1000, 3),
+                "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "discarded": self._discarded,
+            }
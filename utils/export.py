@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+import logging
+import threading
+import weakref
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Sequence
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# ✅ 대용량 목록 내보내기 (CSV / NDJSON, 선택적 gzip)
+# - 행 이터레이터를 청크(EXPORT_CHUNK_BYTES) 단위로 인코딩해 StreamingResponse 로 흘려보냄
+# - 전체 결과를 메모리에 모으지 않으므로 건수와 관계없이 메모리 사용량이 일정
+# - 동시 내보내기는 EXPORT_MAX_CONCURRENCY 개까지 (초과 시 429)
+# - 헤더(200)를 보낸 뒤 조회가 실패하면 오류 레코드를 쓰고 스트림을 중단 → 잘린 파일이 정상 파일처럼 보이지 않음
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _iter_csv(rows: Iterable[dict], columns: Sequence[str]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    # 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM
+    buf.write("\ufeff")
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([row.get(col) for col in columns])
+        if buf.tell() >= Config.EXPORT_CHUNK_BYTES:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def _iter_ndjson(rows: Iterable[dict], columns: Sequence[str]) -> Iterator[str]:
+    lines: list[str] = []
+    size = 0
+    for row in rows:
+        line = json.dumps({col: row.get(col) for col in columns}, ensure_ascii=False, default=str)
+        lines.append(line)
+        size += len(line) + 1
+        if size >= Config.EXPORT_CHUNK_BYTES:
+            yield "\n".join(lines) + "\n"
+            lines = []
+            size = 0
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+EXPORT_ERROR_MESSAGE = "내보내기 중 오류가 발생해 파일이 완전하지 않습니다."
+
+
+def _error_record(fmt: str) -> str:
+    """중단 표시 레코드 (CSV 는 #ERROR 행, NDJSON 은 _error 키만 있는 줄)"""
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf).writerow(["#ERROR", EXPORT_ERROR_MESSAGE])
+        return buf.getvalue()
+    return json.dumps({"_error": EXPORT_ERROR_MESSAGE}, ensure_ascii=False) + "\n"
+
+
+class _GuardedRows:
+    """행 이터레이터의 예외를 잡아 두고 순회를 끝냄 (이미 인코딩 버퍼에 있는 행은 내보낸 뒤 오류 레코드를 붙이기 위함)"""
+
+    def __init__(self, rows: Iterable[dict]):
+        self.rows = rows
+        self.error: Optional[BaseException] = None
+
+    def __iter__(self) -> Iterator[dict]:
+        try:
+            yield from self.rows
+        except Exception as e:
+            self.error = e
+
+
+def iter_export_chunks(rows: Iterable[dict], columns: Sequence[str], fmt: str, use_gzip: bool = False) -> Iterator[bytes]:
+    """
+    행 → 인코딩된 바이트 청크 (use_gzip 이면 gzip 스트림으로 압축)
+    - 조회 중 예외: 오류 레코드를 쓰고 예외를 다시 올려 응답을 중단 (gzip 은 트레일러 없이 끝나 압축 해제도 실패)
+    """
+    encode = _iter_csv if fmt == "csv" else _iter_ndjson
+    guarded = _GuardedRows(rows)
+    compressor = zlib.compressobj(Config.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if use_gzip else None  # wbits=31 → gzip 헤더/트레일러
+
+    def emit(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    for chunk in encode(guarded, columns):
+        data = emit(chunk)
+        if data:
+            yield data
+
+    if guarded.error is not None:
+        logger.error(f"[내보내기 중단] {guarded.error}")
+        data = emit(_error_record(fmt))
+        yield data + compressor.flush(zlib.Z_SYNC_FLUSH) if compressor else data
+        raise guarded.error
+
+    if compressor:
+        yield compressor.flush()
+
+
+class _ExportSlot:
+    """동시 내보내기 슬롯 (release 는 여러 번 불려도 한 번만 반납)"""
+
+    def __init__(self, semaphore: threading.BoundedSemaphore):
+        self._semaphore = semaphore
+        self._lock = threading.Lock()
+        self._released = False
+
+    def release(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._semaphore.release()
+
+
+_export_semaphore: Optional[threading.BoundedSemaphore] = None
+_export_semaphore_lock = threading.Lock()
+
+
+def _acquire_export_slot() -> Optional[_ExportSlot]:
+    global _export_semaphore
+    with _export_semaphore_lock:
+        if _export_semaphore is None:
+            _export_semaphore = threading.BoundedSemaphore(max(1, Config.EXPORT_MAX_CONCURRENCY))
+    if not _export_semaphore.acquire(blocking=False):
+        return None
+    return _ExportSlot(_export_semaphore)
+
+
+def _iter_with_slot(slot: _ExportSlot, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    try:
+        yield from chunks
+    finally:
+        slot.release()
+
+
+def export_response(rows: Iterable[dict], columns: Sequence[str], fmt: str, use_gzip: bool, filename: str) -> StreamingResponse:
+    """내보내기 StreamingResponse (동기 이터레이터 → 스레드풀에서 소비되므로 이벤트 루프를 막지 않음)"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt}")
+    slot = _acquire_export_slot()
+    if slot is None:
+        raise HTTPException(429, "진행 중인 내보내기가 많습니다. 잠시 후 다시 시도해주세요.")
+
+    body = _iter_with_slot(slot, iter_export_chunks(rows, columns, fmt, use_gzip))
+    # 응답 본문을 한 번도 읽지 않고 버려지는 경우 (연결 끊김 등) 에도 슬롯 반납
+    weakref.finalize(body, slot.release)
+    name = f"{filename}_{datetime.now():%Y%m%d%H%M%S}.{fmt}" + (".gz" if use_gzip else "")
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if use_gzip else EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}"'},
+    )
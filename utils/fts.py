@@ -0,0 +1,96 @@
+import logging
+import sqlite3
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# ✅ 부분 문자열 검색용 FTS5(trigram) 인덱스
+# - 원본 테이블을 content 로 쓰는 external content 테이블 (본문은 원본에만 저장, 인덱스만 별도)
+# - INSERT/UPDATE/DELETE 트리거로 동기화 (utils/db_migrations.py v7 에서 생성)
+# - 검색은 trigram 인덱스가 LIKE '%...%' 를 그대로 처리하므로 기존 LIKE 와 결과가 같음
+# 원본 테이블 → (FTS 테이블, 검색 컬럼)
+FTS_INDEXES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "users": ("users_fts", ("user_id", "user_name")),
+    "api_list": ("api_list_fts", ("api_name", "path")),
+    "screens": ("screens_fts", ("screen_name", "screen_path")),
+    "api_keys": ("api_keys_fts", ("comment",)),
+    "api_usage_log": ("api_usage_log_fts", ("user_id", "path")),
+    "api_permission_requests": ("api_permission_requests_fts", ("user_id",)),
+}
+
+# INTEGER PRIMARY KEY 가 없는 테이블은 VACUUM 시 rowid 가 바뀔 수 있으므로 기동 시 재구성 (모두 작은 테이블)
+_REBUILD_ON_STARTUP = ("users", "api_list", "screens", "api_keys")
+
+# trigram 은 3글자 단위로 색인하므로 더 짧은 검색어는 일반 LIKE 가 더 빠름
+MIN_FTS_TERM_LENGTH = 3
+
+# 현재 DB 에 실제로 만들어진 FTS 인덱스 (init_db 에서 로드, 없으면 LIKE 로 동작)
+_available: set[str] = set()
+
+
+def is_trigram_supported(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts_probe USING fts5(x, tokenize='trigram')")
+        conn.execute("DROP TABLE temp._fts_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def create_fts_index(conn: sqlite3.Connection, table: str):
+    """FTS 테이블 + 동기화 트리거 생성 후 기존 데이터로 색인"""
+    fts, columns = FTS_INDEXES[table]
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"NEW.{c}" for c in columns)
+    old_cols = ", ".join(f"OLD.{c}" for c in columns)
+
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts}
+        USING fts5({cols}, content='{table}', content_rowid='rowid', tokenize='trigram')
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_AI AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.rowid, {new_cols});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_AD AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.rowid, {old_cols});
+        END
+    """)
+    # 검색 컬럼이 바뀔 때만 재색인 (users.refresh_token 갱신 같은 잦은 UPDATE 는 제외)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_AU AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.rowid, {old_cols});
+            INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.rowid, {new_cols});
+        END
+    """)
+    conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def load_fts_indexes(conn: sqlite3.Connection):
+    """기동 시 사용 가능한 FTS 인덱스 확인 + rowid 가 바뀔 수 있는 작은 테이블 재색인"""
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%\\_fts' ESCAPE '\\'")}
+    _available.clear()
+    _available.update(table for table, (fts, _) in FTS_INDEXES.items() if fts in names)
+
+    for table in _REBUILD_ON_STARTUP:
+        if table in _available:
+            fts = FTS_INDEXES[table][0]
+            conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    conn.commit()
+    if not _available:
+        logger.warning("[FTS] trigram 인덱스가 없어 부분 검색은 LIKE 로 동작합니다.")
+
+
+def text_search(table: str, column: str, term: str, alias: Optional[str] = None) -> tuple[str, list]:
+    """
+    `column LIKE '%term%'` 와 같은 결과를 주는 WHERE 조건 → (조건 SQL, 파라미터)
+    FTS 인덱스가 있고 검색어가 3글자 이상이면 trigram 인덱스로, 아니면 원본 테이블 LIKE 로 검색
+    """
+    prefix = f"{alias}." if alias else ""
+    pattern = f"%{term}%"
+    if table in _available and len(term) >= MIN_FTS_TERM_LENGTH and column in FTS_INDEXES[table][1]:
+        fts = FTS_INDEXES[table][0]
+        return f"{prefix}rowid IN (SELECT rowid FROM {fts} WHERE {column} LIKE ?)", [pattern]
+    return f"{prefix}{column} LIKE ?", [pattern]
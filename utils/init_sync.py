@@ -1,6 +1,7 @@
 from fastapi.routing import APIRoute
 from typing import Set, Tuple
 from utils.db_config import get_conn 
+from utils.cache import bump_cache_epoch
 from db.api_db import insert_api_list
 
 EXCLUDE_PATHS: Set[Tuple[str, str]] = {
@@ -50,6 +51,7 @@ async def sync_api_on_startup(app):
                     SET use_yn = 'N', update_id = 'system', update_date = CURRENT_TIMESTAMP
                     WHERE path = ? AND method = ?
                 """, (path, method))
+                bump_cache_epoch(conn, "api_list")
 
         print(f"[✓] API 동기화 완료 - 등록: {len(to_add)}, 비활성화: {len(to_deactivate)}")
 
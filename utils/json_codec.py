@@ -0,0 +1,85 @@
+import asyncio
+import functools
+import json
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+from fastapi.encoders import jsonable_encoder
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 으로 인코딩
+    orjson = None
+
+# ✅ 공통 JSON 인코딩 (응답 + API 사용 로그)
+# - orjson 이 있으면 orjson, 없으면 표준 json (둘 다 UTF-8, 공백 없는 형식)
+# - 요청마다 마지막으로 인코딩한 객체를 기억 → log_api_usage() 에서 인코딩한 응답을 응답 본문에서 그대로 재사용
+#   (로그 기록 후 같은 응답 객체를 수정하지 않는다는 전제, 현재 서비스 코드 모두 기록 직후 반환)
+
+
+def _default(obj: Any) -> Any:
+    # pydantic 모델, Decimal, set 등 기본 인코더가 모르는 타입은 FastAPI 규칙대로 변환
+    return jsonable_encoder(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def json_backend() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+_last_encoded: ContextVar[Optional[tuple[Any, bytes]]] = ContextVar("last_encoded_json", default=None)
+
+
+def encode_once(obj: Any) -> bytes:
+    """같은 요청 안에서 같은 객체를 다시 인코딩하면 이전 결과 재사용"""
+    memo = _last_encoded.get()
+    if memo is not None and memo[0] is obj:
+        return memo[1]
+    data = dumps(obj)
+    if isinstance(obj, (dict, list)):
+        _last_encoded.set((obj, data))
+    return data
+
+
+class RawJSON(str):
+    """이미 JSON 으로 인코딩된 문자열 (사용 로그 기록 시 다시 인코딩하지 않음)"""
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return encode_once(content)
+
+
+def _direct_json_endpoint(endpoint: Callable, status_code: int) -> Callable:
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        if isinstance(result, Response):
+            return result
+        return FastJSONResponse(result, status_code=status_code)
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    """
+    dict / list 를 반환하는 엔드포인트는 jsonable_encoder(전체 복사) 를 거치지 않고 바로 FastJSONResponse 로 인코딩
+    - response_model 이 있거나 반환 타입이 선언된 엔드포인트는 기존 FastAPI 직렬화 그대로 사용
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        response_model = kwargs.get("response_model")
+        if (
+            (response_model is None or isinstance(response_model, DefaultPlaceholder))
+            and "return" not in getattr(endpoint, "__annotations__", {})
+            and asyncio.iscoroutinefunction(endpoint)
+        ):
+            endpoint = _direct_json_endpoint(endpoint, kwargs.get("status_code") or 200)
+        super().__init__(path, endpoint, **kwargs)
@@ -0,0 +1,124 @@
+import json
+import os
+import struct
+import zlib
+from typing import Any, Optional, Sequence
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 zlib 으로 압축
+    zstandard = None
+
+# ✅ 로그 아카이브 세그먼트 파일 (컬럼 단위 압축, 추가 전용)
+# [MAGIC][블록1 컬럼1][블록1 컬럼2]...[블록N 컬럼M][footer JSON][footer 길이(8바이트)]
+# - 블록: 시간순으로 정렬된 최대 LOG_ARCHIVE_BLOCK_ROWS 행, 컬럼마다 JSON 배열을 따로 압축
+# - footer: 컬럼 목록, 압축 방식, 블록별 (행 수, 최소/최대 시각, 컬럼별 위치/길이)
+# - 조회 시 최소/최대 시각으로 블록을 고르고 필요한 컬럼만 풀어서 읽음
+MAGIC = b"WSLOGSEG1\n"
+_FOOTER_LEN = struct.Struct("<Q")
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd 로 압축된 세그먼트를 읽으려면 zstandard 패키지가 필요합니다.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class SegmentWriter:
+    """임시 파일에 블록을 쓰고 close() 시 fsync 후 최종 경로로 교체 (중간에 실패하면 abort)"""
+
+    def __init__(self, path: str, columns: Sequence[str], time_column: str, codec: Optional[str] = None):
+        self.path = path
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.columns = list(columns)
+        self.time_index = self.columns.index(time_column)
+        self.codec = codec or default_codec()
+        self.blocks: list[dict] = []
+        self.row_count = 0
+        self._file = open(self.tmp_path, "wb")
+        self._file.write(MAGIC)
+
+    def write_block(self, rows: Sequence[Sequence[Any]]):
+        if not rows:
+            return
+        times = [row[self.time_index] for row in rows]
+        block = {"rows": len(rows), "min_time": min(times), "max_time": max(times), "columns": {}}
+        for name, values in zip(self.columns, zip(*rows)):
+            raw = json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            data = _compress(self.codec, raw)
+            block["columns"][name] = [self._file.tell(), len(data)]
+            self._file.write(data)
+        self.blocks.append(block)
+        self.row_count += len(rows)
+
+    def close(self) -> dict:
+        footer = json.dumps({
+            "version": 1,
+            "codec": self.codec,
+            "columns": self.columns,
+            "time_column": self.columns[self.time_index],
+            "blocks": self.blocks,
+        }, ensure_ascii=False).encode("utf-8")
+        self._file.write(footer)
+        self._file.write(_FOOTER_LEN.pack(len(footer)))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+        return {
+            "row_count": self.row_count,
+            "min_time": min((b["min_time"] for b in self.blocks), default=None),
+            "max_time": max((b["max_time"] for b in self.blocks), default=None),
+            "codec": self.codec,
+            "size_bytes": os.path.getsize(self.path),
+        }
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class SegmentReader:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"로그 세그먼트 파일 형식이 아닙니다: {path}")
+            f.seek(-_FOOTER_LEN.size, os.SEEK_END)
+            footer_len = _FOOTER_LEN.unpack(f.read(_FOOTER_LEN.size))[0]
+            f.seek(-(_FOOTER_LEN.size + footer_len), os.SEEK_END)
+            footer = json.loads(f.read(footer_len))
+        self.codec: str = footer["codec"]
+        self.columns: list[str] = footer["columns"]
+        self.time_column: str = footer["time_column"]
+        self.blocks: list[dict] = footer["blocks"]
+
+    def blocks_for_range(self, start: Optional[str], end: Optional[str]) -> list[int]:
+        """[start, end) 와 겹치는 블록 번호"""
+        return [
+            i for i, block in enumerate(self.blocks)
+            if (start is None or block["max_time"] >= start) and (end is None or block["min_time"] < end)
+        ]
+
+    def read_columns(self, block_index: int, names: Sequence[str]) -> dict[str, list]:
+        block = self.blocks[block_index]
+        result = {}
+        with open(self.path, "rb") as f:
+            for name in names:
+                offset, length = block["columns"][name]
+                f.seek(offset)
+                result[name] = json.loads(_decompress(self.codec, f.read(length)))
+        return result
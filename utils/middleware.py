@@ -0,0 +1,72 @@
+from http.cookies import SimpleCookie
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.config import Config
+
+ACCESS_TOKEN_EXPIRE_MINUTES = Config.ACCESS_TOKEN_EXPIRE_MINUTES
+REFRESH_TOKEN_EXPIRE_DAYS = Config.REFRESH_TOKEN_EXPIRE_DAYS
+
+
+def _token_cookie(key: str, value: str, max_age: int) -> str:
+    cookie: SimpleCookie = SimpleCookie()
+    cookie[key] = value
+    cookie[key]["max-age"] = max_age
+    cookie[key]["path"] = "/"
+    cookie[key]["httponly"] = True
+    cookie[key]["secure"] = True  # 운영 환경에서 반드시 True
+    cookie[key]["samesite"] = "Lax"
+    return cookie.output(header="").strip()
+
+
+def _is_direct_browser_access(headers: Headers) -> bool:
+    # 조건: 주소창 직접 입력으로 보이는 경우
+    return (
+        headers.get("x-requested-with", "") != "XMLHttpRequest"
+        and "text/html" in headers.get("accept", "")
+        and "Mozilla" in headers.get("user-agent", "")
+    )
+
+
+class WebServiceMiddleware:
+    """
+    ✅ 순수 ASGI 미들웨어 (@app.middleware("http") / BaseHTTPMiddleware 대체)
+    - /apim 주소창 직접 접근은 앱에 넘기지 않고 바로 403
+    - 인증/로그인에서 request.state 에 남긴 새 토큰을 http.response.start 시점에 Set-Cookie 로 추가
+    - 응답 본문은 버퍼링 없이 그대로 전달 (StreamingResponse 도 청크 단위로 바로 나감)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"].startswith("/apim") and _is_direct_browser_access(Headers(scope=scope)):
+            response = JSONResponse(
+                status_code=403,
+                content={"detail": "❌ 주소창 직접 접근이 차단되었습니다."}
+            )
+            await response(scope, receive, send)
+            return
+
+        # request.state 는 scope["state"] 딕셔너리를 그대로 사용하므로 응답 시작 시점에 새 토큰 확인 가능
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookies(message: Message):
+            if message["type"] == "http.response.start":
+                if "new_access_token" in state or "new_refresh_token" in state:
+                    headers = MutableHeaders(scope=message)
+                    if "new_access_token" in state:
+                        headers.append("set-cookie", _token_cookie(
+                            "access_token", state["new_access_token"], 60 * ACCESS_TOKEN_EXPIRE_MINUTES  # 초 * 분
+                        ))
+                    if "new_refresh_token" in state:
+                        headers.append("set-cookie", _token_cookie(
+                            "refresh_token", state["new_refresh_token"], 60 * 60 * 24 * REFRESH_TOKEN_EXPIRE_DAYS  # 초 * 분 * 시 * 일
+                        ))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookies)
@@ -0,0 +1,97 @@
+import sqlite3
+from typing import Any, Optional, Sequence
+from utils.cache import TTLCache
+from utils.config import Config
+from utils.sql_registry import named_sql
+
+# ✅ 목록 조회 페이지네이션 공통 헬퍼
+# - fetch_page_with_total: 작은 테이블용. COUNT(*) OVER () 로 목록과 전체 건수를 한 번에 조회
+# - fetch_page + count_rows: 로그 테이블용. 건수는 상한(LIST_COUNT_CAP)까지만 세고 필터 조합별로 잠깐 캐시
+# - name: 주면 필터 조합별 문장을 utils/sql_registry 에 "{name}.page" / "{name}.count" 로 등록 (문장 캐시 재사용 + 집계)
+_TOTAL_COUNT_COL = "_total_count"
+
+# 로그 테이블 건수 캐시 (짧은 TTL 로만 갱신, 화면의 total_pages 는 대략 맞으면 충분)
+count_cache = TTLCache("list_count", Config.LIST_COUNT_CACHE_SIZE, Config.LIST_COUNT_CACHE_TTL_SECONDS)
+
+
+def _sql(name: Optional[str], kind: str, sql: str) -> str:
+    return named_sql(f"{name}.{kind}", sql) if name else sql
+
+
+def _rows_to_dicts(cur: sqlite3.Cursor, rows: list, skip: Optional[str] = None) -> list[dict]:
+    cols = [d[0] for d in cur.description]
+    keep = [i for i, col in enumerate(cols) if col != skip]
+    return [{cols[i]: row[i] for i in keep} for row in rows]
+
+
+def fetch_page(
+    conn: sqlite3.Connection,
+    columns: str,
+    from_sql: str,
+    params: Sequence[Any],
+    order_by: str,
+    page: int,
+    per_page: int,
+    name: Optional[str] = None,
+) -> list[dict]:
+    """SELECT {columns} {from_sql} ORDER BY {order_by} LIMIT/OFFSET"""
+    cur = conn.execute(
+        _sql(name, "page", f"SELECT {columns} {from_sql} ORDER BY {order_by} LIMIT ? OFFSET ?"),
+        [*params, per_page, (page - 1) * per_page],
+    )
+    return _rows_to_dicts(cur, cur.fetchall())
+
+
+def fetch_page_with_total(
+    conn: sqlite3.Connection,
+    columns: str,
+    from_sql: str,
+    params: Sequence[Any],
+    order_by: str,
+    page: int,
+    per_page: int,
+    name: Optional[str] = None,
+) -> tuple[list[dict], int]:
+    """
+    목록 + 전체 건수를 한 문장으로 조회 → (items, total_count)
+    마지막 페이지를 넘겨 요청해서 행이 없으면 건수를 알 수 없으므로 그때만 COUNT 를 따로 실행
+    """
+    cur = conn.execute(
+        _sql(name, "page", f"SELECT {columns}, COUNT(*) OVER () AS {_TOTAL_COUNT_COL} {from_sql} ORDER BY {order_by} LIMIT ? OFFSET ?"),
+        [*params, per_page, (page - 1) * per_page],
+    )
+    rows = cur.fetchall()
+    if rows:
+        total_count = rows[0][len(cur.description) - 1]
+    elif page > 1:
+        total_count = conn.execute(_sql(name, "count", f"SELECT COUNT(*) {from_sql}"), list(params)).fetchone()[0]
+    else:
+        total_count = 0
+    return _rows_to_dicts(cur, rows, skip=_TOTAL_COUNT_COL), total_count
+
+
+def count_rows(
+    conn: sqlite3.Connection,
+    from_sql: str,
+    params: Sequence[Any],
+    cap: Optional[int] = None,
+    name: Optional[str] = None,
+) -> tuple[int, bool]:
+    """
+    전체 건수 → (total_count, capped)
+    - cap 건을 넘으면 더 세지 않고 (cap, True) 반환
+    - 같은 필터(from_sql + params)의 결과는 LIST_COUNT_CACHE_TTL_SECONDS 동안 재사용
+    """
+    cap = Config.LIST_COUNT_CAP if cap is None else cap
+    key = (from_sql, tuple(params), cap)
+    cached = count_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if cap > 0:
+        n = conn.execute(_sql(name, "count", f"SELECT COUNT(*) FROM (SELECT 1 {from_sql} LIMIT ?)"), [*params, cap + 1]).fetchone()[0]
+        result = (cap, True) if n > cap else (n, False)
+    else:
+        result = (conn.execute(_sql(name, "count", f"SELECT COUNT(*) {from_sql}"), list(params)).fetchone()[0], False)
+    count_cache.set(key, result)
+    return result
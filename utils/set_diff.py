@@ -0,0 +1,53 @@
+import json
+import sqlite3
+from typing import Any, Iterable, Optional, Sequence
+
+# ✅ 집합 단위 행 교체 (권한 저장 등)
+# - scope(컬럼 = 값) 범위에 있는 key_columns 조합을 desired 집합으로 맞춤
+# - 현재 집합과 비교해 추가/삭제된 행만 반영 → 바뀌지 않은 행은 인덱스 페이지와 create_date 등 감사 컬럼이 그대로 유지
+# - 호출한 쪽의 트랜잭션(get_conn) 안에서 실행, 결과 diff 는 로그 기록용
+
+
+def _key_match_sql(key_columns: Sequence[str]) -> str:
+    """key_columns 조합이 JSON 배열 목록에 포함되는지 (건수와 관계없이 파라미터 하나)"""
+    if len(key_columns) == 1:
+        return f"{key_columns[0]} IN (SELECT value FROM json_each(?))"
+    extracts = ", ".join(f"json_extract(value, '$[{i}]')" for i in range(len(key_columns)))
+    return f"({', '.join(key_columns)}) IN (SELECT {extracts} FROM json_each(?))"
+
+
+def replace_row_set(
+    conn: sqlite3.Connection,
+    table: str,
+    scope: dict[str, Any],
+    key_columns: Sequence[str],
+    desired: Iterable[tuple],
+    insert_values: Optional[dict[str, Any]] = None,
+) -> dict[str, list]:
+    """
+    scope 범위의 key_columns 집합을 desired 로 교체 → {"added": [...], "removed": [...]}
+    - insert_values: 새로 추가하는 행에만 넣을 컬럼 값 (create_id 등)
+    """
+    scope_sql = " AND ".join(f"{col} = ?" for col in scope)
+    scope_params = list(scope.values())
+    key_sql = ", ".join(key_columns)
+
+    current = {tuple(row) for row in conn.execute(f"SELECT {key_sql} FROM {table} WHERE {scope_sql}", scope_params)}
+    wanted = {tuple(key) for key in desired}
+    added = sorted(wanted - current, key=str)
+    removed = sorted(current - wanted, key=str)
+
+    if removed:
+        keys = [key[0] for key in removed] if len(key_columns) == 1 else removed
+        conn.execute(
+            f"DELETE FROM {table} WHERE {scope_sql} AND {_key_match_sql(key_columns)}",
+            [*scope_params, json.dumps(keys)],
+        )
+    if added:
+        extra = insert_values or {}
+        columns = [*scope, *key_columns, *extra]
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [(*scope_params, *key, *extra.values()) for key in added],
+        )
+    return {"added": [list(key) for key in added], "removed": [list(key) for key in removed]}
@@ -0,0 +1,51 @@
+import threading
+from typing import Optional
+
+# ✅ 자주 쓰는 SQL 문장 레지스트리
+# - sqlite3 는 SQL 문자열이 완전히 같을 때만 커넥션의 준비된 문장 캐시(cached_statements)를 재사용
+# - 인증/권한 확인/로그 기록 같은 고정 문장은 register_sql() 로 이름을 붙여 모듈 로드 시 한 번 만들고,
+#   필터 조합마다 달라지는 목록 조회 문장은 named_sql() 로 조합별 문자열을 하나로 고정
+# - 이름은 커넥션 풀의 문장별 실행 횟수 / 캐시 hit/miss 추정 집계(utils/db_pool.StatementCacheConnection)에 사용
+
+
+class NamedSQL(str):
+    """이름이 붙은 SQL 문자열 (str 과 동일하게 execute 에 그대로 전달)"""
+
+    def __new__(cls, name: str, sql: str):
+        obj = super().__new__(cls, sql)
+        obj.sql_name = name
+        return obj
+
+
+# 이름 → {SQL 문자열: NamedSQL} (목록 조회는 필터 조합 / 조회 파티션별 변형)
+_statements: dict[str, dict[str, NamedSQL]] = {}
+_lock = threading.Lock()
+# 이름 하나의 변형 수 상한 (넘으면 이름 없이 그대로 실행 → 레지스트리가 무한정 커지지 않도록)
+MAX_VARIANTS_PER_NAME = 256
+
+
+def register_sql(name: str, sql: str) -> NamedSQL:
+    """고정 문장 등록 (모듈 상수로 보관해서 사용)"""
+    return named_sql(name, sql)
+
+
+def named_sql(name: str, sql: str) -> str:
+    """이름 + SQL 문자열 → 등록된 NamedSQL (같은 조합이면 항상 같은 객체)"""
+    variants = _statements.get(name)
+    statement: Optional[NamedSQL] = variants.get(sql) if variants else None
+    if statement is not None:
+        return statement
+    with _lock:
+        variants = _statements.setdefault(name, {})
+        statement = variants.get(sql)
+        if statement is None:
+            if len(variants) >= MAX_VARIANTS_PER_NAME:
+                return sql
+            statement = variants[sql] = NamedSQL(name, sql)
+    return statement
+
+
+def get_sql_registry_stats() -> dict:
+    """이름별 등록된 문장 변형 수"""
+    with _lock:
+        return {name: len(variants) for name, variants in sorted(_statements.items())}
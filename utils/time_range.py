@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+# ✅ 기간 검색 조건 공통 빌더
+# - 컬럼을 strftime()/DATE() 로 감싸면 인덱스를 못 타므로 원본 컬럼에 [start, end) 반열림 구간으로 비교
+# - DB 저장 형식 'YYYY-MM-DD HH:MM:SS' 은 문자열 비교 = 시간순 비교
+DB_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# (입력 형식, 입력 단위) - 종료값은 입력 단위만큼 더한 시각을 배타적 상한으로 사용
+_INPUT_FORMATS = (
+    ("%Y-%m-%d %H:%M:%S", timedelta(seconds=1)),
+    ("%Y-%m-%d %H:%M", timedelta(minutes=1)),
+    ("%Y-%m-%d", timedelta(days=1)),
+)
+
+
+def parse_time_bound(value: Optional[str], end: bool = False) -> Optional[str]:
+    """
+    UI 입력값 → DB 비교용 경계값
+    '2025-08-27T16:14'            → '2025-08-27 16:14:00'
+    '2025-08-27T16:14', end=True  → '2025-08-27 16:15:00' (해당 분 전체 포함)
+    '2025-08-27', end=True        → '2025-08-28 00:00:00' (해당 일 전체 포함)
+    """
+    if not value:
+        return None
+    s = value.strip().replace("T", " ")
+    for fmt, unit in _INPUT_FORMATS:
+        try:
+            dt = datetime.strptime(s, fmt)
+        except ValueError:
+            continue
+        if end:
+            dt += unit
+        return dt.strftime(DB_DATETIME_FORMAT)
+    raise ValueError(f"날짜 형식이 올바르지 않습니다: {value}")
+
+
+def build_time_range(column: str, start: Optional[str], end: Optional[str]) -> tuple[list[str], list[str]]:
+    """column >= start AND column < end 조건과 파라미터 (값이 없는 쪽은 생략)"""
+    clauses: list[str] = []
+    params: list[str] = []
+    lower = parse_time_bound(start)
+    upper = parse_time_bound(end, end=True)
+    if lower:
+        clauses.append(f"{column} >= ?")
+        params.append(lower)
+    if upper:
+        clauses.append(f"{column} < ?")
+        params.append(upper)
+    return clauses, params